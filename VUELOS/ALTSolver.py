@@ -0,0 +1,25 @@
+from AStarSolver import AStarSolver
+
+class ALTSolver(AStarSolver):
+    """
+    A* con la heurística ALT (A*, Landmarks, Triangle inequality) calculada a partir
+    de las tablas de Graph.preparar_landmarks. Si no hay tablas o ya no son vigentes
+    para la versión del grafo y el modelo, usa la heurística ortodrómica de AStarSolver.
+    """
+
+    def __init__(self, graph, modelo=None, landmarks=None):
+        """
+        Args:
+            graph (Graph | GrafoCSR): Grafo sobre el que buscar rutas.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+            landmarks (Landmarks): Tablas a usar (por defecto graph.landmarks).
+        """
+        super().__init__(graph, modelo)
+        self.landmarks = landmarks
+
+    def _make_heuristic(self, destination_id):
+        landmarks = self.landmarks or getattr(self.graph, 'landmarks', None)
+        modelo = self.modelo or (self.graph.modelo if self.is_csr else None)
+        if landmarks is not None and landmarks.vigente(self.graph, modelo):
+            return landmarks.heuristica(destination_id)
+        return super()._make_heuristic(destination_id)
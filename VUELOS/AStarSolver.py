@@ -0,0 +1,219 @@
+import heapq
+import math
+import time
+from DijkstraSolver import DijkstraSolver
+
+RADIO_TIERRA_KM = 6371.0088
+
+
+def distancia_km(lat1, lon1, lat2, lon2):
+    """
+    Distancia ortodrómica (great-circle) entre dos puntos con la fórmula del haversine.
+
+    Args:
+        lat1, lon1 (float): Coordenadas del primer punto en grados.
+        lat2, lon2 (float): Coordenadas del segundo punto en grados.
+
+    Returns:
+        float: Distancia en kilómetros.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class AStarSolver(DijkstraSolver):
+    """
+    Búsqueda A* guiada por la distancia ortodrómica hasta el destino.
+
+    La heurística es h(v) = k × distancia(v, destino), con k el menor coste por km de
+    todas las rutas del grafo bajo el modelo de peso actual. Si v_max es la mayor
+    velocidad (km por unidad de tiempo) de la red, cada ruta cumple
+    peso ≥ coef_tiempo × tiempo ≥ coef_tiempo × km / v_max, así que k nunca es menor
+    que la cota basada solo en el tiempo y aprovecha también la saturación y los
+    animales. Como ninguna ruta cuesta menos de k por km, h nunca sobreestima el coste
+    restante y es consistente: la ruta devuelta es óptima, igual que con Dijkstra.
+    Si alguna ciudad no tiene coordenadas la heurística vale 0 y equivale a Dijkstra.
+    """
+
+    # Margen para que los errores de redondeo no hagan la heurística inadmisible
+    MARGEN = 1 - 1e-9
+
+    def __init__(self, graph, modelo=None):
+        super().__init__(graph, modelo)
+        self._heuristic_version = None
+        self._factor = 0.0
+        self._coords = []
+        self._coste_km = float('inf')  # Menor peso por km de las rutas del grafo
+        self._arista_minima = None  # Id de la ruta con ese mínimo
+        if not self.is_csr:
+            graph.register_change_reader(self, '_heuristic_version')
+
+    def _coste_km_arista(self, edge, pesos):
+        # Peso por km de una ruta (inf si sus extremos coinciden)
+        origin, destination = edge.origin, edge.destination
+        km = distancia_km(origin.latitud, origin.longitud, destination.latitud, destination.longitud)
+        if km <= 0:
+            return float('inf')
+        return (edge.peso if pesos is None else pesos[edge.id]) / km
+
+    def _actualizar_coste_km(self):
+        """
+        Ajusta el coste mínimo por km a partir de las rutas cambiadas desde la última
+        preparación, en O(rutas cambiadas). Una ruta que baja del mínimo pasa a serlo;
+        si la que lo era se encarece, hay que recorrer todas.
+
+        Returns:
+            bool: False si hace falta recalcularlo con todas las rutas.
+        """
+        if self.is_csr or self._heuristic_version is None or not self._coords \
+                or len(self._coords) != len(self.graph.nodes):
+            return False
+        pesos = self._pesos_modelo()
+        minimo, arista_minima = self._coste_km, self._arista_minima
+        encarecida = False
+        for edge in self.graph.edges_changed_since(self._heuristic_version):
+            coste = self._coste_km_arista(edge, pesos)
+            if coste < minimo:
+                minimo, arista_minima = coste, edge.id
+            elif edge.id == arista_minima and coste > minimo:
+                encarecida = True
+        if encarecida and arista_minima == self._arista_minima:
+            return False
+        self._coste_km, self._arista_minima = minimo, arista_minima
+        return True
+
+    def _prepare_heuristic(self):
+        """
+        Calcula (y cachea por versión del grafo) las coordenadas en radianes de cada
+        nodo y el coste mínimo por km que mantiene admisible la heurística. Tras un
+        cambio de pesos el mínimo se actualiza con las rutas cambiadas (ver
+        _actualizar_coste_km) y solo se recorren todas si no basta con ellas.
+        """
+        if self._heuristic_version == self.graph.version:
+            return
+        if self._actualizar_coste_km():
+            self._heuristic_version = self.graph.version
+            self._factor = max(0.0, self._coste_km) * self.MARGEN
+            return
+        nodes = self.graph.nodes
+        self._heuristic_version = self.graph.version
+        self._factor = 0.0
+        self._coords = []
+        if any(node.latitud is None or node.longitud is None for node in nodes):
+            return
+
+        coste_km, arista_minima = float('inf'), None
+        if self.is_csr:
+            forward, _ = self._adjacency()
+            for node in nodes:
+                for neighbor, weight in forward(node.id):
+                    destination = nodes[neighbor]
+                    km = distancia_km(node.latitud, node.longitud, destination.latitud, destination.longitud)
+                    if km > 0:
+                        coste_km = min(coste_km, weight / km)
+        else:
+            pesos = self._pesos_modelo()
+            for edge in self.graph.edges:
+                coste = self._coste_km_arista(edge, pesos)
+                if coste < coste_km:
+                    coste_km, arista_minima = coste, edge.id
+        self._coste_km, self._arista_minima = coste_km, arista_minima
+        if coste_km == float('inf'):
+            return
+
+        self._factor = max(0.0, coste_km) * self.MARGEN
+        self._coords = [(math.radians(node.latitud), math.cos(math.radians(node.latitud)),
+                         math.radians(node.longitud)) for node in nodes]
+
+    def _make_heuristic(self, destination_id):
+        """
+        Construye la heurística hacia un destino concreto.
+
+        Args:
+            destination_id (int): Id de la ciudad destino.
+
+        Returns:
+            callable: Función id -> cota inferior del coste hasta el destino.
+        """
+        self._prepare_heuristic()
+        asin, sin, sqrt = math.asin, math.sin, math.sqrt
+        factor = self._factor * 2 * RADIO_TIERRA_KM
+        coords = self._coords
+        if factor <= 0:
+            return lambda node_id: 0.0
+
+        dest_phi, dest_cos, dest_lambda = coords[destination_id]
+
+        def heuristic(node_id):
+            phi, cos_phi, lam = coords[node_id]
+            a = sin((dest_phi - phi) / 2) ** 2 + cos_phi * dest_cos * sin((dest_lambda - lam) / 2) ** 2
+            return factor * asin(min(1.0, sqrt(a)))
+        return heuristic
+
+    def find_shortest_path(self, origin_node, destination_node):
+        path_ids = self.find_shortest_path_ids(origin_node.id, destination_node.id)
+        return [self.graph.nodes[node_id] for node_id in path_ids]
+
+    def find_shortest_path_ids(self, origin_id, destination_id):
+        """
+        A* sobre identificadores enteros, con el almacenamiento reutilizable del solver.
+
+        Returns:
+            List[int]: Ids de la ruta (solo el destino si no es alcanzable).
+        """
+        medir = self.recoger_estadisticas
+        if medir:
+            inicio = time.perf_counter()
+        heuristic = self._make_heuristic(destination_id)
+        forward, _ = self._adjacency()
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        generation = self._new_generation()
+        distances, previous, stamps = self._distances, self._previous, self._stamps
+        stamps[origin_id] = generation
+        distances[origin_id] = 0
+        previous[origin_id] = None
+        queue = [(heuristic(origin_id), 0, origin_id)]
+        grado = self._grados()[0] if medir else None
+        expanded = 0
+        scanned = 0
+        pushes = 1
+
+        while queue:
+            _, current_dist, current = heappop(queue)
+
+            if current == destination_id:
+                break
+
+            if current_dist > distances[current]:
+                continue
+            expanded += 1
+            if medir:
+                scanned += grado(current)
+
+            for neighbor, weight in forward(current):
+                new_dist = current_dist + weight
+                if stamps[neighbor] != generation or new_dist < distances[neighbor]:
+                    stamps[neighbor] = generation
+                    distances[neighbor] = new_dist
+                    previous[neighbor] = current
+                    heappush(queue, (new_dist + heuristic(neighbor), new_dist, neighbor))
+                    pushes += 1
+
+        # Reconstruir ruta
+        self.last_expanded = expanded
+        reached = stamps[destination_id] == generation
+        self.last_cost = distances[destination_id] if reached else float('inf')
+        if medir:
+            self._registrar_busqueda('astar', origin_id, destination_id, inicio,
+                                     pushes, len(queue), expanded + reached, scanned)
+        if not reached:
+            return [destination_id]
+        path = [destination_id]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
@@ -0,0 +1,86 @@
+INF = float('inf')
+
+
+class ArbolRutas:
+    """
+    Árbol de rutas más ligeras desde un origen hacia todas las ciudades alcanzables.
+
+    Guarda la distancia y el predecesor de cada ciudad, indexados por id, tal como
+    los deja un Dijkstra completo. Las rutas no se construyen hasta que se piden, así
+    que consultar varios destinos desde el mismo origen cuesta una sola búsqueda.
+    """
+
+    def __init__(self, graph, origin_id, distances, previous, version):
+        """
+        Args:
+            graph (Graph | GrafoCSR): Grafo sobre el que se calculó el árbol.
+            origin_id (int): Id de la ciudad origen.
+            distances (array): Distancia desde el origen a cada nodo (inf si no es alcanzable).
+            previous (array): Predecesor de cada nodo en el árbol (-1 en el origen y
+                en los nodos no alcanzables).
+            version (int): Versión del grafo con la que se calculó.
+        """
+        self.graph = graph
+        self.origin_id = origin_id
+        self.distances = distances
+        self.previous = previous
+        self.version = version
+
+    def vigente(self):
+        """Indica si el árbol corresponde a la versión actual del grafo."""
+        return self.version == self.graph.version
+
+    def distancia(self, destination_node):
+        """
+        Coste de la ruta más ligera desde el origen.
+
+        Returns:
+            float: Coste (inf si no es alcanzable).
+        """
+        return self.distances[destination_node.id]
+
+    def alcanzables(self):
+        """
+        Devuelve los ids de las ciudades alcanzables desde el origen (incluido él mismo).
+
+        Returns:
+            List[int]: Ids de nodo.
+        """
+        return [node_id for node_id, distance in enumerate(self.distances) if distance != INF]
+
+    def ruta_ids(self, destination_id):
+        """
+        Reconstruye la ruta hacia un destino siguiendo los predecesores.
+
+        Returns:
+            List[int]: Ids de la ruta (solo el destino si no es alcanzable).
+        """
+        if self.distances[destination_id] == INF:
+            return [destination_id]
+        previous = self.previous
+        path = [destination_id]
+        while previous[path[-1]] >= 0:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+
+    def ruta(self, destination_node):
+        """
+        Ruta hacia un destino, con los mismos nodos que devolvería DijkstraSolver.
+
+        Returns:
+            List[Node]: Ruta (solo el destino si no es alcanzable).
+        """
+        nodes = self.graph.nodes
+        return [nodes[node_id] for node_id in self.ruta_ids(destination_node.id)]
+
+    def rutas(self):
+        """
+        Rutas hacia todas las ciudades alcanzables, salvo el propio origen.
+
+        Returns:
+            dict: Nombre del destino -> (coste, List[Node] ruta).
+        """
+        nodes = self.graph.nodes
+        return {nodes[node_id].name: (self.distances[node_id], self.ruta(nodes[node_id]))
+                for node_id in self.alcanzables() if node_id != self.origin_id}
@@ -0,0 +1,150 @@
+from array import array
+from collections import OrderedDict
+
+INF = float('inf')
+
+
+class CacheRutas:
+    """
+    Caché LRU (least recently used) de rutas delante de un solver sobre un Graph.
+
+    Cada entrada se identifica por (origen, destino, modelo de peso) y recuerda la
+    versión del grafo con la que está validada. Cuando el grafo cambia, las aristas
+    modificadas se leen del registro de cambios del Graph y solo se descartan las
+    entradas afectadas:
+      - las rutas que usan una arista modificada;
+      - si una arista u -> v se abarata (o es nueva), las rutas o -> d cuyo coste
+        supera la cota inferior de un camino por ella: su nuevo peso más el peso
+        mínimo de la red por cada tramo que falte de o a u y de v a d.
+    Las demás siguen siendo óptimas y pasan a la versión actual sin recalcularse.
+    Las subidas de peso solo afectan a las rutas que usan la arista; las bajadas
+    pueden invalidar también rutas largas que no pasan por ella.
+    """
+
+    def __init__(self, solver, capacidad=1024):
+        """
+        Args:
+            solver (DijkstraSolver): Solver sobre un Graph (p. ej. DijkstraSolver o ALTSolver).
+            capacidad (int): Número máximo de rutas guardadas.
+        """
+        self.solver = solver
+        self.graph = solver.graph
+        self.modelo = solver.modelo
+        self.modelo_clave = self.modelo.clave() if self.modelo is not None else None
+        self.capacidad = capacidad
+        self.entries = OrderedDict()  # (origen, destino, modelo) -> (coste, ruta, ids de arista)
+        self.by_edge = {}  # Id de arista -> claves de las rutas que la usan
+        self.version = self.graph.version
+        self.graph.register_change_reader(self)
+        self._pesos = self._weights_snapshot()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # Entradas expulsadas por capacidad
+        self.invalidations = 0  # Entradas descartadas por cambios del grafo
+
+    def _weights(self):
+        if self.modelo is None:
+            return None
+        return self.modelo.pesos_grafo(self.graph)
+
+    def _weights_snapshot(self):
+        pesos = self._weights()
+        if pesos is None:
+            return array('d', (edge.peso for edge in self.graph.edges))
+        return array('d', pesos)
+
+    def _remove(self, key):
+        _, _, edge_ids = self.entries.pop(key)
+        for edge_id in edge_ids:
+            keys = self.by_edge.get(edge_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_edge[edge_id]
+
+    def invalidar(self, edges):
+        """
+        Descarta las entradas afectadas por aristas creadas o modificadas.
+
+        Args:
+            edges (iterable): Aristas con su peso ya actualizado.
+        """
+        pesos = self._weights()
+        snapshot = self._pesos
+        cheaper = []  # (origen, destino, nuevo peso) de las aristas abaratadas o nuevas
+        affected = set()
+        for edge in edges:
+            weight = edge.peso if pesos is None else pesos[edge.id]
+            if edge.id >= len(snapshot):
+                snapshot.extend([INF] * (edge.id + 1 - len(snapshot)))
+            if weight < snapshot[edge.id]:
+                cheaper.append((edge.origin.id, edge.destination.id, weight))
+            snapshot[edge.id] = weight
+            affected.update(self.by_edge.get(edge.id, ()))
+
+        if cheaper:
+            min_weight = max(0.0, min(snapshot))
+            cheapest = min(weight for _, _, weight in cheaper)
+            for key, (cost, _, _) in self.entries.items():
+                if cost <= cheapest or key in affected:
+                    continue
+                origin_id, destination_id, _ = key
+                for u, v, weight in cheaper:
+                    bound = weight + (min_weight if origin_id != u else 0.0) \
+                        + (min_weight if destination_id != v else 0.0)
+                    if cost > bound:
+                        affected.add(key)
+                        break
+        for key in affected:
+            self._remove(key)
+        self.invalidations += len(affected)
+
+    def _sync(self):
+        # Aplica los cambios del grafo desde la última versión validada
+        if self.version != self.graph.version:
+            self.invalidar(self.graph.edges_changed_since(self.version))
+            self.version = self.graph.version
+
+    def find_shortest_path(self, origin_node, destination_node):
+        """
+        Misma interfaz que DijkstraSolver, respondiendo desde la caché si es posible.
+
+        Returns:
+            List[Node]: Ruta (solo el destino si no es alcanzable).
+        """
+        self._sync()
+        key = (origin_node.id, destination_node.id, self.modelo_clave)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+        self.misses += 1
+        path = self.solver.find_shortest_path(origin_node, destination_node)
+        cost = self.solver.last_cost
+        edge_ids = [a.find_edge(b).id for a, b in zip(path, path[1:])] if cost < INF else []
+        self.entries[key] = (cost, tuple(path), edge_ids)
+        for edge_id in edge_ids:
+            self.by_edge.setdefault(edge_id, set()).add(key)
+        if len(self.entries) > self.capacidad:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+        return path
+
+    def estadisticas(self):
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, expulsiones, invalidaciones, tasa de acierto y tamaño.
+        """
+        consultas = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / consultas if consultas else 0.0,
+            'size': len(self.entries),
+        }
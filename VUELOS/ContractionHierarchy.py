@@ -0,0 +1,253 @@
+import heapq
+from DijkstraSolver import DijkstraSolver
+
+INF = float('inf')
+
+class ContractionHierarchy:
+    """
+    Motor de rutas con jerarquías de contracción (Contraction Hierarchies).
+
+    El preproceso ordena las ciudades por importancia y las "contrae" una a una: al
+    quitar la ciudad v, cada camino u -> v -> w que sea el más corto entre u y w se
+    sustituye por un atajo u -> w con el mismo peso. Las consultas son una búsqueda
+    bidireccional que solo sube en la jerarquía, y los atajos de la ruta resultante
+    se expanden de nuevo en la secuencia real de ciudades.
+
+    Está pensado para una red estática entre actualizaciones de pesos: si la versión
+    del grafo cambia, la siguiente consulta repite el preproceso.
+    """
+
+    # Nodos que como máximo asienta cada búsqueda de testigos al contraer un nodo y
+    # al estimar su prioridad (la estimación puede ser más barata e imprecisa)
+    LIMITE_TESTIGO = 500
+    LIMITE_TESTIGO_PRIORIDAD = 30
+
+    def __init__(self, graph, modelo=None):
+        """
+        Args:
+            graph (Graph | GrafoCSR): Grafo sobre el que construir la jerarquía.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+        """
+        self.graph = graph
+        self.modelo = modelo
+        self.version = None
+        self.rank = []  # Posición de cada nodo en el orden de contracción
+        self.upward = []  # upward[u]: aristas (w, peso) con rank[w] > rank[u]
+        self.downward = []  # downward[w]: aristas invertidas (u, peso) con rank[u] > rank[w]
+        self.middle = {}  # (u, w) -> nodo contraído que sustituye el atajo
+        self.num_shortcuts = 0
+        self.last_cost = INF
+        self.last_expanded = 0
+        self.construir()
+
+    def construir(self):
+        """
+        Ejecuta el preproceso: ordenación de nodos, contracción y creación de atajos.
+        """
+        forward, _ = DijkstraSolver(self.graph, self.modelo)._adjacency()
+        num_nodes = len(self.graph.nodes)
+
+        # Grafo de trabajo con la arista más ligera entre cada par de nodos
+        out_adj = [dict() for _ in range(num_nodes)]
+        in_adj = [dict() for _ in range(num_nodes)]
+        for u in range(num_nodes):
+            for w, weight in forward(u):
+                if w != u and weight < out_adj[u].get(w, INF):
+                    out_adj[u][w] = weight
+                    in_adj[w][u] = weight
+
+        deleted_neighbors = [0] * num_nodes
+        middle = {}
+        rank = [0] * num_nodes
+        # Grafos de búsqueda: hacia arriba desde el origen, hacia arriba (invertido) desde el destino
+        upward = [[] for _ in range(num_nodes)]
+        downward = [[] for _ in range(num_nodes)]
+
+        def witness_distances(source, excluded, max_cost, targets, limit):
+            # Dijkstra local desde source sin pasar por excluded (los nodos contraídos ya
+            # no están en el grafo de trabajo); termina al asentar todos los destinos,
+            # al superar max_cost o al llegar al límite de nodos asentados
+            distances = {source: 0.0}
+            queue = [(0.0, source)]
+            settled = 0
+            pending = len(targets)
+            while queue and settled < limit and pending:
+                current_dist, current = heapq.heappop(queue)
+                if current_dist > distances[current]:
+                    continue
+                if current_dist > max_cost:
+                    break
+                settled += 1
+                if current in targets:
+                    pending -= 1
+                for neighbor, weight in out_adj[current].items():
+                    if neighbor == excluded:
+                        continue
+                    new_dist = current_dist + weight
+                    if new_dist < distances.get(neighbor, INF):
+                        distances[neighbor] = new_dist
+                        heapq.heappush(queue, (new_dist, neighbor))
+            return distances
+
+        def shortcuts_needed(v, limit):
+            # Atajos (u, w, peso) imprescindibles al contraer v
+            shortcuts = []
+            outs = out_adj[v]
+            if not outs:
+                return shortcuts, len(in_adj[v]), 0
+            max_out = max(outs.values())
+            targets = set(outs)
+            for u, weight_in in in_adj[v].items():
+                distances = witness_distances(u, v, weight_in + max_out, targets, limit)
+                for w, weight_out in outs.items():
+                    if w == u:
+                        continue
+                    cost = weight_in + weight_out
+                    if distances.get(w, INF) > cost:
+                        shortcuts.append((u, w, cost))
+            return shortcuts, len(in_adj[v]), len(outs)
+
+        def priority(v, shortcuts, num_in, num_out):
+            # Diferencia de aristas más vecinos ya contraídos (reparte la contracción)
+            return len(shortcuts) - num_in - num_out + deleted_neighbors[v]
+
+        estimate = self.LIMITE_TESTIGO_PRIORIDAD
+        queue = [(priority(v, *shortcuts_needed(v, estimate)), v) for v in range(num_nodes)]
+        heapq.heapify(queue)
+        order = 0
+        num_shortcuts = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Actualización perezosa: si su prioridad empeoró, vuelve a la cola
+            current = priority(v, *shortcuts_needed(v, estimate))
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            shortcuts, _, _ = shortcuts_needed(v, self.LIMITE_TESTIGO)
+            for u, w, cost in shortcuts:
+                if cost < out_adj[u].get(w, INF):
+                    out_adj[u][w] = cost
+                    in_adj[w][u] = cost
+                    middle[(u, w)] = v
+                    num_shortcuts += 1
+
+            # Los vecinos que quedan se contraerán después: sus aristas suben en la jerarquía
+            rank[v] = order
+            order += 1
+            upward[v] = list(out_adj[v].items())
+            downward[v] = list(in_adj[v].items())
+            for w in out_adj[v]:
+                del in_adj[w][v]
+                deleted_neighbors[w] += 1
+            for u in in_adj[v]:
+                del out_adj[u][v]
+                if u not in out_adj[v]:
+                    deleted_neighbors[u] += 1
+            out_adj[v] = {}
+            in_adj[v] = {}
+
+        self.rank = rank
+        self.upward = upward
+        self.downward = downward
+        self.middle = middle
+        self.num_shortcuts = num_shortcuts
+        self.version = self.graph.version
+
+    def vigente(self):
+        """Indica si la jerarquía corresponde a la versión actual del grafo."""
+        return self.version == self.graph.version
+
+    def find_shortest_path(self, origin_node, destination_node):
+        """
+        Busca la ruta más ligera con la misma interfaz que DijkstraSolver.
+
+        Args:
+            origin_node (Node): Ciudad origen.
+            destination_node (Node): Ciudad destino.
+
+        Returns:
+            List[Node]: Ruta con todas las ciudades reales (solo el destino si no es alcanzable).
+        """
+        path_ids = self.find_shortest_path_ids(origin_node.id, destination_node.id)
+        return [self.graph.nodes[node_id] for node_id in path_ids]
+
+    def find_shortest_path_ids(self, origin_id, destination_id):
+        """
+        Consulta bidireccional hacia arriba en la jerarquía sobre ids enteros.
+
+        Returns:
+            List[int]: Ids de la ruta expandida (solo el destino si no es alcanzable).
+        """
+        if not self.vigente():
+            self.construir()
+
+        heappop, heappush = heapq.heappop, heapq.heappush
+        distances = ({origin_id: 0.0}, {destination_id: 0.0})
+        previous = ({origin_id: None}, {destination_id: None})
+        queues = ([(0.0, origin_id)], [(0.0, destination_id)])
+        graphs = (self.upward, self.downward)
+        best, meeting = (0.0, origin_id) if origin_id == destination_id else (INF, None)
+        expanded = 0
+
+        while queues[0] or queues[1]:
+            # Cada dirección se detiene cuando su mínimo ya no puede mejorar best
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                if queue[0][0] >= best:
+                    queue.clear()
+                    continue
+                current_dist, current = heappop(queue)
+                dist_side = distances[side]
+                if current_dist > dist_side[current]:
+                    continue
+                expanded += 1
+                other = distances[1 - side].get(current)
+                if other is not None and current_dist + other < best:
+                    best, meeting = current_dist + other, current
+                prev_side = previous[side]
+                for neighbor, weight in graphs[side][current]:
+                    new_dist = current_dist + weight
+                    if new_dist < dist_side.get(neighbor, INF):
+                        dist_side[neighbor] = new_dist
+                        prev_side[neighbor] = current
+                        heappush(queue, (new_dist, neighbor))
+
+        self.last_expanded = expanded
+        self.last_cost = best
+        if meeting is None:
+            return [destination_id]
+
+        # Aristas de la jerarquía: origen -> encuentro y encuentro -> destino
+        up_path = []
+        node_id = meeting
+        while node_id is not None:
+            up_path.append(node_id)
+            node_id = previous[0][node_id]
+        up_path.reverse()
+        node_id = previous[1][meeting]
+        while node_id is not None:
+            up_path.append(node_id)
+            node_id = previous[1][node_id]
+
+        path = [up_path[0]]
+        for u, w in zip(up_path, up_path[1:]):
+            self._unpack(u, w, path)
+        return path
+
+    def _unpack(self, u, w, path):
+        """
+        Añade a path las ciudades reales de la arista u -> w (sin u), expandiendo atajos.
+        """
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            v = self.middle.get((a, b))
+            if v is None:
+                path.append(b)
+            else:
+                # Se expande primero a -> v, así que se apila después
+                stack.append((v, b))
+                stack.append((a, v))
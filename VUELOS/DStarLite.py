@@ -0,0 +1,222 @@
+import heapq
+import time
+from EstadisticasBusqueda import BusquedaInstrumentada
+from ModeloPeso import MODELO_ESTANDAR
+
+INF = float('inf')
+
+class DStarLite(BusquedaInstrumentada):
+    """
+    Planificador incremental D* Lite hacia un destino fijo sobre un Graph.
+
+    Mantiene, buscando hacia atrás desde el destino, g(v) (coste conocido de v al
+    destino) y rhs(v) (el mismo coste calculado a partir de los sucesores). Cuando
+    cambia el peso de una ruta u -> w solo se recalcula rhs(u) y se propagan las
+    inconsistencias, así que el coste de replanificar depende de la parte de la red
+    afectada por el cambio y no del tamaño total. Se usa heurística nula, con lo que
+    el avance del avión no obliga a corregir las claves de la cola.
+
+    Las estadísticas (ver BusquedaInstrumentada) se publican por cada llamada a
+    cost_from o path_from y cubren solo el trabajo de esa replanificación; como
+    mejoras se cuentan las actualizaciones de rhs que encolaron un nodo, y como rutas
+    examinadas las recorridas al expandir nodos y al recalcular sus rhs.
+    """
+
+    def __init__(self, graph, destination_node, modelo=None):
+        """
+        Args:
+            graph (Graph): Grafo de ciudades y rutas (no una instantánea CSR).
+            destination_node (Node): Ciudad destino del plan.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+        """
+        self.graph = graph
+        self.goal = destination_node.id
+        self.modelo = None if modelo == MODELO_ESTANDAR else modelo
+        self.version = graph.version  # Versión del grafo ya incorporada al plan
+        self.g = {}
+        self.rhs = {self.goal: 0.0}
+        self.queue = [(0.0, self.goal)]
+        self.queued = {self.goal: 0.0}  # Clave vigente de cada nodo en la cola
+        self.last_expanded = 0
+        self.heap_pushes = 1  # Inserciones en la cola desde que se creó el plan
+        graph.register_change_reader(self)
+
+    def _weights(self):
+        # Pesos por edge.id del modelo no estándar, o None para usar edge.peso
+        if self.modelo is None:
+            return None
+        return self.modelo.pesos_grafo(self.graph)
+
+    def _update_vertex(self, node_id, pesos):
+        """
+        Recalcula rhs(node_id) a partir de sus rutas salientes y lo encola si queda
+        inconsistente (g distinto de rhs).
+
+        Returns:
+            bool: True si se ha añadido una entrada nueva a la cola.
+        """
+        if node_id != self.goal:
+            g = self.g
+            best = INF
+            for edge in self.graph.nodes[node_id].edges:
+                cost = (edge.peso if pesos is None else pesos[edge.id]) + g.get(edge.destination.id, INF)
+                if cost < best:
+                    best = cost
+            self.rhs[node_id] = best
+
+        return self._enqueue(node_id)
+
+    def _enqueue(self, node_id):
+        """
+        Encola node_id con su clave si es inconsistente o lo retira si ya no lo es.
+
+        Returns:
+            bool: True si se ha añadido una entrada nueva a la cola.
+        """
+        g_value = self.g.get(node_id, INF)
+        rhs_value = self.rhs.get(node_id, INF)
+        if g_value != rhs_value:
+            key = min(g_value, rhs_value)
+            if self.queued.get(node_id) != key:
+                self.queued[node_id] = key
+                heapq.heappush(self.queue, (key, node_id))
+                self.heap_pushes += 1
+                return True
+        else:
+            self.queued.pop(node_id, None)
+        return False
+
+    def _compute(self, start_id, pesos):
+        """
+        Procesa la cola hasta que el origen es consistente y ninguna clave pendiente
+        puede mejorarlo.
+        """
+        g, rhs, queue, queued = self.g, self.rhs, self.queue, self.queued
+        nodes, reverse_edges = self.graph.nodes, self.graph.reverse_edges
+        heappop, heappush = heapq.heappop, heapq.heappush
+        medir = self.recoger_estadisticas
+        if medir:
+            inicio, pushes_inicio, queue_inicio = time.perf_counter(), self.heap_pushes, len(queue)
+        expanded = 0
+        scanned = 0
+        pushes = 0
+        while queue:
+            key, node_id = queue[0]
+            g_start = g.get(start_id, INF)
+            if key >= g_start and g_start == rhs.get(start_id, INF):
+                break
+            heappop(queue)
+            if queued.get(node_id) != key:
+                continue  # Entrada obsoleta
+            del queued[node_id]
+            expanded += 1
+
+            g_old = g.get(node_id, INF)
+            rhs_value = rhs.get(node_id, INF)
+            if medir:
+                scanned += len(reverse_edges[node_id])
+            if g_old > rhs_value:
+                g[node_id] = rhs_value
+                # Solo puede mejorar rhs de los predecesores: basta comparar con esta ruta
+                for edge in reverse_edges[node_id]:
+                    pred = edge.origin.id
+                    cost = (edge.peso if pesos is None else pesos[edge.id]) + rhs_value
+                    if cost < rhs.get(pred, INF):
+                        rhs[pred] = cost
+                        g_pred = g.get(pred, INF)
+                        if g_pred == cost:
+                            queued.pop(pred, None)
+                        else:
+                            pred_key = cost if cost < g_pred else g_pred
+                            if queued.get(pred) != pred_key:
+                                queued[pred] = pred_key
+                                heappush(queue, (pred_key, pred))
+                                pushes += 1
+            else:
+                g[node_id] = INF
+                self._update_vertex(node_id, pesos)
+                for edge in reverse_edges[node_id]:
+                    self._update_vertex(edge.origin.id, pesos)
+                if medir:
+                    # _update_vertex recorre las rutas salientes del nodo y de cada predecesor
+                    scanned += len(nodes[node_id].edges) + sum(
+                        len(edge.origin.edges) for edge in reverse_edges[node_id])
+        self.last_expanded = expanded
+        self.heap_pushes += pushes
+        if medir:
+            # Lo que ya estaba en la cola al empezar también pudo extraerse en esta llamada
+            pushes_total = self.heap_pushes - pushes_inicio
+            self._registrar('d_star_lite', start_id, self.goal, inicio, pushes_total,
+                            queue_inicio + pushes_total - len(queue), expanded, pushes_total,
+                            scanned, g.get(start_id, INF))
+
+    def apply_changes(self, edges):
+        """
+        Incorpora al plan rutas creadas o modificadas (p. ej. Graph.edges_changed_since).
+
+        Args:
+            edges (iterable): Aristas con su peso ya actualizado.
+
+        Returns:
+            int: Ciudades que han quedado inconsistentes. Si es 0 ningún coste
+            hasta el destino ha cambiado y las rutas ya calculadas siguen valiendo.
+        """
+        pesos = self._weights()
+        dirty = 0
+        for origin_id in {edge.origin.id for edge in edges}:
+            dirty += self._update_vertex(origin_id, pesos)
+        self.version = self.graph.version
+        return dirty
+
+    def sync(self):
+        """
+        Incorpora todos los cambios del grafo desde la última sincronización.
+
+        Returns:
+            int: Ciudades que han quedado inconsistentes (0 si el plan sigue valiendo).
+        """
+        if self.version == self.graph.version:
+            return 0
+        return self.apply_changes(self.graph.edges_changed_since(self.version))
+
+    def cost_from(self, start_node):
+        """
+        Coste de la mejor ruta desde start_node hasta el destino.
+
+        Returns:
+            float: Coste (inf si no es alcanzable).
+        """
+        self._compute(start_node.id, self._weights())
+        return self.g.get(start_node.id, INF)
+
+    def path_from(self, start_node):
+        """
+        Completa la planificación desde start_node y devuelve la ruta hasta el destino,
+        siguiendo en cada ciudad la ruta saliente que minimiza peso + g(sucesor).
+
+        Args:
+            start_node (Node): Posición actual del avión.
+
+        Returns:
+            List[Node]: Ruta (solo el destino si no es alcanzable, como DijkstraSolver).
+        """
+        pesos = self._weights()
+        self._compute(start_node.id, pesos)
+        nodes = self.graph.nodes
+        if self.g.get(start_node.id, INF) == INF:
+            return [nodes[self.goal]]
+
+        g = self.g
+        path = [start_node]
+        current = start_node
+        while current.id != self.goal:
+            best, best_node = INF, None
+            for edge in current.edges:
+                cost = (edge.peso if pesos is None else pesos[edge.id]) + g.get(edge.destination.id, INF)
+                if cost < best:
+                    best, best_node = cost, edge.destination
+            if best_node is None:
+                return [nodes[self.goal]]
+            current = best_node
+            path.append(current)
+        return path
@@ -1,49 +1,495 @@
 import heapq
+import time
+from array import array
+from ArbolRutas import ArbolRutas
+from EstadisticasBusqueda import BusquedaInstrumentada
+from GrafoCSR import GrafoCSR
+from ModeloPeso import MODELO_ESTANDAR
 
-class DijkstraSolver:
+class DijkstraSolver(BusquedaInstrumentada):
     """
     Implementa el algoritmo de Dijkstra para encontrar la ruta más ligera entre dos ciudades.
+    Funciona tanto sobre un Graph de objetos Node/Edge como sobre una instantánea GrafoCSR.
+
+    Las distancias y predecesores se guardan en listas indexadas por id de nodo que se
+    reutilizan entre consultas. Cada consulta usa una nueva generación y una entrada solo
+    es válida si su sello coincide con la generación actual, así que no hace falta
+    reinicializar nada: el coste de una consulta depende solo de la zona explorada.
+    Por ello una instancia no debe usarse desde varios hilos a la vez.
+
+    Con activar_estadisticas() o suscribir_estadisticas() cada consulta publica un
+    EstadisticasBusqueda (ver BusquedaInstrumentada); si no, no se recoge nada.
     """
 
-    def __init__(self, graph):
+    # Árboles de rutas (ver shortest_path_tree) que se conservan por versión del grafo
+    MAX_ARBOLES = 64
+
+    def __init__(self, graph, modelo=None):
+        """
+        Args:
+            graph (Graph | GrafoCSR): Grafo sobre el que buscar rutas.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None). En una
+                instantánea CSR los pesos ya vienen calculados con su propio modelo.
+        """
         self.graph = graph
         self.counter = 0  # Contador para desempatar en el heap
+        self.is_csr = isinstance(graph, GrafoCSR)
+        if modelo == MODELO_ESTANDAR:
+            modelo = None
+        if self.is_csr and modelo is not None and modelo != graph.modelo:
+            raise ValueError("La instantánea CSR tiene los pesos calculados con otro modelo")
+        self.modelo = modelo
+
+        # Almacenamiento reutilizable indexado por id de nodo
+        self._distances = []
+        self._previous = []
+        self._stamps = []
+        self._generation = 0
+        self.last_cost = float('inf')  # Coste de la última ruta calculada
+        self.last_expanded = 0  # Nodos expandidos en la última consulta
+        self._trees = {}  # Id de origen -> ArbolRutas de la versión _trees_version
+        self._trees_version = None
+        self.last_batch = None  # Estadísticas de la última llamada a find_shortest_paths
+
+    def _pesos_modelo(self):
+        # Pesos por edge.id del modelo no estándar, o None para usar edge.peso
+        if self.modelo is None or self.is_csr:
+            return None
+        return self.modelo.pesos_grafo(self.graph)
+
+    def _new_generation(self):
+        """
+        Prepara el almacenamiento para una nueva consulta en O(1) amortizado.
+        Solo crece si el grafo tiene más nodos que en consultas anteriores.
+
+        Returns:
+            int: Generación de la consulta.
+        """
+        num_nodes = self.graph.num_nodes if self.is_csr else len(self.graph.nodes)
+        missing = num_nodes - len(self._stamps)
+        if missing > 0:
+            self._distances.extend([float('inf')] * missing)
+            self._previous.extend([None] * missing)
+            self._stamps.extend([0] * missing)
+        self._generation += 1
+        return self._generation
 
     def find_shortest_path(self, origin_node, destination_node):
-        distances = {node: float('inf') for node in self.graph.nodes}
-        previous = {node: None for node in self.graph.nodes}
-        distances[origin_node] = 0
+        if self.is_csr:
+            path_ids = self.find_shortest_path_ids(origin_node.id, destination_node.id)
+            return [self.graph.nodes[node_id] for node_id in path_ids]
+
+        medir = self.recoger_estadisticas
+        if medir:
+            inicio, counter_inicio = time.perf_counter(), self.counter
+        pesos = self._pesos_modelo()
+        generation = self._new_generation()
+        distances, previous, stamps = self._distances, self._previous, self._stamps
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        origin_id = origin_node.id
+        stamps[origin_id] = generation
+        distances[origin_id] = 0
+        previous[origin_id] = None
 
         # Usar contador para evitar comparaciones entre nodos
         queue = [(0, self.counter, origin_node)]
         self.counter += 1
+        expanded = 0
+        scanned = 0
 
         while queue:
-            current_dist, _, current_node = heapq.heappop(queue)
+            current_dist, _, current_node = heappop(queue)
 
             if current_node == destination_node:
                 break
 
             # Skip si ya procesamos un camino mejor
-            if current_dist > distances[current_node]:
+            if current_dist > distances[current_node.id]:
                 continue
+            expanded += 1
+            if medir:
+                scanned += len(current_node.edges)
 
             for edge in current_node.edges:
                 neighbor = edge.destination
-                weight = edge.calcular_peso()
+                neighbor_id = neighbor.id
+                weight = edge.peso if pesos is None else pesos[edge.id]
                 new_dist = current_dist + weight
 
-                if new_dist < distances[neighbor]:
-                    distances[neighbor] = new_dist
-                    previous[neighbor] = current_node
-                    heapq.heappush(queue, (new_dist, self.counter, neighbor))
+                if stamps[neighbor_id] != generation or new_dist < distances[neighbor_id]:
+                    stamps[neighbor_id] = generation
+                    distances[neighbor_id] = new_dist
+                    previous[neighbor_id] = current_node
+                    heappush(queue, (new_dist, self.counter, neighbor))
                     self.counter += 1
 
-        # Reconstruir ruta
+        # Reconstruir ruta (append + reverse en lugar de insert(0), que es cuadrático)
+        self.last_expanded = expanded
+        destination_id = destination_node.id
+        reached = stamps[destination_id] == generation
+        self.last_cost = distances[destination_id] if reached else float('inf')
+        if medir:
+            # El contador de desempate avanza una vez por cada inserción en el heap
+            self._registrar_busqueda('dijkstra', origin_id, destination_id, inicio,
+                                     self.counter - counter_inicio, len(queue), expanded + reached, scanned)
+        if not reached:
+            return [destination_node]
         path = []
         current = destination_node
         while current:
-            path.insert(0, current)
-            current = previous[current]
+            path.append(current)
+            current = previous[current.id]
+        path.reverse()
+        return path
+
+    def find_shortest_path_ids(self, origin_id, destination_id):
+        """
+        Dijkstra sobre la instantánea CSR usando identificadores enteros.
+        Los ids se comparan directamente en el heap, así que no hace falta contador.
+
+        Args:
+            origin_id (int): Id de la ciudad origen.
+            destination_id (int): Id de la ciudad destino.
+
+        Returns:
+            List[int]: Ids de la ruta (solo el destino si no es alcanzable).
+        """
+        medir = self.recoger_estadisticas
+        if medir:
+            inicio = time.perf_counter()
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        weights = self.graph.weights
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        generation = self._new_generation()
+        distances, previous, stamps = self._distances, self._previous, self._stamps
+        stamps[origin_id] = generation
+        distances[origin_id] = 0
+        previous[origin_id] = None
+        queue = [(0, origin_id)]
+        expanded = 0
+        scanned = 0
+        pushes = 1
+
+        while queue:
+            current_dist, current = heappop(queue)
 
+            if current == destination_id:
+                break
+
+            if current_dist > distances[current]:
+                continue
+            expanded += 1
+
+            start, end = offsets[current], offsets[current + 1]
+            scanned += end - start
+            for neighbor, weight in zip(targets[start:end], weights[start:end]):
+                new_dist = current_dist + weight
+                if stamps[neighbor] != generation or new_dist < distances[neighbor]:
+                    stamps[neighbor] = generation
+                    distances[neighbor] = new_dist
+                    previous[neighbor] = current
+                    heappush(queue, (new_dist, neighbor))
+                    pushes += 1
+
+        # Reconstruir ruta
+        self.last_expanded = expanded
+        reached = stamps[destination_id] == generation
+        self.last_cost = distances[destination_id] if reached else float('inf')
+        if medir:
+            self._registrar_busqueda('dijkstra_csr', origin_id, destination_id, inicio,
+                                     pushes, len(queue), expanded + reached, scanned)
+        if not reached:
+            return [destination_id]
+        path = [destination_id]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+
+    def find_shortest_paths(self, queries):
+        """
+        Resuelve un lote de consultas origen/destino agrupándolas por origen: se hace
+        una sola búsqueda por origen distinto, que se detiene en cuanto quedan asentados
+        todos los destinos pedidos desde él.
+
+        Args:
+            queries (list): Pares (Node origen, Node destino).
+
+        Returns:
+            List[List[Node]]: Una ruta por consulta, en el orden recibido (solo el
+            destino si no es alcanzable). Las estadísticas quedan en self.last_batch.
+        """
+        inicio = time.perf_counter()
+        nodes = self.graph.nodes
+        by_origin = {}
+        for index, (origin_node, destination_node) in enumerate(queries):
+            by_origin.setdefault(origin_node.id, []).append((index, destination_node.id))
+
+        results = [None] * len(queries)
+        expanded = 0
+        for origin_id, targets in by_origin.items():
+            paths = self._search_many(origin_id, {destination_id for _, destination_id in targets})
+            expanded += self.last_expanded
+            for index, destination_id in targets:
+                results[index] = [nodes[node_id] for node_id in paths[destination_id]]
+
+        segundos = time.perf_counter() - inicio
+        self.last_batch = {
+            'queries': len(queries),
+            'origins': len(by_origin),
+            'expanded': expanded,
+            'seconds': segundos,
+            'queries_per_second': len(queries) / segundos if segundos else 0.0,
+        }
+        return results
+
+    def _search_many(self, origin_id, targets):
+        """
+        Dijkstra desde origin_id hasta asentar todos los ids de targets.
+
+        Returns:
+            dict: Id de destino -> ids de la ruta (solo el destino si no es alcanzable).
+        """
+        forward, _ = self._adjacency()
+        heappop, heappush = heapq.heappop, heapq.heappush
+        generation = self._new_generation()
+        distances, previous, stamps = self._distances, self._previous, self._stamps
+        stamps[origin_id] = generation
+        distances[origin_id] = 0.0
+        previous[origin_id] = None
+        queue = [(0.0, origin_id)]
+        pending = set(targets)
+        expanded = 0
+
+        while queue and pending:
+            current_dist, current = heappop(queue)
+            if current_dist > distances[current]:
+                continue
+            pending.discard(current)
+            expanded += 1
+            for neighbor, weight in forward(current):
+                new_dist = current_dist + weight
+                if stamps[neighbor] != generation or new_dist < distances[neighbor]:
+                    stamps[neighbor] = generation
+                    distances[neighbor] = new_dist
+                    previous[neighbor] = current
+                    heappush(queue, (new_dist, neighbor))
+        self.last_expanded = expanded
+
+        paths = {}
+        for destination_id in targets:
+            if stamps[destination_id] != generation:
+                paths[destination_id] = [destination_id]
+                continue
+            path = [destination_id]
+            while previous[path[-1]] is not None:
+                path.append(previous[path[-1]])
+            path.reverse()
+            paths[destination_id] = path
+        return paths
+
+    def shortest_path_tree(self, origin_node):
+        """
+        Calcula (o reutiliza) el árbol de rutas más ligeras desde un origen hacia todas
+        las ciudades. Los árboles se cachean por origen mientras no cambie la versión
+        del grafo, así que listar las rutas de un origen a N destinos cuesta una búsqueda.
+
+        Args:
+            origin_node (Node): Ciudad origen.
+
+        Returns:
+            ArbolRutas: Distancias y predecesores de cada ciudad alcanzable.
+        """
+        if self._trees_version != self.graph.version:
+            self._trees = {}
+            self._trees_version = self.graph.version
+        tree = self._trees.get(origin_node.id)
+        if tree is not None:
+            return tree
+
+        medir = self.recoger_estadisticas
+        if medir:
+            inicio = time.perf_counter()
+        forward, _ = self._adjacency()
+        heappop, heappush = heapq.heappop, heapq.heappush
+        num_nodes = self.graph.num_nodes if self.is_csr else len(self.graph.nodes)
+        origin_id = origin_node.id
+        distances = array('d', [float('inf')]) * num_nodes
+        previous = array('q', [-1]) * num_nodes
+        distances[origin_id] = 0.0
+        queue = [(0.0, origin_id)]
+        grado = self._grados()[0] if medir else None
+        expanded = 0
+        scanned = 0
+        pushes = 1
+        while queue:
+            current_dist, current = heappop(queue)
+            if current_dist > distances[current]:
+                continue
+            expanded += 1
+            if medir:
+                scanned += grado(current)
+            for neighbor, weight in forward(current):
+                new_dist = current_dist + weight
+                if new_dist < distances[neighbor]:
+                    distances[neighbor] = new_dist
+                    previous[neighbor] = current
+                    heappush(queue, (new_dist, neighbor))
+                    pushes += 1
+        self.last_expanded = expanded
+        if medir:
+            # Sin destino ni coste; la cola se vacía, así que se extrajo todo lo insertado
+            self._registrar('arbol', origin_id, None, inicio, pushes, pushes, expanded, pushes - 1,
+                            scanned, None)
+
+        if len(self._trees) >= self.MAX_ARBOLES:
+            del self._trees[next(iter(self._trees))]  # El más antiguo
+        tree = ArbolRutas(self.graph, origin_id, distances, previous, self.graph.version)
+        self._trees[origin_id] = tree
+        return tree
+
+    def _registrar_busqueda(self, algoritmo, origin_id, destination_id, inicio, pushes, queue_left,
+                            settled, scanned, initial=1):
+        # Deduce extracciones y mejoras: cada inserción salvo las iniciales viene de una
+        # relajación que mejoró una distancia, y lo que no quedó en la cola salió
+        self._registrar(algoritmo, origin_id, destination_id, inicio, pushes, pushes - queue_left,
+                        settled, pushes - initial, scanned, self.last_cost)
+
+    def _grados(self):
+        """
+        Devuelve funciones con el número de rutas salientes y entrantes de cada nodo,
+        las que recorren las funciones de _adjacency.
+
+        Returns:
+            tuple: (forward, backward), cada una id -> número de rutas.
+        """
+        if self.is_csr:
+            offsets = self.graph.offsets
+            inverse = self.graph.transpose().offsets
+            return (lambda node_id: offsets[node_id + 1] - offsets[node_id],
+                    lambda node_id: inverse[node_id + 1] - inverse[node_id])
+        nodes = self.graph.nodes
+        reverse_edges = self.graph.reverse_edges
+        return (lambda node_id: len(nodes[node_id].edges),
+                lambda node_id: len(reverse_edges[node_id]))
+
+    def _adjacency(self):
+        """
+        Devuelve funciones de adyacencia hacia delante y hacia atrás sobre ids de nodo.
+        Hacia atrás se usa el índice inverso del Graph o la instantánea traspuesta.
+
+        Returns:
+            tuple: (forward, backward), cada una id -> iterable de (id vecino, peso).
+        """
+        if self.is_csr:
+            return self.graph.neighbors, self.graph.transpose().neighbors
+
+        nodes = self.graph.nodes
+        reverse_edges = self.graph.reverse_edges
+        pesos = self._pesos_modelo()
+        if pesos is None:
+            def forward(node_id):
+                return [(edge.destination.id, edge.peso) for edge in nodes[node_id].edges]
+
+            def backward(node_id):
+                return [(edge.origin.id, edge.peso) for edge in reverse_edges[node_id]]
+        else:
+            def forward(node_id):
+                return [(edge.destination.id, pesos[edge.id]) for edge in nodes[node_id].edges]
+
+            def backward(node_id):
+                return [(edge.origin.id, pesos[edge.id]) for edge in reverse_edges[node_id]]
+        return forward, backward
+
+    def find_shortest_path_bidirectional(self, origin_node, destination_node):
+        """
+        Dijkstra bidireccional: busca a la vez desde el origen sobre las rutas salientes
+        y desde el destino sobre las entrantes, y se detiene cuando la suma de los
+        mínimos de ambas colas ya no puede mejorar el mejor punto de encuentro.
+        Devuelve la misma ruta que find_shortest_path expandiendo muchos menos nodos.
+
+        Args:
+            origin_node (Node): Ciudad origen.
+            destination_node (Node): Ciudad destino.
+
+        Returns:
+            List[Node]: Ruta encontrada (solo el destino si no es alcanzable).
+        """
+        path_ids = self.find_shortest_path_bidirectional_ids(origin_node.id, destination_node.id)
+        return [self.graph.nodes[node_id] for node_id in path_ids]
+
+    def find_shortest_path_bidirectional_ids(self, origin_id, destination_id):
+        """
+        Versión de find_shortest_path_bidirectional sobre identificadores enteros.
+
+        Returns:
+            List[int]: Ids de la ruta (solo el destino si no es alcanzable).
+        """
+        medir = self.recoger_estadisticas
+        if medir:
+            inicio = time.perf_counter()
+        heappop, heappush = heapq.heappop, heapq.heappush
+        forward, backward = self._adjacency()
+        inf = float('inf')
+
+        # Índice 0: búsqueda hacia delante; índice 1: hacia atrás
+        distances = ({origin_id: 0}, {destination_id: 0})
+        previous = ({origin_id: None}, {destination_id: None})
+        queues = ([(0, origin_id)], [(0, destination_id)])
+        settled = (set(), set())
+        neighbors = (forward, backward)
+        grados = self._grados() if medir else None
+        best, meeting = (0, origin_id) if origin_id == destination_id else (inf, None)
+        expanded = 0
+        scanned = 0
+        pushes = 2
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            # Expandir la dirección con la cola de menor distancia mínima
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            current_dist, current = heappop(queues[side])
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+            expanded += 1
+            if medir:
+                scanned += grados[side](current)
+
+            dist_side, prev_side = distances[side], previous[side]
+            dist_other = distances[1 - side]
+            for neighbor, weight in neighbors[side](current):
+                new_dist = current_dist + weight
+                if new_dist < dist_side.get(neighbor, inf):
+                    dist_side[neighbor] = new_dist
+                    prev_side[neighbor] = current
+                    heappush(queues[side], (new_dist, neighbor))
+                    pushes += 1
+                if neighbor in dist_other:
+                    total = dist_side[neighbor] + dist_other[neighbor]
+                    if total < best:
+                        best, meeting = total, neighbor
+
+        self.last_expanded = expanded
+        self.last_cost = best
+        if medir:
+            self._registrar_busqueda('bidireccional', origin_id, destination_id, inicio, pushes,
+                                     len(queues[0]) + len(queues[1]), expanded, scanned, initial=2)
+        if meeting is None:
+            return [destination_id]
+
+        path = []
+        node_id = meeting
+        while node_id is not None:
+            path.append(node_id)
+            node_id = previous[0][node_id]
+        path.reverse()
+        node_id = previous[1][meeting]
+        while node_id is not None:
+            path.append(node_id)
+            node_id = previous[1][node_id]
         return path
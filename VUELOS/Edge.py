@@ -1,3 +1,5 @@
+from ModeloPeso import MODELO_ESTANDAR
+
 class Edge:
     """
     Representa una ruta aérea entre dos ciudades (nodos) con factores que afectan su peso:
@@ -18,23 +20,47 @@ class Edge:
         self.saturacion = saturacion
         self.tiempo = tiempo
         self.animales = animales
+        self.peso = self._recalcular_peso()  # Peso cacheado, se recalcula solo en update()
+        self.graph = None  # Grafo al que notificar los cambios (lo asigna Graph.add_edge)
+        self.id = None  # Identificador entero dentro del grafo (lo asigna Graph.add_edge)
+        self.origin = None  # Nodo de salida (lo asigna Graph.add_edge para el índice inverso)
+
+    def _recalcular_peso(self):
+        return MODELO_ESTANDAR.peso(self.saturacion, self.tiempo, self.animales)
 
-    def calcular_peso(self):
+    def calcular_peso(self, modelo=None):
         """
-        Calcula el peso total de la ruta según los factores.
+        Devuelve el peso total de la ruta según los factores.
+        Con el modelo estándar el valor está cacheado y solo se recalcula
+        cuando update() cambia algún factor.
+        
+        Args:
+            modelo (ModeloPeso): Modelo de coste a aplicar (estándar si es None).
         
         Returns:
             float: Peso total.
         """
-        return self.saturacion * 2 + self.tiempo + self.animales * 3
+        if modelo is None or modelo == MODELO_ESTANDAR:
+            return self.peso
+        return modelo.peso_arista(self)
 
     def update(self, saturacion, tiempo, animales):
         """
-        Actualiza los valores de la arista.
+        Actualiza los valores de la arista. Si alguno cambia, recalcula el peso
+        y notifica al grafo para que incremente su versión.
+        
+        Returns:
+            bool: True si ha cambiado algún valor.
         """
+        if (saturacion, tiempo, animales) == (self.saturacion, self.tiempo, self.animales):
+            return False
         self.saturacion = saturacion
         self.tiempo = tiempo
         self.animales = animales
+        self.peso = self._recalcular_peso()
+        if self.graph is not None:
+            self.graph.notify_edge_changed(self)
+        return True
 
     def get_destination(self):
         """
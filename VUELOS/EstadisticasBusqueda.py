@@ -0,0 +1,113 @@
+import time
+
+
+class EstadisticasBusqueda:
+    """
+    Métricas de una consulta de un solver: operaciones del heap, entradas obsoletas
+    descartadas, rutas examinadas y las que mejoraron una distancia, nodos asentados
+    y tiempo.
+
+    Casi todos los contadores se deducen al terminar la búsqueda a partir de las
+    inserciones, el tamaño final de la cola y los nodos expandidos, así que el bucle
+    de la búsqueda solo lleva la cuenta de las inserciones y de las rutas de cada nodo
+    expandido.
+    """
+
+    __slots__ = ('algoritmo', 'origin_id', 'destination_id', 'heap_pushes', 'heap_pops',
+                 'stale_skipped', 'edges_scanned', 'edges_improved', 'nodes_settled', 'wall_time',
+                 'cost')
+
+    def __init__(self, algoritmo, origin_id, destination_id, heap_pushes, heap_pops,
+                 nodes_settled, edges_improved, edges_scanned, wall_time, cost):
+        """
+        Args:
+            algoritmo (str): Búsqueda que generó las métricas (p. ej. 'dijkstra').
+            origin_id (int): Id del origen.
+            destination_id (int): Id del destino (None si la búsqueda no tenía uno).
+            heap_pushes (int): Entradas insertadas en la cola de prioridad, incluidas
+                las iniciales (el origen).
+            heap_pops (int): Entradas extraídas de la cola.
+            nodes_settled (int): Nodos asentados (extraídos con su distancia definitiva).
+            edges_improved (int): Relajaciones que mejoraron la distancia de un vecino.
+            edges_scanned (int): Rutas examinadas al expandir nodos, mejoraran o no.
+            wall_time (float): Segundos de reloj de la consulta.
+            cost (float): Coste de la ruta encontrada (inf si no es alcanzable, None si
+                la búsqueda no tenía destino).
+        """
+        self.algoritmo = algoritmo
+        self.origin_id = origin_id
+        self.destination_id = destination_id
+        self.heap_pushes = heap_pushes
+        self.heap_pops = heap_pops
+        self.stale_skipped = heap_pops - nodes_settled  # Extracciones descartadas por obsoletas
+        self.edges_scanned = edges_scanned
+        self.edges_improved = edges_improved
+        self.nodes_settled = nodes_settled
+        self.wall_time = wall_time
+        self.cost = cost
+
+    def como_dict(self):
+        """Devuelve las métricas como diccionario (p. ej. para exportarlas en JSON)."""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+    def __repr__(self):
+        return (f"EstadisticasBusqueda({self.algoritmo}, {self.origin_id} -> {self.destination_id}, "
+                f"pushes={self.heap_pushes}, pops={self.heap_pops}, stale={self.stale_skipped}, "
+                f"scanned={self.edges_scanned}, improved={self.edges_improved}, settled={self.nodes_settled}, "
+                f"{self.wall_time * 1000:.3f} ms)")
+
+
+class BusquedaInstrumentada:
+    """
+    Base para los solvers que publican EstadisticasBusqueda.
+
+    La recogida está desactivada por defecto: las búsquedas solo consultan el atributo
+    recoger_estadisticas al empezar y al terminar. Se activa con activar_estadisticas()
+    (la última consulta queda en last_stats) o al suscribir una función, que recibirá
+    las estadísticas de cada consulta (p. ej. un perfilador o un exportador de métricas).
+    """
+
+    recoger_estadisticas = False
+    last_stats = None  # EstadisticasBusqueda de la última consulta, si se recogen
+    _estadisticas_pedidas = False
+    _suscriptores_estadisticas = ()
+
+    def activar_estadisticas(self, activar=True):
+        """
+        Activa o desactiva la recogida de estadísticas en last_stats.
+
+        Args:
+            activar (bool): True para recogerlas aunque no haya suscriptores.
+        """
+        self._estadisticas_pedidas = activar
+        self._actualizar_recogida()
+
+    def suscribir_estadisticas(self, callback):
+        """
+        Registra una función que recibirá las EstadisticasBusqueda de cada consulta.
+
+        Args:
+            callback (callable): Función que recibe un EstadisticasBusqueda.
+        """
+        self._suscriptores_estadisticas = self._suscriptores_estadisticas + (callback,)
+        self._actualizar_recogida()
+
+    def cancelar_estadisticas(self, callback):
+        """Deja de avisar a una función registrada con suscribir_estadisticas."""
+        self._suscriptores_estadisticas = tuple(
+            suscriptor for suscriptor in self._suscriptores_estadisticas if suscriptor != callback)
+        self._actualizar_recogida()
+
+    def _actualizar_recogida(self):
+        self.recoger_estadisticas = self._estadisticas_pedidas or bool(self._suscriptores_estadisticas)
+
+    def _registrar(self, algoritmo, origin_id, destination_id, inicio, heap_pushes, heap_pops,
+                   nodes_settled, edges_improved, edges_scanned, cost):
+        # Crea las estadísticas de la consulta que empezó en inicio y avisa a los suscriptores
+        stats = EstadisticasBusqueda(algoritmo, origin_id, destination_id, heap_pushes, heap_pops,
+                                     nodes_settled, edges_improved, edges_scanned,
+                                     time.perf_counter() - inicio, cost)
+        self.last_stats = stats
+        for callback in self._suscriptores_estadisticas:
+            callback(stats)
+        return stats
@@ -0,0 +1,187 @@
+import time
+from DStarLite import DStarLite
+
+
+class Flight:
+    """
+    Estado de un avión dentro de FleetSimulator: ruta planificada, posición en ella
+    y cambios de ruta sufridos, con la misma información que FlightSimulator.
+    """
+
+    def __init__(self, flight_id, origin, destination, route):
+        self.id = flight_id
+        self.origin = origin
+        self.destination = destination
+        self.route = route
+        self.position = 0
+        self.route_changes = 0  # Contador de cambios de ruta
+        # Una ruta que no empieza en el origen es la respuesta "no alcanzable" de los solvers
+        self.reachable = bool(route) and route[0] is origin
+
+    @property
+    def completed(self):
+        return self.position >= len(self.route) - 1
+
+    def get_route_info(self):
+        """Devuelve información sobre la ruta actual, como FlightSimulator.get_route_info."""
+        return {
+            'route': [node.name for node in self.route],
+            'position': self.position,
+            'current_city': self.route[self.position].name if self.position < len(self.route) else None,
+            'destination': self.destination.name,
+            'completed': self.completed,
+            'route_changes': self.route_changes
+        }
+
+
+class FleetSimulator:
+    """
+    Simulación no interactiva de muchos aviones sobre un mismo Graph.
+
+    En cada paso discreto todos los aviones en vuelo avanzan una ciudad. Los aviones
+    con el mismo destino comparten un planificador D* Lite, así que el trabajo de
+    búsqueda se hace una vez por destino y no por avión; si el grafo no ha cambiado
+    desde el paso anterior ninguna ruta se revisa.
+    """
+
+    def __init__(self, graph, modelo=None):
+        """
+        Args:
+            graph (Graph): Grafo de ciudades y rutas compartido por todos los aviones.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+        """
+        self.graph = graph
+        self.modelo = modelo
+        self.flights = []  # Todos los vuelos, indexados por flight.id
+        self.active = []  # Vuelos que aún no han llegado
+        self.planners = {}  # Id de ciudad destino -> DStarLite
+        self.version = graph.version  # Versión del grafo con la que están planificadas las rutas
+        self.steps = 0
+        self.hops = 0  # Tramos volados entre todos los aviones
+        self.replans = 0  # Pasos en los que hubo que revisar rutas
+        self.route_changes = 0
+        self.step_time = 0.0
+        self.replan_time = 0.0
+        self.replan_latencies = []  # Segundos de cada revisión, para percentiles
+
+    def _planner(self, destination):
+        planner = self.planners.get(destination.id)
+        if planner is None:
+            planner = DStarLite(self.graph, destination, self.modelo)
+            self.planners[destination.id] = planner
+        return planner
+
+    def add_flight(self, origin_name, destination_name):
+        """
+        Añade un avión y calcula su ruta inicial.
+
+        Args:
+            origin_name (str): Ciudad de salida.
+            destination_name (str): Ciudad de llegada.
+
+        Returns:
+            Flight: Vuelo creado.
+        """
+        origin = self.graph.find_node(origin_name)
+        destination = self.graph.find_node(destination_name)
+        if origin is None or destination is None:
+            raise ValueError(f"Ciudad desconocida: {origin_name if origin is None else destination_name}")
+        # Los planificadores existentes deben incorporar antes los cambios pendientes
+        if self.graph.version != self.version:
+            self._replan()
+        route = self._planner(destination).path_from(origin)
+        flight = Flight(len(self.flights), origin, destination, route)
+        self.flights.append(flight)
+        if not flight.completed:
+            self.active.append(flight)
+        return flight
+
+    def _replan(self):
+        """
+        Incorpora los cambios del grafo a cada planificador y revisa la ruta restante
+        de los aviones en vuelo.
+        """
+        inicio = time.perf_counter()
+        # Destinos cuyos costes no han cambiado: las rutas hacia ellos siguen valiendo
+        dirty = {goal for goal, planner in self.planners.items() if planner.sync()}
+        for flight in self.active:
+            if flight.destination.id not in dirty:
+                continue
+            current = flight.route[flight.position]
+            new_route = self.planners[flight.destination.id].path_from(current)
+            if new_route[0] is not current:
+                continue  # Destino inalcanzable ahora: se mantiene la ruta anterior
+            old_route = flight.route[flight.position:]
+            if len(new_route) != len(old_route) or any(a is not b for a, b in zip(new_route, old_route)):
+                flight.route = flight.route[:flight.position] + new_route
+                flight.route_changes += 1
+                self.route_changes += 1
+        self.version = self.graph.version
+        self.replans += 1
+        latency = time.perf_counter() - inicio
+        self.replan_time += latency
+        self.replan_latencies.append(latency)
+
+    def step(self):
+        """
+        Avanza un paso: cada avión en vuelo vuela su siguiente tramo y, si el grafo
+        cambió, se revisan las rutas desde la nueva posición.
+
+        Returns:
+            int: Número de aviones que siguen en vuelo.
+        """
+        inicio = time.perf_counter()
+        still_active = []
+        for flight in self.active:
+            flight.position += 1
+            if flight.position < len(flight.route) - 1:
+                still_active.append(flight)
+        self.hops += len(self.active)
+        self.active = still_active
+        self.steps += 1
+        if self.graph.version != self.version:
+            self._replan()
+        self.step_time += time.perf_counter() - inicio
+        return len(self.active)
+
+    def run(self, max_steps=None, on_step=None):
+        """
+        Avanza hasta que todos los aviones lleguen o se alcance max_steps.
+
+        Args:
+            max_steps (int): Límite de pasos (sin límite si es None).
+            on_step (callable): Función llamada con el simulador antes de cada paso,
+                p. ej. para modificar las condiciones de las rutas.
+
+        Returns:
+            dict: Estadísticas de la simulación (ver estadisticas).
+        """
+        steps = 0
+        while self.active and (max_steps is None or steps < max_steps):
+            if on_step is not None:
+                on_step(self)
+            self.step()
+            steps += 1
+        return self.estadisticas()
+
+    def estadisticas(self):
+        """
+        Devuelve contadores y rendimiento acumulados de la simulación.
+
+        Returns:
+            dict: Pasos, tramos, revisiones, cambios de ruta y tasas por segundo.
+        """
+        return {
+            'flights': len(self.flights),
+            'active': len(self.active),
+            'unreachable': sum(1 for flight in self.flights if not flight.reachable),
+            'steps': self.steps,
+            'hops': self.hops,
+            'replans': self.replans,
+            'route_changes': self.route_changes,
+            'planners': len(self.planners),
+            'step_time': self.step_time,
+            'replan_time': self.replan_time,
+            'steps_per_second': self.steps / self.step_time if self.step_time else 0.0,
+            'hops_per_second': self.hops / self.step_time if self.step_time else 0.0,
+        }
@@ -1,19 +1,68 @@
 from DijkstraSolver import DijkstraSolver
+from DStarLite import DStarLite
+from YenSolver import YenSolver
 
 class FlightSimulator:
     """
-    Simula el vuelo de un avión entre dos ciudades, recalculando la ruta en cada paso.
-    Permite detectar cambios en las condiciones y adaptar la ruta dinámicamente.
+    Simula el vuelo de un avión entre dos ciudades, revisando la ruta en cada paso.
+    Permite detectar cambios en las condiciones y adaptar la ruta dinámicamente:
+    si el grafo no ha cambiado desde el último plan no se recalcula nada, y si ha
+    cambiado se repara el plan con D* Lite a partir de las rutas modificadas.
     """
 
-    def __init__(self, graph, origin_name, destination_name):
+    def __init__(self, graph, origin_name, destination_name, modelo=None, solver=None, incremental=True,
+                 alternativas=3):
         self.graph = graph
+        self.modelo = modelo  # ModeloPeso con el que se evalúan las rutas (estándar si es None)
         self.origin = graph.find_node(origin_name)
         self.destination = graph.find_node(destination_name)
-        self.solver = DijkstraSolver(graph)
-        self.route = self.solver.find_shortest_path(self.origin, self.destination)
+        # Cualquier motor con find_shortest_path(origen, destino), p. ej. ContractionHierarchy
+        # Las estadísticas se activan solo en los motores propios; en el de quien llama
+        # se recogen suscribiéndose durante cada búsqueda (ver _buscar)
+        self.solver = solver or self._activar_estadisticas(DijkstraSolver(graph, modelo))
+        self.incremental = incremental
+        self.planner = None  # DStarLite hacia el destino, creado al necesitarlo
+        self.last_stats = None  # EstadisticasBusqueda de la última búsqueda de ruta
+        if incremental and solver is None:
+            self.planner = self._activar_estadisticas(DStarLite(graph, self.destination, modelo))
+            self.route = self.planner.path_from(self.origin)
+            self.last_stats = self.planner.last_stats
+        else:
+            self.route = self._buscar(self.origin)
+        self.plan_version = graph.version  # Versión del grafo con la que se calculó la ruta
         self.position = 0
         self.route_changes = 0  # Contador de cambios de ruta
+        self.replans = 0  # Revisiones de ruta con el grafo cambiado
+        self.skipped_replans = 0  # Revisiones evitadas por no haber cambios
+        self.alternativas = alternativas  # Rutas alternativas de get_alternatives (y de get_route_info)
+        self._alternatives_key = None  # (posición, versión) de las alternativas calculadas
+        self._alternatives = []
+
+    @staticmethod
+    def _activar_estadisticas(motor):
+        # Los motores sin instrumentación (p. ej. ContractionHierarchy) se usan tal cual
+        if hasattr(motor, 'activar_estadisticas'):
+            motor.activar_estadisticas()
+        return motor
+
+    def _buscar(self, current):
+        """
+        Busca la ruta desde current con self.solver y guarda sus estadísticas. Si el
+        solver es instrumentable, se suscribe solo mientras dura la búsqueda, así que
+        no cambia la configuración de un solver que haya pasado quien llama.
+        """
+        solver = self.solver
+        if not hasattr(solver, 'suscribir_estadisticas'):
+            self.last_stats = None
+            return solver.find_shortest_path(current, self.destination)
+        recogidas = []
+        solver.suscribir_estadisticas(recogidas.append)
+        try:
+            route = solver.find_shortest_path(current, self.destination)
+        finally:
+            solver.cancelar_estadisticas(recogidas.append)
+        self.last_stats = recogidas[-1] if recogidas else None
+        return route
 
     def advance(self):
         """
@@ -29,17 +78,19 @@ class FlightSimulator:
         
         # Calcular peso del enlace actual
         edge = current.find_edge(next_node)
-        peso_actual = edge.calcular_peso() if edge else "N/A"
+        peso_actual = f"{edge.calcular_peso(self.modelo):.2f}" if edge else "N/A"
         
         print(f"\nVolando de {current.name} a {next_node.name}")
-        print(f"   Peso de la ruta: {peso_actual:.2f}")
+        print(f"   Peso de la ruta: {peso_actual}")
         input("   Pulsa Enter para continuar...")
 
         self.position += 1
 
-        # Recalcular ruta desde la nueva posición
+        # Revisar la ruta desde la nueva posición
         if self.position < len(self.route) - 1:
-            new_route = self.solver.find_shortest_path(self.route[self.position], self.destination)
+            new_route = self.replan(self.route[self.position])
+            if new_route is None:
+                return True
             old_route_names = [node.name for node in self.route[self.position:]]
             new_route_names = [node.name for node in new_route]
             
@@ -49,8 +100,38 @@ class FlightSimulator:
                 print(f"   Nueva ruta: {' -> '.join(new_route_names)}")
                 self.route = self.route[:self.position] + new_route
                 self.route_changes += 1
+                for i, alternative in enumerate(self.get_alternatives(), 1):
+                    print(f"   Alternativa {i} ({alternative['cost']:.2f}): {' -> '.join(alternative['route'])}")
 
         return True
+
+    def replan(self, current):
+        """
+        Calcula la ruta desde current si el grafo cambió desde el último plan.
+
+        Args:
+            current (Node): Posición actual del avión.
+
+        Returns:
+            List[Node]: Nueva ruta hasta el destino, o None si no hubo cambios.
+        """
+        if self.graph.version == self.plan_version:
+            self.skipped_replans += 1
+            return None
+
+        self.replans += 1
+        if not self.incremental:
+            new_route = self._buscar(current)
+        else:
+            if self.planner is None:
+                # El plan inicial vino de otro solver: D* Lite parte de cero con el grafo actual
+                self.planner = self._activar_estadisticas(DStarLite(self.graph, self.destination, self.modelo))
+            else:
+                self.planner.sync()
+            new_route = self.planner.path_from(current)
+            self.last_stats = self.planner.last_stats
+        self.plan_version = self.graph.version
+        return new_route
     
     def get_current_position(self):
         """Devuelve la posición actual del avión."""
@@ -58,13 +139,52 @@ class FlightSimulator:
             return self.route[self.position]
         return None
     
-    def get_route_info(self):
-        """Devuelve información sobre la ruta actual."""
+    def get_alternatives(self):
+        """
+        Calcula las mejores rutas alternativas desde la posición actual (algoritmo de
+        Yen), reutilizándolas mientras el avión no avance ni cambie el grafo.
+
+        Returns:
+            List[dict]: Hasta self.alternativas rutas con su 'route' y su 'cost'.
+        """
+        if self.alternativas <= 0 or self.position >= len(self.route) - 1:
+            return []
+        key = (self.position, self.graph.version)
+        if key != self._alternatives_key:
+            with YenSolver(self.graph, self.modelo) as yen:
+                routes = yen.k_shortest_paths(self.route[self.position], self.destination, self.alternativas)
+            self._alternatives = [{'route': [node.name for node in route], 'cost': cost}
+                                  for cost, route in routes]
+            self._alternatives_key = key
+        return self._alternatives
+
+    def get_route_info(self, alternativas=False):
+        """
+        Devuelve información sobre la ruta actual.
+
+        Args:
+            alternativas (bool): Si es True se calculan las rutas alternativas (algoritmo
+                de Yen, varias búsquedas) si no están al día; si es False solo se
+                incluyen las ya calculadas para la posición y versión actuales.
+
+        Returns:
+            dict: Ruta, posición, contadores, estadísticas de la última búsqueda y alternativas.
+        """
+        if alternativas:
+            alternatives = self.get_alternatives()
+        elif self._alternatives_key == (self.position, self.graph.version):
+            alternatives = self._alternatives
+        else:
+            alternatives = []
         return {
             'route': [node.name for node in self.route],
             'position': self.position,
             'current_city': self.route[self.position].name if self.position < len(self.route) else None,
             'destination': self.destination.name,
             'completed': self.position >= len(self.route) - 1,
-            'route_changes': self.route_changes
+            'route_changes': self.route_changes,
+            'replans': self.replans,
+            'skipped_replans': self.skipped_replans,
+            'last_query_stats': self.last_stats.como_dict() if self.last_stats is not None else None,
+            'alternatives': alternatives
         }
@@ -0,0 +1,108 @@
+import random
+import time
+
+
+class GeneradorCondiciones:
+    """
+    Genera cambios aleatorios de las condiciones de vuelo (tráfico, meteorología,
+    fauna) para ejercitar el recálculo de rutas.
+
+    Cada lote elige al azar una fracción de las rutas y aplica a sus factores un
+    paseo aleatorio gaussiano, limitado a los rangos válidos de crear_bd, a través
+    de Edge.update. Con la misma semilla y el mismo grafo la secuencia de cambios es
+    siempre la misma. Tras cada lote se avisa a los suscriptores con la lista de
+    aristas modificadas, p. ej. DStarLite.apply_changes.
+    """
+
+    # Rangos válidos de cada factor (los mismos que usa crear_bd)
+    RANGOS = {
+        'saturacion': (0.01, 0.99),
+        'tiempo': (0.1, 3.0),
+        'animales': (0.01, 0.99),
+    }
+
+    def __init__(self, graph, tasa=0.001, paso_saturacion=0.05, paso_tiempo=0.05,
+                 paso_animales=0.05, seed=None):
+        """
+        Args:
+            graph (Graph): Grafo cuyas rutas se modifican.
+            tasa (float): Fracción de rutas modificadas en cada lote (al menos una).
+            paso_saturacion (float): Desviación típica del paso de saturación.
+            paso_tiempo (float): Desviación típica del paso de tiempo.
+            paso_animales (float): Desviación típica del paso de animales.
+            seed (int): Semilla del generador (aleatoria si es None).
+        """
+        self.graph = graph
+        self.tasa = tasa
+        self.pasos = (paso_saturacion, paso_tiempo, paso_animales)
+        self.rng = random.Random(seed)
+        self.suscriptores = []
+        self.lotes = 0
+        self.cambios = 0  # Aristas cuyos valores cambiaron de verdad
+        self.tiempo_total = 0.0  # Segundos aplicando cambios (sin contar suscriptores)
+
+    def suscribir(self, callback):
+        """
+        Registra una función que recibirá la lista de aristas cambiadas en cada lote.
+
+        Args:
+            callback (callable): Función que recibe una lista de Edge.
+        """
+        self.suscriptores.append(callback)
+
+    def cancelar(self, callback):
+        """Deja de avisar a una función registrada con suscribir."""
+        if callback in self.suscriptores:
+            self.suscriptores.remove(callback)
+
+    def aplicar(self):
+        """
+        Aplica un lote de cambios y avisa a los suscriptores.
+
+        Returns:
+            List[Edge]: Aristas modificadas en el lote.
+        """
+        inicio = time.perf_counter()
+        edges = self.graph.edges
+        if not edges:
+            return []
+        rng = self.rng
+        gauss = rng.gauss
+        paso_sat, paso_tiempo, paso_anim = self.pasos
+        (sat_min, sat_max), (tiempo_min, tiempo_max), (anim_min, anim_max) = (
+            self.RANGOS['saturacion'], self.RANGOS['tiempo'], self.RANGOS['animales'])
+
+        num_cambios = min(len(edges), max(1, round(self.tasa * len(edges))))
+        changed = []
+        for edge in rng.sample(edges, num_cambios):
+            saturacion = min(sat_max, max(sat_min, edge.saturacion + gauss(0.0, paso_sat)))
+            tiempo = min(tiempo_max, max(tiempo_min, edge.tiempo + gauss(0.0, paso_tiempo)))
+            animales = min(anim_max, max(anim_min, edge.animales + gauss(0.0, paso_anim)))
+            if edge.update(saturacion, tiempo, animales):
+                changed.append(edge)
+        self.lotes += 1
+        self.cambios += len(changed)
+        self.tiempo_total += time.perf_counter() - inicio
+
+        if changed:
+            for callback in self.suscriptores:
+                callback(changed)
+        return changed
+
+    def __call__(self, *_):
+        """Permite usar el generador como on_step de FleetSimulator.run."""
+        return self.aplicar()
+
+    def estadisticas(self):
+        """
+        Devuelve los contadores acumulados del generador.
+
+        Returns:
+            dict: Lotes aplicados, aristas cambiadas y tiempo empleado.
+        """
+        return {
+            'lotes': self.lotes,
+            'cambios': self.cambios,
+            'cambios_por_lote': self.cambios / self.lotes if self.lotes else 0.0,
+            'tiempo': self.tiempo_total,
+        }
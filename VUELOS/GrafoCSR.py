@@ -0,0 +1,139 @@
+from array import array
+
+
+class NodoCSR:
+    """
+    Ciudad de una instantánea construida sin objetos Node (ver cargar_csr_desde_bd):
+    solo id, nombre y coordenadas, sin rutas. Basta para las APIs que reciben o
+    devuelven nodos (find_shortest_path, ArbolRutas.ruta, A*...), que recorren la red
+    a través de los arrays de la instantánea.
+    """
+
+    __slots__ = ('id', 'name', 'latitud', 'longitud')
+
+    def __init__(self, node_id, name, latitud=None, longitud=None):
+        self.id = node_id
+        self.name = name
+        self.latitud = latitud
+        self.longitud = longitud
+
+    def __repr__(self):
+        return f"NodoCSR({self.id}, {self.name!r})"
+
+
+class GrafoCSR:
+    """
+    Instantánea inmutable de un grafo en formato CSR (Compressed Sparse Row).
+    Las rutas salientes del nodo i ocupan las posiciones offsets[i]..offsets[i+1]
+    de los arrays contiguos targets (id del destino) y weights (peso precalculado).
+    """
+
+    def __init__(self, offsets, targets, weights, names, nodes=None, version=None, modelo=None):
+        """
+        Inicializa la instantánea a partir de arrays ya construidos.
+
+        Args:
+            offsets (array): Array de enteros de longitud num_nodes + 1.
+            targets (array): Array de enteros con el id destino de cada ruta.
+            weights (array): Array de floats con el peso de cada ruta.
+            names (tuple): Nombre de cada ciudad, indexado por id.
+            nodes (tuple): Node originales (o NodoCSR) indexados por id.
+            version (int): Versión del grafo de origen al construir la instantánea.
+            modelo (ModeloPeso): Modelo de coste con el que se calcularon los pesos.
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.names = names
+        self.nodes = nodes
+        self.version = version
+        self.modelo = modelo
+        self._transpose = None  # Instantánea con las aristas invertidas (se crea bajo demanda)
+
+    @classmethod
+    def from_graph(cls, graph, modelo=None):
+        """
+        Construye la instantánea a partir de un Graph, precalculando los pesos.
+
+        Args:
+            graph (Graph): Grafo de ciudades y rutas.
+            modelo (ModeloPeso): Modelo de coste (el peso cacheado de cada arista si es None).
+
+        Returns:
+            GrafoCSR: Instantánea del grafo.
+        """
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        pesos = modelo.pesos_grafo(graph) if modelo is not None else None
+        for node in graph.nodes:
+            for edge in node.edges:
+                targets.append(edge.destination.id)
+                weights.append(edge.peso if pesos is None else pesos[edge.id])
+            offsets.append(len(targets))
+        nodes = tuple(graph.nodes)
+        names = tuple(node.name for node in nodes)
+        return cls(offsets, targets, weights, names, nodes, graph.version, modelo)
+
+    @property
+    def num_nodes(self):
+        """Número de ciudades de la instantánea."""
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        """Número de rutas de la instantánea."""
+        return len(self.targets)
+
+    def neighbors(self, node_id):
+        """
+        Devuelve los destinos y pesos de las rutas salientes de un nodo.
+
+        Args:
+            node_id (int): Identificador del nodo origen.
+
+        Returns:
+            zip: Pares (id destino, peso).
+        """
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def transpose(self):
+        """
+        Devuelve la instantánea con todas las rutas invertidas, construida una sola vez.
+        Sus vecinos de i son las ciudades con una ruta hacia i.
+
+        Returns:
+            GrafoCSR: Grafo traspuesto.
+        """
+        if self._transpose is None:
+            num_nodes = self.num_nodes
+            offsets = array('q', [0]) * (num_nodes + 1)
+            for target in self.targets:
+                offsets[target + 1] += 1
+            for i in range(num_nodes):
+                offsets[i + 1] += offsets[i]
+
+            sources = array('q', [0]) * self.num_edges
+            weights = array('d', [0.0]) * self.num_edges
+            cursor = offsets[:-1]
+            for source in range(num_nodes):
+                for k in range(self.offsets[source], self.offsets[source + 1]):
+                    target = self.targets[k]
+                    sources[cursor[target]] = source
+                    weights[cursor[target]] = self.weights[k]
+                    cursor[target] += 1
+
+            self._transpose = GrafoCSR(offsets, sources, weights, self.names, self.nodes,
+                                       self.version, self.modelo)
+            self._transpose._transpose = self
+        return self._transpose
+
+    def nbytes(self):
+        """
+        Devuelve la memoria ocupada por los arrays de la instantánea.
+
+        Returns:
+            int: Bytes de offsets, targets y weights.
+        """
+        return sum(arr.itemsize * len(arr) for arr in (self.offsets, self.targets, self.weights))
@@ -1,5 +1,12 @@
 from Node import Node  # Clase que representa una ciudad (nodo)
 from Edge import Edge  # Clase que representa un enlace (arista)
+from Landmarks import Landmarks, ruta_landmarks
+from array import array
+from bisect import bisect_right
+import weakref
+
+# Entradas que el registro de cambios acumula como mínimo antes de intentar recortarse
+MIN_REGISTRO_CAMBIOS = 1024
 
 class Graph:
     """
@@ -8,7 +15,26 @@ class Graph:
     """
 
     def __init__(self):
-        self.nodes = []  # Lista de nodos únicos
+        self.nodes = []  # Lista de nodos únicos (la posición coincide con node.id)
+        self.node_index = {}  # Índice nombre -> Node, sincronizado con self.nodes
+        self.version = 0  # Se incrementa con cada cambio de nodos, aristas o pesos
+        self.edges = []  # Todas las aristas, indexadas por edge.id
+        self.reverse_edges = []  # Aristas entrantes de cada nodo, indexadas por node.id
+        self.landmarks = None  # Tablas ALT opcionales (ver preparar_landmarks)
+        # Registro de cambios de aristas: versión del grafo tras el cambio y arista afectada
+        self.change_versions = array('q')
+        self.changed_edges = []
+        self.change_log_start = 0  # Versión desde la que el registro está completo
+        # Quienes leen el registro (objeto -> atributo con la última versión que incorporaron)
+        self._change_readers = weakref.WeakKeyDictionary()
+        self._change_log_limit = MIN_REGISTRO_CAMBIOS
+        self.db_path = None  # Base de datos de origen, si se cargó con cargar_grafo_desde_bd
+        self.load_stats = None  # Filas leídas y velocidad de la última carga desde la base de datos
+        self.db_change_seq = 0  # Último cambio de la base de datos incorporado (ver sincronizar_grafo)
+        # Columnas de factores indexadas por edge.id, para evaluar modelos de peso en bloque
+        self.edge_saturacion = array('d')
+        self.edge_tiempo = array('d')
+        self.edge_animales = array('d')
 
     def find_node(self, name):
         """
@@ -20,28 +46,44 @@ class Graph:
         Returns:
             Node: Nodo encontrado o None.
         """
-        for node in self.nodes:
-            if node.name == name:
-                return node
-        return None
+        return self.node_index.get(name)
 
-    def add_or_get_node(self, name):
+    def add_or_get_node(self, name, latitud=None, longitud=None):
         """
         Añade un nodo si no existe, o lo devuelve si ya está en el grafo.
         
         Args:
             name (str): Nombre de la ciudad.
+            latitud (float): Latitud en grados (opcional).
+            longitud (float): Longitud en grados (opcional).
         
         Returns:
             Node: Nodo correspondiente.
         """
-        node = self.find_node(name)
+        node = self.node_index.get(name)
         if node:
+            if latitud is not None and longitud is not None:
+                node.latitud, node.longitud = latitud, longitud
             return node
-        new_node = Node(name)
+        new_node = Node(name, len(self.nodes), latitud, longitud)
         self.nodes.append(new_node)
+        self.node_index[name] = new_node
+        self.reverse_edges.append([])
+        self.version += 1
         return new_node
 
+    def get_node_by_id(self, node_id):
+        """
+        Devuelve el nodo con el identificador entero indicado.
+        
+        Args:
+            node_id (int): Identificador del nodo (posición en self.nodes).
+        
+        Returns:
+            Node: Nodo correspondiente.
+        """
+        return self.nodes[node_id]
+
     def add_edge(self, from_name, to_name, saturacion, tiempo, animales):
         """
         Añade una arista entre dos nodos con los parámetros de peso.
@@ -52,18 +94,122 @@ class Graph:
             saturacion (float): Nivel de tráfico aéreo.
             tiempo (float): Tiempo estimado de vuelo.
             animales (float): Riesgo por fauna aérea.
+        
+        Returns:
+            Edge: Arista creada o actualizada.
         """
         from_node = self.add_or_get_node(from_name)
         to_node = self.add_or_get_node(to_name)
+        return self.add_edge_between(from_node, to_node, saturacion, tiempo, animales)
 
+    def add_edge_between(self, from_node, to_node, saturacion, tiempo, animales):
+        """
+        Igual que add_edge, pero con los nodos ya resueltos (sin buscarlos por nombre).
+        
+        Args:
+            from_node (Node): Ciudad origen, ya presente en el grafo.
+            to_node (Node): Ciudad destino, ya presente en el grafo.
+            saturacion (float): Nivel de tráfico aéreo.
+            tiempo (float): Tiempo estimado de vuelo.
+            animales (float): Riesgo por fauna aérea.
+        
+        Returns:
+            Edge: Arista creada o actualizada.
+        """
         existing_edge = from_node.find_edge(to_node)
         if existing_edge:
             # Actualiza los valores si ya existe
             existing_edge.update(saturacion, tiempo, animales)
+            return existing_edge
         else:
             # Crea una nueva arista
             new_edge = Edge(to_node, saturacion, tiempo, animales)
+            new_edge.graph = self
+            new_edge.origin = from_node
+            new_edge.id = len(self.edges)
+            self.edges.append(new_edge)
+            self.edge_saturacion.append(saturacion)
+            self.edge_tiempo.append(tiempo)
+            self.edge_animales.append(animales)
             from_node.add_edge(new_edge)
+            self.reverse_edges[to_node.id].append(new_edge)
+            self.version += 1
+            self._log_change(new_edge)
+            return new_edge
+
+    def notify_edge_changed(self, edge):
+        """
+        Registra que una arista ha cambiado sus valores (lo llama Edge.update).
+        
+        Args:
+            edge (Edge): Arista modificada.
+        """
+        self.edge_saturacion[edge.id] = edge.saturacion
+        self.edge_tiempo[edge.id] = edge.tiempo
+        self.edge_animales[edge.id] = edge.animales
+        self.version += 1
+        self._log_change(edge)
+
+    def _log_change(self, edge):
+        self.change_versions.append(self.version)
+        self.changed_edges.append(edge)
+        if len(self.changed_edges) > self._change_log_limit:
+            self._trim_change_log()
+
+    def register_change_reader(self, reader, attribute='version'):
+        """
+        Registra un objeto que consulta edges_changed_since (p. ej. un DStarLite o una
+        CacheRutas). El registro de cambios conserva lo posterior a la menor versión ya
+        incorporada por sus lectores y descarta el resto; sin lectores no se conserva
+        nada. Los lectores se guardan con referencias débiles.
+
+        Args:
+            reader (object): Lector del registro.
+            attribute (str): Atributo del lector con la última versión del grafo que ha
+                incorporado (None si aún no ha leído nada).
+        """
+        self._change_readers[reader] = attribute
+
+    def _trim_change_log(self):
+        """
+        Descarta las entradas del registro que ya han leído todos los lectores. Tampoco
+        se guardan más entradas que aristas: a un lector tan atrasado le cuesta lo mismo
+        recibir todas las aristas (ver edges_changed_since).
+        """
+        versions = [getattr(reader, attribute) for reader, attribute in list(self._change_readers.items())]
+        oldest = min((version for version in versions if version is not None), default=self.version)
+        start = max(bisect_right(self.change_versions, oldest), len(self.changed_edges) - len(self.edges))
+        if start > 0:
+            self.change_log_start = max(self.change_log_start, self.change_versions[start - 1])
+            del self.change_versions[:start]
+            del self.changed_edges[:start]
+        # Límite proporcional a lo que queda: el recorte cuesta O(1) amortizado por cambio
+        self._change_log_limit = max(MIN_REGISTRO_CAMBIOS, 2 * len(self.changed_edges))
+
+    def edges_changed_since(self, version):
+        """
+        Devuelve las aristas creadas o modificadas después de una versión del grafo.
+        
+        Args:
+            version (int): Versión de referencia (p. ej. la de la última planificación).
+        
+        Returns:
+            set[Edge]: Aristas cambiadas, sin repetidos.
+        """
+        if version < self.change_log_start:
+            return set(self.edges)  # El registro ya no cubre esa versión
+        start = bisect_right(self.change_versions, version)
+        return set(self.changed_edges[start:])
+
+    def compact_change_log(self):
+        """
+        Vacía el registro de cambios (p. ej. tras una carga masiva). Quien pregunte por
+        una versión anterior recibirá todas las aristas, como si todas hubieran cambiado.
+        """
+        self.change_versions = array('q')
+        self.changed_edges = []
+        self.change_log_start = self.version
+        self._change_log_limit = MIN_REGISTRO_CAMBIOS
 
     def get_neighbors(self, node):
         """
@@ -77,6 +223,44 @@ class Graph:
         """
         return node.edges
 
+    def get_incoming(self, node):
+        """
+        Devuelve las aristas que llegan a un nodo (índice inverso).
+        
+        Args:
+            node (Node): Nodo destino.
+        
+        Returns:
+            List[Edge]: Lista de aristas entrantes (edge.origin es la ciudad de salida).
+        """
+        return self.reverse_edges[node.id]
+
+    def preparar_landmarks(self, k=8, modelo=None, path=None):
+        """
+        Preproceso opcional para la heurística ALT: elige k landmarks y precalcula
+        las distancias desde y hacia cada uno. Si el grafo viene de una base de datos,
+        las tablas se guardan junto a ella y se reutilizan mientras su contenido
+        no cambie. Cualquier cambio posterior de versión las invalida.
+        
+        Args:
+            k (int): Número de landmarks.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+            path (str): Fichero de tablas (por defecto junto a self.db_path).
+        
+        Returns:
+            Landmarks: Tablas preparadas (también quedan en self.landmarks).
+        """
+        if path is None and self.db_path is not None:
+            path = ruta_landmarks(self.db_path)
+
+        landmarks = Landmarks.cargar(path, self, modelo) if path else None
+        if landmarks is None or landmarks.k != k:
+            landmarks = Landmarks.calcular(self, k, modelo)
+            if path:
+                landmarks.guardar(path)
+        self.landmarks = landmarks
+        return landmarks
+
     def display_graph_info(self):
         """
         Muestra estadísticas del grafo.
@@ -0,0 +1,237 @@
+import hashlib
+import heapq
+import os
+import struct
+from array import array
+
+from DijkstraSolver import DijkstraSolver
+from ModeloPeso import MODELO_ESTANDAR
+
+INF = float('inf')
+
+# Cabecera del fichero de tablas: marca, k pedido, landmarks elegidos, número de nodos y
+# huella del grafo (ver firma_grafo). Le siguen los ids de los landmarks ('q') y, por
+# landmark, d(L, v) y después d(v, L) para cada nodo ('d'), como en TablaRutas.
+MARCA = b"VUELOSLM"
+CABECERA = struct.Struct("<8sqqq40s")
+
+
+def distancias_desde(neighbors, origin_id, num_nodes):
+    """
+    Dijkstra de un origen a todos los nodos sobre una función de adyacencia.
+
+    Args:
+        neighbors (callable): Función id -> iterable de (id vecino, peso).
+        origin_id (int): Id del nodo origen.
+        num_nodes (int): Número de nodos del grafo.
+
+    Returns:
+        array: Distancia desde el origen a cada nodo (inf si no es alcanzable).
+    """
+    distances = array('d', [INF]) * num_nodes
+    distances[origin_id] = 0.0
+    queue = [(0.0, origin_id)]
+    while queue:
+        current_dist, current = heapq.heappop(queue)
+        if current_dist > distances[current]:
+            continue
+        for neighbor, weight in neighbors(current):
+            new_dist = current_dist + weight
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                heapq.heappush(queue, (new_dist, neighbor))
+    return distances
+
+
+def firma_grafo(graph, modelo=None):
+    """
+    Calcula una huella del contenido del grafo (ciudades, rutas, factores y modelo)
+    para saber si unas tablas guardadas en disco corresponden a este grafo.
+
+    Returns:
+        str: Huella hexadecimal.
+    """
+    modelo = modelo or MODELO_ESTANDAR
+    huella = hashlib.sha1()
+    huella.update("\0".join(node.name for node in graph.nodes).encode("utf-8"))
+    huella.update(array('q', (edge.origin.id for edge in graph.edges)).tobytes())
+    huella.update(array('q', (edge.destination.id for edge in graph.edges)).tobytes())
+    for columna in (graph.edge_saturacion, graph.edge_tiempo, graph.edge_animales):
+        huella.update(columna.tobytes())
+    huella.update(repr(modelo.clave()).encode("utf-8"))
+    return huella.hexdigest()
+
+
+def ruta_landmarks(db_path):
+    """
+    Devuelve la ruta del fichero de landmarks asociado a una base de datos.
+
+    Args:
+        db_path (str): Ruta al fichero SQLite (p. ej. rutas.db).
+
+    Returns:
+        str: Ruta del fichero de tablas (p. ej. rutas.landmarks).
+    """
+    return os.path.splitext(db_path)[0] + ".landmarks"
+
+
+class Landmarks:
+    """
+    Tablas de distancias precalculadas para la heurística ALT (A*, Landmarks,
+    Triangle inequality). Para cada landmark L se guarda d(L, v) y d(v, L) para
+    todos los nodos v; por la desigualdad triangular
+    d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L)).
+    """
+
+    def __init__(self, landmark_ids, forward, backward, version, firma, modelo_clave, k=None):
+        """
+        Args:
+            landmark_ids (list): Ids de las ciudades elegidas como landmarks.
+            forward (list): Por landmark, array de d(L, v) indexado por id de nodo.
+            backward (list): Por landmark, array de d(v, L) indexado por id de nodo.
+            version (int): Versión del grafo con la que se calcularon las tablas.
+            firma (str): Huella del contenido del grafo (ver firma_grafo).
+            modelo_clave (tuple): Coeficientes del modelo de peso usado.
+            k (int): Landmarks pedidos (pueden elegirse menos si la red no es conexa;
+                por defecto, los elegidos).
+        """
+        self.landmark_ids = landmark_ids
+        self.k = len(landmark_ids) if k is None else k
+        self.forward = forward
+        self.backward = backward
+        self.version = version
+        self.firma = firma
+        self.modelo_clave = modelo_clave
+
+    @classmethod
+    def calcular(cls, graph, k=8, modelo=None):
+        """
+        Elige k landmarks por el método del más lejano y calcula sus tablas.
+        Cada nuevo landmark es la ciudad alcanzable más alejada de los ya elegidos,
+        lo que reparte los landmarks por la periferia de la red.
+
+        Args:
+            graph (Graph): Grafo de ciudades y rutas.
+            k (int): Número de landmarks.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+
+        Returns:
+            Landmarks: Tablas calculadas.
+        """
+        modelo = modelo or MODELO_ESTANDAR
+        forward_adj, backward_adj = DijkstraSolver(graph, modelo)._adjacency()
+        num_nodes = len(graph.nodes)
+
+        landmark_ids, forward, backward = [], [], []
+        # Distancia mínima (en cualquier sentido) de cada nodo a los landmarks elegidos
+        cercania = [INF] * num_nodes
+        candidato = max(range(num_nodes), key=lambda i: len(graph.nodes[i].edges), default=None)
+        while candidato is not None and len(landmark_ids) < min(k, num_nodes):
+            landmark_ids.append(candidato)
+            desde = distancias_desde(forward_adj, candidato, num_nodes)
+            hacia = distancias_desde(backward_adj, candidato, num_nodes)
+            forward.append(desde)
+            backward.append(hacia)
+
+            candidato, lejania = None, -1.0
+            for node_id in range(num_nodes):
+                d = min(desde[node_id], hacia[node_id])
+                if d < cercania[node_id]:
+                    cercania[node_id] = d
+                if cercania[node_id] != INF and cercania[node_id] > lejania and node_id not in landmark_ids:
+                    candidato, lejania = node_id, cercania[node_id]
+
+        return cls(landmark_ids, forward, backward, graph.version,
+                   firma_grafo(graph, modelo), modelo.clave(), k)
+
+    def vigente(self, graph, modelo=None):
+        """
+        Indica si las tablas siguen siendo válidas para el grafo y el modelo:
+        cualquier cambio posterior de la versión del grafo las invalida.
+
+        Returns:
+            bool: True si se pueden usar como heurística.
+        """
+        modelo = modelo or MODELO_ESTANDAR
+        return self.version == graph.version and self.modelo_clave == modelo.clave()
+
+    def heuristica(self, destination_id):
+        """
+        Construye la cota inferior ALT hacia un destino.
+
+        Args:
+            destination_id (int): Id de la ciudad destino.
+
+        Returns:
+            callable: Función id -> cota inferior de d(id, destino).
+        """
+        terminos = []
+        for desde, hacia in zip(self.forward, self.backward):
+            terminos.append((desde, desde[destination_id], hacia, hacia[destination_id]))
+
+        def heuristic(node_id):
+            cota = 0.0
+            for desde, desde_t, hacia, hacia_t in terminos:
+                d_lv = desde[node_id]
+                if d_lv != INF and desde_t - d_lv > cota:
+                    cota = desde_t - d_lv  # Si L llega a v pero no a t, v tampoco llega a t
+                d_vl = hacia[node_id]
+                if hacia_t != INF and d_vl - hacia_t > cota:
+                    cota = d_vl - hacia_t
+            return cota
+        return heuristic
+
+    def guardar(self, path):
+        """
+        Guarda las tablas en disco con un formato fijo de cabecera y arrays.
+
+        Args:
+            path (str): Ruta del fichero.
+        """
+        num_nodes = len(self.forward[0]) if self.forward else 0
+        with open(path, "wb") as fichero:
+            fichero.write(CABECERA.pack(MARCA, self.k, len(self.landmark_ids), num_nodes,
+                                        self.firma.encode("ascii")))
+            array('q', self.landmark_ids).tofile(fichero)
+            for tabla in self.forward + self.backward:
+                tabla.tofile(fichero)
+
+    @classmethod
+    def cargar(cls, path, graph, modelo=None):
+        """
+        Carga tablas guardadas si corresponden al contenido actual del grafo.
+
+        Args:
+            path (str): Ruta del fichero.
+            graph (Graph): Grafo al que se van a asociar.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+
+        Returns:
+            Landmarks: Tablas cargadas, o None si no existen, están obsoletas o el
+            fichero no tiene el formato esperado.
+        """
+        if not os.path.exists(path):
+            return None
+        modelo = modelo or MODELO_ESTANDAR
+        firma = firma_grafo(graph, modelo)
+        num_nodes = len(graph.nodes)
+        try:
+            with open(path, "rb") as fichero:
+                cabecera = fichero.read(CABECERA.size)
+                if len(cabecera) < CABECERA.size:
+                    return None
+                marca, k, num_landmarks, n, firma_fichero = CABECERA.unpack(cabecera)
+                if (marca != MARCA or n != num_nodes or firma_fichero != firma.encode("ascii")
+                        or os.path.getsize(path) != CABECERA.size + num_landmarks * (1 + 2 * n) * 8):
+                    return None
+                landmark_ids = array('q')
+                landmark_ids.fromfile(fichero, num_landmarks)
+                tablas = []
+                for _ in range(2 * num_landmarks):
+                    tabla = array('d')
+                    tabla.fromfile(fichero, n)
+                    tablas.append(tabla)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(list(landmark_ids), tablas[:num_landmarks], tablas[num_landmarks:],
+                   graph.version, firma, modelo.clave(), k)
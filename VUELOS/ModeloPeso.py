@@ -0,0 +1,125 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se calcula arista a arista
+    np = None
+
+class ModeloPeso:
+    """
+    Modelo de coste de una ruta aérea como combinación lineal de sus factores:
+    peso = saturación×c_saturacion + tiempo×c_tiempo + animales×c_animales.
+    Permite recalcular el peso de todas las aristas de un grafo de una vez.
+    """
+
+    def __init__(self, coef_saturacion=2.0, coef_tiempo=1.0, coef_animales=3.0, nombre="estandar"):
+        """
+        Inicializa el modelo con sus coeficientes.
+
+        Args:
+            coef_saturacion (float): Coeficiente de la saturación del tráfico.
+            coef_tiempo (float): Coeficiente del tiempo de vuelo.
+            coef_animales (float): Coeficiente del riesgo por fauna.
+            nombre (str): Nombre descriptivo del perfil.
+        """
+        self.coef_saturacion = coef_saturacion
+        self.coef_tiempo = coef_tiempo
+        self.coef_animales = coef_animales
+        self.nombre = nombre
+        # Caché de pesos del último grafo evaluado: (grafo, versión, pesos)
+        self._cache = (None, None, None)
+
+    def peso(self, saturacion, tiempo, animales):
+        """
+        Calcula el peso de una ruta a partir de sus factores.
+
+        Returns:
+            float: Peso total.
+        """
+        return saturacion * self.coef_saturacion + tiempo * self.coef_tiempo + animales * self.coef_animales
+
+    def peso_arista(self, edge):
+        """
+        Calcula el peso de una arista según este modelo.
+
+        Args:
+            edge (Edge): Ruta aérea.
+
+        Returns:
+            float: Peso total.
+        """
+        return self.peso(edge.saturacion, edge.tiempo, edge.animales)
+
+    def pesos(self, saturacion, tiempo, animales):
+        """
+        Calcula los pesos de muchas rutas a partir de columnas de factores.
+        Con NumPy es una única operación vectorizada sobre los arrays.
+
+        Args:
+            saturacion (array): Columna de saturaciones.
+            tiempo (array): Columna de tiempos.
+            animales (array): Columna de riesgos por fauna.
+
+        Returns:
+            List[float]: Peso de cada ruta, en el mismo orden que las columnas.
+        """
+        if np is not None:
+            saturacion = np.asarray(saturacion, dtype=np.float64)
+            tiempo = np.asarray(tiempo, dtype=np.float64)
+            animales = np.asarray(animales, dtype=np.float64)
+            return (saturacion * self.coef_saturacion + tiempo * self.coef_tiempo
+                    + animales * self.coef_animales).tolist()
+        return [self.peso(s, t, a) for s, t, a in zip(saturacion, tiempo, animales)]
+
+    def pesos_grafo(self, graph):
+        """
+        Devuelve el peso de cada arista del grafo, indexado por edge.id.
+        El resultado se cachea hasta que cambia la versión del grafo.
+
+        Args:
+            graph (Graph): Grafo a evaluar.
+
+        Returns:
+            List[float]: Pesos indexados por id de arista.
+        """
+        cached_graph, cached_version, cached_pesos = self._cache
+        if cached_graph is graph and cached_version == graph.version:
+            return cached_pesos
+        pesos = self.pesos(graph.edge_saturacion, graph.edge_tiempo, graph.edge_animales)
+        self._cache = (graph, graph.version, pesos)
+        return pesos
+
+    def formula(self):
+        """
+        Devuelve la fórmula del modelo en texto legible.
+
+        Returns:
+            str: Fórmula del peso.
+        """
+        def termino(nombre, coef):
+            return nombre if coef == 1 else f"{nombre}×{coef:g}"
+        return " + ".join([termino("Saturación", self.coef_saturacion),
+                           termino("Tiempo", self.coef_tiempo),
+                           termino("Animales", self.coef_animales)])
+
+    def clave(self):
+        """Tupla de coeficientes que identifica al modelo."""
+        return (self.coef_saturacion, self.coef_tiempo, self.coef_animales)
+
+    def __eq__(self, other):
+        return isinstance(other, ModeloPeso) and self.clave() == other.clave()
+
+    def __hash__(self):
+        return hash(self.clave())
+
+    def __str__(self):
+        return f"ModeloPeso({self.nombre}: {self.formula()})"
+
+
+# Fórmula original del proyecto: saturación×2 + tiempo + animales×3
+MODELO_ESTANDAR = ModeloPeso()
+
+# Perfiles de coeficientes para operaciones
+PERFILES = {
+    'estandar': MODELO_ESTANDAR,
+    'tiempo_critico': ModeloPeso(1.0, 4.0, 1.0, nombre="tiempo_critico"),
+    'seguridad': ModeloPeso(3.0, 1.0, 8.0, nombre="seguridad"),
+}
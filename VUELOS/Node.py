@@ -3,15 +3,22 @@ class Node:
     Representa una ciudad en el grafo, con una lista de rutas aéreas (aristas) hacia otras ciudades.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, node_id=None, latitud=None, longitud=None):
         """
         Inicializa una ciudad con su nombre y una lista vacía de rutas salientes.
         
         Args:
             name (str): Nombre de la ciudad.
+            node_id (int): Identificador entero asignado por el grafo.
+            latitud (float): Latitud en grados (None si se desconoce).
+            longitud (float): Longitud en grados (None si se desconoce).
         """
         self.name = name
+        self.id = node_id
+        self.latitud = latitud
+        self.longitud = longitud
         self.edges = []  # Lista de objetos Edge (rutas aéreas)
+        self.adjacency = {}  # Índice Node destino -> Edge, sincronizado con self.edges
 
     def add_edge(self, edge):
         """
@@ -21,6 +28,7 @@ class Node:
             edge (Edge): Ruta aérea a añadir.
         """
         self.edges.append(edge)
+        self.adjacency.setdefault(edge.destination, edge)
 
     def find_edge(self, destination_node):
         """
@@ -32,10 +40,7 @@ class Node:
         Returns:
             Edge: Ruta encontrada o None.
         """
-        for edge in self.edges:
-            if edge.destination == destination_node:
-                return edge
-        return None
+        return self.adjacency.get(destination_node)
 
     def has_edges(self):
         """
@@ -0,0 +1,241 @@
+import heapq
+import mmap
+import os
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from DijkstraSolver import DijkstraSolver
+from GrafoCSR import GrafoCSR
+from Landmarks import firma_grafo
+
+INF = float('inf')
+
+# Cabecera del fichero: marca, número de nodos y huella del grafo (ver firma_grafo)
+MARCA = b"VUELOSAP"
+CABECERA = struct.Struct("<8sq40s8x")
+
+# Grafo compacto de solo lectura de cada proceso trabajador (ver _iniciar_trabajador)
+_grafo_trabajador = None
+
+
+def ruta_tabla(db_path):
+    """
+    Devuelve la ruta del fichero de la tabla de rutas asociado a una base de datos.
+
+    Args:
+        db_path (str): Ruta al fichero SQLite (p. ej. rutas.db).
+
+    Returns:
+        str: Ruta del fichero de la tabla (p. ej. rutas.tabla).
+    """
+    return os.path.splitext(db_path)[0] + ".tabla"
+
+
+def _iniciar_trabajador(offsets, targets, weights, path):
+    # Cada proceso recibe una vez los arrays CSR y abre el fichero de resultados
+    global _grafo_trabajador
+    fichero = open(path, "r+b")
+    _grafo_trabajador = (offsets, targets, weights, fichero, mmap.mmap(fichero.fileno(), 0))
+
+
+def _calcular_origenes(origin_ids):
+    """
+    Dijkstra desde cada origen sobre el grafo del trabajador, escribiendo en el fichero
+    su fila de distancias y de siguiente salto.
+
+    Returns:
+        int: Número de orígenes procesados.
+    """
+    offsets, targets, weights, _, mm = _grafo_trabajador
+    num_nodes = len(offsets) - 1
+    dist_offset = CABECERA.size
+    next_offset = dist_offset + num_nodes * num_nodes * 8
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    for origin_id in origin_ids:
+        distances = array('d', [INF]) * num_nodes
+        first_hop = array('i', [-1]) * num_nodes  # Primer nodo tras el origen en la ruta
+        distances[origin_id] = 0.0
+        first_hop[origin_id] = origin_id
+        queue = [(0.0, origin_id)]
+        while queue:
+            current_dist, current = heappop(queue)
+            if current_dist > distances[current]:
+                continue
+            hop = first_hop[current]
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                new_dist = current_dist + weights[i]
+                if new_dist < distances[neighbor]:
+                    distances[neighbor] = new_dist
+                    first_hop[neighbor] = neighbor if current == origin_id else hop
+                    heappush(queue, (new_dist, neighbor))
+
+        start = dist_offset + origin_id * num_nodes * 8
+        mm[start:start + num_nodes * 8] = distances.tobytes()
+        start = next_offset + origin_id * num_nodes * 4
+        mm[start:start + num_nodes * 4] = first_hop.tobytes()
+    return len(origin_ids)
+
+
+class TablaRutas:
+    """
+    Tabla precalculada de rutas entre todos los pares de ciudades.
+
+    Guarda en un fichero mapeado en memoria una matriz de distancias y otra de
+    siguiente salto: next_hop[o][d] es la ciudad que sigue a o en la ruta más ligera
+    hacia d. Como cualquier tramo de una ruta óptima es también óptimo, la ruta
+    completa se reconstruye saltando de ciudad en ciudad sin ninguna búsqueda.
+    El cálculo lanza un Dijkstra por origen repartido entre varios procesos.
+    """
+
+    def __init__(self, graph, path, modelo=None):
+        """
+        Abre una tabla ya calculada (ver calcular y cargar).
+
+        Args:
+            graph (Graph): Grafo al que corresponde la tabla.
+            path (str): Ruta del fichero.
+            modelo (ModeloPeso): Modelo de coste con el que se calculó.
+        """
+        self.graph = graph
+        self.path = path
+        self.modelo = modelo
+        self.version = graph.version
+        self.num_nodes = len(graph.nodes)
+        self._fichero = open(path, "rb")
+        self._mm = mmap.mmap(self._fichero.fileno(), 0, access=mmap.ACCESS_READ)
+        n = self.num_nodes
+        vista = memoryview(self._mm)
+        dist_offset = CABECERA.size
+        next_offset = dist_offset + n * n * 8
+        self._distances = vista[dist_offset:next_offset].cast('d')
+        self._next_hop = vista[next_offset:next_offset + n * n * 4].cast('i')
+        self._fallback = None
+
+    @classmethod
+    def calcular(cls, graph, path, modelo=None, procesos=None):
+        """
+        Calcula la tabla de todos los pares y la escribe en path.
+
+        Args:
+            graph (Graph): Grafo de ciudades y rutas.
+            path (str): Ruta del fichero a crear (se sobrescribe).
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+            procesos (int): Procesos trabajadores (os.cpu_count() si es None; con 1
+                se calcula en el propio proceso).
+
+        Returns:
+            TablaRutas: Tabla abierta para consultas.
+        """
+        global _grafo_trabajador
+        csr = GrafoCSR.from_graph(graph, modelo)
+        n = csr.num_nodes
+        with open(path, "wb") as fichero:
+            fichero.write(CABECERA.pack(MARCA, n, firma_grafo(graph, modelo).encode("ascii")))
+            fichero.truncate(CABECERA.size + n * n * 12)
+
+        procesos = procesos or os.cpu_count() or 1
+        args = (csr.offsets, csr.targets, csr.weights, path)
+        if procesos == 1 or n < 2:
+            _iniciar_trabajador(*args)
+            try:
+                _calcular_origenes(range(n))
+            finally:
+                _grafo_trabajador[4].close()
+                _grafo_trabajador[3].close()
+                _grafo_trabajador = None  # No retener los arrays CSR tras el cálculo
+        else:
+            # Lotes pequeños para repartir bien la carga entre procesos
+            tamano = max(1, n // (procesos * 8))
+            lotes = [range(i, min(n, i + tamano)) for i in range(0, n, tamano)]
+            with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador, initargs=args) as pool:
+                for _ in pool.map(_calcular_origenes, lotes):
+                    pass
+        return cls(graph, path, modelo)
+
+    @classmethod
+    def cargar(cls, path, graph, modelo=None):
+        """
+        Abre una tabla guardada si corresponde al contenido actual del grafo.
+
+        Returns:
+            TablaRutas: Tabla abierta, o None si no existe o está obsoleta.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as fichero:
+            cabecera = fichero.read(CABECERA.size)
+        if len(cabecera) < CABECERA.size:
+            return None
+        marca, n, firma = CABECERA.unpack(cabecera)
+        if (marca != MARCA or n != len(graph.nodes)
+                or firma.decode("ascii") != firma_grafo(graph, modelo)
+                or os.path.getsize(path) < CABECERA.size + n * n * 12):
+            return None
+        return cls(graph, path, modelo)
+
+    def vigente(self):
+        """Indica si la tabla corresponde a la versión actual del grafo."""
+        return self.version == self.graph.version
+
+    def _solver_respaldo(self):
+        # DijkstraSolver para responder cuando la tabla está obsoleta
+        if self._fallback is None:
+            self._fallback = DijkstraSolver(self.graph, self.modelo)
+        return self._fallback
+
+    def distancia(self, origin_node, destination_node):
+        """
+        Coste de la ruta más ligera entre dos ciudades, sin búsqueda. Si el grafo ha
+        cambiado desde el cálculo, se obtiene con Dijkstra como en find_shortest_path.
+
+        Returns:
+            float: Coste (inf si no es alcanzable).
+        """
+        if not self.vigente():
+            fallback = self._solver_respaldo()
+            fallback.find_shortest_path(origin_node, destination_node)
+            return fallback.last_cost
+        return self._distances[origin_node.id * self.num_nodes + destination_node.id]
+
+    def find_shortest_path_ids(self, origin_id, destination_id):
+        """
+        Reconstruye la ruta siguiendo la matriz de siguiente salto, en O(longitud).
+        Si el grafo ha cambiado desde el cálculo, se busca con Dijkstra.
+
+        Returns:
+            List[int]: Ids de la ruta (solo el destino si no es alcanzable).
+        """
+        if not self.vigente():
+            nodes = self.graph.nodes
+            path = self._solver_respaldo().find_shortest_path(nodes[origin_id], nodes[destination_id])
+            return [node.id for node in path]
+        n, next_hop = self.num_nodes, self._next_hop
+        if next_hop[origin_id * n + destination_id] < 0:
+            return [destination_id]
+        path = [origin_id]
+        while path[-1] != destination_id:
+            path.append(next_hop[path[-1] * n + destination_id])
+        return path
+
+    def find_shortest_path(self, origin_node, destination_node):
+        """
+        Misma interfaz que DijkstraSolver. Si el grafo ha cambiado desde el cálculo,
+        la tabla ya no es válida y se busca con Dijkstra.
+
+        Returns:
+            List[Node]: Ruta (solo el destino si no es alcanzable).
+        """
+        if not self.vigente():
+            return self._solver_respaldo().find_shortest_path(origin_node, destination_node)
+        nodes = self.graph.nodes
+        return [nodes[node_id] for node_id in self.find_shortest_path_ids(origin_node.id, destination_node.id)]
+
+    def cerrar(self):
+        """Libera el mapeo del fichero."""
+        self._distances.release()
+        self._next_hop.release()
+        self._mm.close()
+        self._fichero.close()
@@ -0,0 +1,175 @@
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from DijkstraSolver import DijkstraSolver
+
+INF = float('inf')
+
+
+class YenSolver(DijkstraSolver):
+    """
+    Rutas alternativas: las k rutas más ligeras sin ciclos entre dos ciudades
+    (algoritmo de Yen).
+
+    Cada nueva ruta se busca desviándose de la anterior en cada una de sus ciudades
+    (nodo de desvío): se fija el tramo inicial común, se bloquean las rutas que ya
+    salen de él hacia ciudades usadas por rutas aceptadas y se busca con Dijkstra el
+    resto del camino. Las búsquedas de desvío de una misma ronda son independientes y
+    se reparten en un pool de hilos; cada hilo reutiliza su propio DijkstraSolver, ya
+    que el almacenamiento de un solver no se puede compartir entre hilos. Con un solo
+    worker no hay pool y las búsquedas se hacen en orden con el propio solver.
+
+    El pool se libera con close() o usando el solver como gestor de contexto:
+        with YenSolver(graph, workers=4) as yen:
+            rutas = yen.k_shortest_paths(origen, destino, 3)
+    """
+
+    def __init__(self, graph, modelo=None, workers=1):
+        """
+        Args:
+            graph (Graph | GrafoCSR): Grafo sobre el que buscar rutas.
+            modelo (ModeloPeso): Modelo de coste (estándar si es None).
+            workers (int): Hilos para las búsquedas de desvío (1 = sin pool).
+        """
+        super().__init__(graph, modelo)
+        self.workers = workers
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(workers) if workers > 1 else None
+        self.last_spur_searches = 0  # Búsquedas de desvío de la última consulta
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _thread_solver(self):
+        # Cada hilo del pool reutiliza un DijkstraSolver propio
+        solver = getattr(self._local, 'solver', None)
+        if solver is None:
+            solver = DijkstraSolver(self.graph, self.modelo)
+            self._local.solver = solver
+        return solver
+
+    def _pool_spur_search(self, task):
+        # Búsqueda de desvío dentro de un hilo del pool
+        return self._spur_search(self._thread_solver(), *task)
+
+    @staticmethod
+    def _spur_search(solver, spur_id, destination_id, blocked_nodes, blocked_edges):
+        """
+        Dijkstra desde spur_id sin pasar por blocked_nodes ni usar blocked_edges, con
+        el almacenamiento de solver (que no debe usar otro hilo a la vez).
+
+        Returns:
+            tuple: (coste, ids de la ruta) o None si el destino no es alcanzable.
+        """
+        forward, _ = solver._adjacency()
+        heappop, heappush = heapq.heappop, heapq.heappush
+        generation = solver._new_generation()
+        distances, previous, stamps = solver._distances, solver._previous, solver._stamps
+        stamps[spur_id] = generation
+        distances[spur_id] = 0.0
+        previous[spur_id] = None
+        queue = [(0.0, spur_id)]
+
+        while queue:
+            current_dist, current = heappop(queue)
+            if current == destination_id:
+                break
+            if current_dist > distances[current]:
+                continue
+            for neighbor, weight in forward(current):
+                if neighbor in blocked_nodes or (current, neighbor) in blocked_edges:
+                    continue
+                new_dist = current_dist + weight
+                if stamps[neighbor] != generation or new_dist < distances[neighbor]:
+                    stamps[neighbor] = generation
+                    distances[neighbor] = new_dist
+                    previous[neighbor] = current
+                    heappush(queue, (new_dist, neighbor))
+
+        if stamps[destination_id] != generation:
+            return None
+        path = [destination_id]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return distances[destination_id], path
+
+    def _prefix_costs(self, path):
+        # Coste acumulado hasta cada posición de la ruta
+        forward, _ = self._adjacency()
+        costs = [0.0]
+        for u, w in zip(path, path[1:]):
+            costs.append(costs[-1] + min(weight for neighbor, weight in forward(u) if neighbor == w))
+        return costs
+
+    def k_shortest_paths_ids(self, origin_id, destination_id, k):
+        """
+        Las k rutas sin ciclos más ligeras sobre identificadores enteros.
+
+        Returns:
+            List[tuple]: Pares (coste, ids de la ruta) ordenados por coste; menos de k
+            si no hay más rutas, y ninguno si el destino no es alcanzable.
+        """
+        first = self._spur_search(self, origin_id, destination_id, frozenset(), frozenset())
+        self.last_spur_searches = 0
+        if first is None or k <= 0:
+            return []
+        accepted = [first]
+        candidates = []
+        seen = {tuple(first[1])}
+
+        while len(accepted) < k:
+            _, last_path = accepted[-1]
+            prefix = self._prefix_costs(last_path)
+            tasks = []
+            for i in range(len(last_path) - 1):
+                root = last_path[:i + 1]
+                blocked_edges = {(path[i], path[i + 1]) for _, path in accepted
+                                 if len(path) > i + 1 and path[:i + 1] == root}
+                tasks.append((last_path[i], destination_id, set(root[:-1]), blocked_edges))
+
+            if self._pool is not None:
+                results = list(self._pool.map(self._pool_spur_search, tasks))
+            else:
+                results = [self._spur_search(self, *task) for task in tasks]
+            self.last_spur_searches += len(tasks)
+
+            for i, result in enumerate(results):
+                if result is None:
+                    continue
+                spur_cost, spur_path = result
+                path = last_path[:i] + spur_path
+                key = tuple(path)
+                if key not in seen:
+                    seen.add(key)
+                    heapq.heappush(candidates, (prefix[i] + spur_cost, path))
+
+            if not candidates:
+                break
+            accepted.append(heapq.heappop(candidates))
+        return accepted
+
+    def k_shortest_paths(self, origin_node, destination_node, k=3):
+        """
+        Las k rutas alternativas más ligeras entre dos ciudades.
+
+        Args:
+            origin_node (Node): Ciudad origen.
+            destination_node (Node): Ciudad destino.
+            k (int): Número máximo de rutas.
+
+        Returns:
+            List[tuple]: Pares (coste, List[Node] ruta), de la más ligera a la más pesada.
+        """
+        nodes = self.graph.nodes
+        return [(cost, [nodes[node_id] for node_id in path])
+                for cost, path in self.k_shortest_paths_ids(origin_node.id, destination_node.id, k)]
+
+    def close(self):
+        """Libera los hilos del pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
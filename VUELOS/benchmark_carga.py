@@ -0,0 +1,157 @@
+"""
+Benchmark de carga del grafo desde SQLite.
+Genera redes sintéticas de distintos tamaños en ficheros temporales y mide
+cuánto tarda cargar_grafo_desde_bd en construir el grafo y cargar_csr_desde_bd en
+construir directamente la instantánea CSR, con el pico de memoria de cada uno: la
+lectura por lotes acota la memoria de las filas, pero el Graph sigue creando un
+objeto Node por ciudad y un Edge por ruta, y solo la carga CSR queda en arrays.
+También mide el refresco masivo de pesos sobre un hub con miles de rutas salientes.
+
+Uso:
+    python benchmark_carga.py [num_rutas ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Graph import Graph
+from cargar_grafo_desde_bd import cargar_csr_desde_bd, cargar_grafo_desde_bd
+from esquema_bd import conectar, crear_esquema
+
+
+RUTAS_POR_CIUDAD = 10
+TAMANOS_POR_DEFECTO = [10_000, 100_000, 1_000_000]
+MAX_RUTAS_OBJETOS = 2_000_000  # Por encima solo se mide la carga CSR
+GRADOS_HUB = [1_000, 10_000, 50_000]
+ACTUALIZACIONES_HUB = 10_000
+
+
+def generar_bd_sintetica(db_path, num_rutas, rutas_por_ciudad=RUTAS_POR_CIUDAD, seed=42):
+    """
+    Crea una base de datos con el esquema de esquema_bd.py y rutas aleatorias.
+
+    Args:
+        db_path (str): Ruta del fichero SQLite a crear.
+        num_rutas (int): Número de enlaces a generar.
+        rutas_por_ciudad (int): Grado medio de salida de cada ciudad.
+        seed (int): Semilla para reproducibilidad.
+    """
+    rng = random.Random(seed)
+    num_ciudades = max(2, num_rutas // rutas_por_ciudad)
+
+    conn = conectar(db_path)
+    cursor = conn.cursor()
+    crear_esquema(conn)
+    cursor.executemany(
+        "INSERT INTO Ciudad (nombre, poblacion, km2) VALUES (?, ?, ?)",
+        ((f"Ciudad_{i}", rng.randint(1000, 5_000_000), rng.uniform(10, 1500))
+         for i in range(1, num_ciudades + 1))
+    )
+
+    def enlaces():
+        for i in range(num_rutas):
+            origen = i % num_ciudades + 1
+            destino = rng.randint(1, num_ciudades)
+            if destino == origen:
+                destino = destino % num_ciudades + 1
+            yield (origen, destino, rng.uniform(0.01, 0.99),
+                   rng.uniform(0.1, 3.0), rng.uniform(0.01, 0.99))
+
+    cursor.executemany(
+        # Los pares repetidos al azar se descartan, como exige el índice único
+        "INSERT OR IGNORE INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales) VALUES (?, ?, ?, ?, ?)",
+        enlaces()
+    )
+    conn.commit()
+    conn.close()
+    return num_ciudades
+
+
+def medir_carga(num_rutas, objetos=True):
+    """
+    Genera una red de num_rutas enlaces y mide el tiempo de carga con cada cargador.
+
+    Args:
+        num_rutas (int): Número de enlaces a generar.
+        objetos (bool): Si es False solo se mide la carga CSR (redes muy grandes).
+
+    Returns:
+        dict: Ciudades, rutas, segundos, filas por segundo y pico de memoria de cada
+        cargador, y memoria de los arrays CSR.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "rutas_bench.db")
+        num_ciudades = generar_bd_sintetica(db_path, num_rutas)
+
+        resultado = {'ciudades': num_ciudades}
+        if objetos:
+            grafo = cargar_grafo_desde_bd(db_path)
+            resultado['objetos'] = grafo.load_stats
+            del grafo
+            tracemalloc.start()
+            grafo = cargar_grafo_desde_bd(db_path)
+            resultado['pico_objetos'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del grafo
+
+        _, resultado['csr'] = cargar_csr_desde_bd(db_path)
+        resultado['rutas'] = resultado['csr']['rutas']
+        tracemalloc.start()
+        csr, _ = cargar_csr_desde_bd(db_path)
+        resultado['pico_csr'] = tracemalloc.get_traced_memory()[1]
+        resultado['memoria_csr'] = csr.nbytes()
+        tracemalloc.stop()
+    return resultado
+
+
+def medir_refresco_hub(grado, actualizaciones=ACTUALIZACIONES_HUB, seed=42):
+    """
+    Construye un hub con 'grado' rutas salientes y actualiza 'actualizaciones'
+    de ellas mediante add_edge, que localiza la arista existente y la actualiza.
+
+    Returns:
+        dict: Grado del hub, actualizaciones y segundos empleados.
+    """
+    rng = random.Random(seed)
+    grafo = Graph()
+    for i in range(grado):
+        grafo.add_edge("Hub", f"Destino_{i}", 0.5, 1.0, 0.1)
+
+    destinos = [f"Destino_{rng.randrange(grado)}" for _ in range(actualizaciones)]
+    inicio = time.perf_counter()
+    for destino in destinos:
+        grafo.add_edge("Hub", destino, rng.random(), rng.uniform(0.1, 3.0), rng.random())
+    segundos = time.perf_counter() - inicio
+
+    return {'grado': grado, 'actualizaciones': actualizaciones, 'segundos': segundos}
+
+
+def main():
+    tamanos = [int(arg) for arg in sys.argv[1:]] or TAMANOS_POR_DEFECTO
+
+    print(f"{'Rutas':>12} {'Ciudades':>10} {'Node/Edge (s)':>14} {'Filas/s':>12} {'Pico N/E (MB)':>14} "
+          f"{'CSR (s)':>9} {'Filas/s':>12} {'Pico CSR (MB)':>14} {'Arrays (MB)':>12}")
+    for num_rutas in tamanos:
+        r = medir_carga(num_rutas, objetos=num_rutas <= MAX_RUTAS_OBJETOS)
+        objetos = r.get('objetos')
+        columnas_objetos = (f"{objetos['segundos']:>14.3f} {objetos['filas_por_segundo']:>12,.0f} "
+                            f"{r['pico_objetos'] / 2**20:>14.1f}"
+                            if objetos else f"{'-':>14} {'-':>12} {'-':>14}")
+        print(f"{r['rutas']:>12} {r['ciudades']:>10} {columnas_objetos} "
+              f"{r['csr']['segundos']:>9.3f} {r['csr']['filas_por_segundo']:>12,.0f} "
+              f"{r['pico_csr'] / 2**20:>14.1f} {r['memoria_csr'] / 2**20:>12.1f}")
+
+    print(f"\n{'Grado hub':>12} {'Updates':>10} {'Tiempo (s)':>12} {'Updates/s':>14}")
+    for grado in GRADOS_HUB:
+        resultado = medir_refresco_hub(grado)
+        por_segundo = resultado['actualizaciones'] / resultado['segundos']
+        print(f"{resultado['grado']:>12} {resultado['actualizaciones']:>10} "
+              f"{resultado['segundos']:>12.3f} {por_segundo:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
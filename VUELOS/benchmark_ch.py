@@ -0,0 +1,78 @@
+"""
+Benchmark de ContractionHierarchy: tiempo de preproceso frente a latencia por consulta,
+comparado con DijkstraSolver sobre redes geográficas de varios tamaños.
+
+Uso:
+    python benchmark_ch.py [num_ciudades ...]
+"""
+
+import random
+import sys
+import time
+
+from ContractionHierarchy import ContractionHierarchy
+from DijkstraSolver import DijkstraSolver
+from benchmark_dijkstra import generar_grafo_geografico
+
+
+TAMANOS_POR_DEFECTO = [1_000, 5_000, 20_000]
+NUM_CONSULTAS = 100
+
+
+def medir(num_ciudades, num_consultas=NUM_CONSULTAS, seed=7):
+    """
+    Construye la jerarquía de una red de num_ciudades y compara consultas con Dijkstra.
+
+    Returns:
+        dict: Tiempos de preproceso y consulta, atajos y rutas coincidentes.
+    """
+    grafo = generar_grafo_geografico(num_ciudades)
+    rng = random.Random(seed)
+    consultas = [(grafo.nodes[rng.randrange(num_ciudades)], grafo.nodes[rng.randrange(num_ciudades)])
+                 for _ in range(num_consultas)]
+
+    inicio = time.perf_counter()
+    ch = ContractionHierarchy(grafo)
+    preproceso = time.perf_counter() - inicio
+
+    dijkstra = DijkstraSolver(grafo)
+    inicio = time.perf_counter()
+    rutas_dijkstra = [dijkstra.find_shortest_path(o, d) for o, d in consultas]
+    t_dijkstra = time.perf_counter() - inicio
+
+    expandidos = 0
+    inicio = time.perf_counter()
+    rutas_ch = []
+    for origen, destino in consultas:
+        rutas_ch.append(ch.find_shortest_path(origen, destino))
+        expandidos += ch.last_expanded
+    t_ch = time.perf_counter() - inicio
+
+    return {
+        'ciudades': num_ciudades,
+        'rutas': len(grafo.edges),
+        'atajos': ch.num_shortcuts,
+        'preproceso': preproceso,
+        'ms_dijkstra': 1000 * t_dijkstra / num_consultas,
+        'ms_ch': 1000 * t_ch / num_consultas,
+        'expandidos_ch': expandidos / num_consultas,
+        'iguales': sum(1 for a, b in zip(rutas_dijkstra, rutas_ch) if a == b),
+        'consultas': num_consultas,
+    }
+
+
+def main():
+    tamanos = [int(arg) for arg in sys.argv[1:]] or TAMANOS_POR_DEFECTO
+    print(f"{'Ciudades':>9} {'Rutas':>8} {'Atajos':>8} {'Preproceso (s)':>15} "
+          f"{'Dijkstra (ms)':>14} {'CH (ms)':>9} {'Expand. CH':>11} {'Consultas amortizan':>20} {'Iguales':>9}")
+    for num_ciudades in tamanos:
+        r = medir(num_ciudades)
+        ahorro = (r['ms_dijkstra'] - r['ms_ch']) / 1000
+        amortiza = f"{r['preproceso'] / ahorro:,.0f}" if ahorro > 0 else "nunca"
+        print(f"{r['ciudades']:>9} {r['rutas']:>8} {r['atajos']:>8} {r['preproceso']:>15.2f} "
+              f"{r['ms_dijkstra']:>14.2f} {r['ms_ch']:>9.3f} {r['expandidos_ch']:>11.0f} "
+              f"{amortiza:>20} {r['iguales']:>5}/{r['consultas']}")
+
+
+if __name__ == "__main__":
+    main()
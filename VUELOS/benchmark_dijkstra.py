@@ -0,0 +1,179 @@
+"""
+Benchmark de DijkstraSolver sobre el grafo de objetos frente a la instantánea CSR,
+en modo unidireccional y bidireccional, y de AStarSolver y ALTSolver sobre una red
+con coordenadas.
+Mide consultas por segundo, nodos expandidos por consulta y memoria ocupada por cada
+representación.
+
+Uso:
+    python benchmark_dijkstra.py [num_ciudades] [num_consultas]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from ALTSolver import ALTSolver
+from AStarSolver import AStarSolver, distancia_km
+from DijkstraSolver import DijkstraSolver
+from GrafoCSR import GrafoCSR
+from Graph import Graph
+
+
+RUTAS_POR_CIUDAD = 5
+CIUDADES_POR_CELDA = 20
+VELOCIDAD_CRUCERO_KM = 800
+
+
+def generar_grafo(num_ciudades, rutas_por_ciudad=RUTAS_POR_CIUDAD, seed=42):
+    """
+    Genera en memoria un grafo aleatorio con rutas de pesos aleatorios.
+
+    Returns:
+        Graph: Grafo generado.
+    """
+    rng = random.Random(seed)
+    grafo = Graph()
+    for i in range(num_ciudades):
+        grafo.add_or_get_node(f"Ciudad_{i}")
+    for i in range(num_ciudades):
+        for _ in range(rutas_por_ciudad):
+            j = rng.randrange(num_ciudades)
+            if j != i:
+                grafo.add_edge(f"Ciudad_{i}", f"Ciudad_{j}", rng.uniform(0.01, 0.99),
+                               rng.uniform(0.1, 3.0), rng.uniform(0.01, 0.99))
+    return grafo
+
+
+def generar_grafo_geografico(num_ciudades, rutas_por_ciudad=RUTAS_POR_CIUDAD, seed=42):
+    """
+    Genera una red de escala continental: ciudades con coordenadas repartidas por
+    Europa y rutas hacia algunas de sus ciudades más cercanas, con un tiempo
+    proporcional a la distancia.
+
+    Returns:
+        Graph: Grafo generado.
+    """
+    rng = random.Random(seed)
+    lados = max(1, int((num_ciudades / CIUDADES_POR_CELDA) ** 0.5))
+    lat_min, lat_max, lon_min, lon_max = 36.0, 60.0, -10.0, 30.0
+
+    grafo = Graph()
+    celdas = {}
+    for i in range(num_ciudades):
+        lat, lon = rng.uniform(lat_min, lat_max), rng.uniform(lon_min, lon_max)
+        grafo.add_or_get_node(f"Ciudad_{i}", lat, lon)
+        celda = (int((lat - lat_min) / (lat_max - lat_min) * lados),
+                 int((lon - lon_min) / (lon_max - lon_min) * lados))
+        celdas.setdefault(celda, []).append(i)
+
+    for (fila, columna), ciudades in celdas.items():
+        cercanas = [j for df in (-1, 0, 1) for dc in (-1, 0, 1)
+                    for j in celdas.get((fila + df, columna + dc), [])]
+        for i in ciudades:
+            origen = grafo.nodes[i]
+            # Destinos al azar entre las 2k ciudades más próximas de las celdas vecinas
+            candidatas = sorted(
+                (distancia_km(origen.latitud, origen.longitud,
+                              grafo.nodes[j].latitud, grafo.nodes[j].longitud), j)
+                for j in cercanas if j != i
+            )[:2 * rutas_por_ciudad]
+            for km, j in rng.sample(candidatas, min(rutas_por_ciudad, len(candidatas))):
+                grafo.add_edge(origen.name, grafo.nodes[j].name, rng.uniform(0.01, 0.99),
+                               km / VELOCIDAD_CRUCERO_KM + rng.uniform(0.05, 0.3),
+                               rng.uniform(0.01, 0.99))
+    return grafo
+
+
+def medir_consultas(buscar, solver, consultas):
+    """
+    Ejecuta las consultas con el método de búsqueda indicado.
+
+    Args:
+        buscar (callable): Método del solver que recibe (origen, destino).
+        solver (DijkstraSolver): Solver, para leer los nodos expandidos.
+        consultas (list): Pares (Node origen, Node destino).
+
+    Returns:
+        tuple: (segundos, nodos expandidos en total, rutas obtenidas).
+    """
+    rutas = []
+    expandidos = 0
+    inicio = time.perf_counter()
+    for origen, destino in consultas:
+        rutas.append(buscar(origen, destino))
+        expandidos += solver.last_expanded
+    return time.perf_counter() - inicio, expandidos, rutas
+
+
+def main():
+    num_ciudades = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    num_consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    tracemalloc.start()
+    grafo = generar_grafo(num_ciudades)
+    memoria_objetos = tracemalloc.get_traced_memory()[0]
+    csr = GrafoCSR.from_graph(grafo)
+    csr.transpose()  # Preproceso para la búsqueda bidireccional, fuera de la medición
+    memoria_csr = tracemalloc.get_traced_memory()[0] - memoria_objetos
+    tracemalloc.stop()
+
+    rng = random.Random(7)
+    consultas = [(grafo.nodes[rng.randrange(num_ciudades)], grafo.nodes[rng.randrange(num_ciudades)])
+                 for _ in range(num_consultas)]
+
+    solver_objetos = DijkstraSolver(grafo)
+    solver_csr = DijkstraSolver(csr)
+    modos = [
+        ('Node/Edge', solver_objetos, solver_objetos.find_shortest_path),
+        ('Node/Edge bidir', solver_objetos, solver_objetos.find_shortest_path_bidirectional),
+        ('CSR', solver_csr, solver_csr.find_shortest_path),
+        ('CSR bidir', solver_csr, solver_csr.find_shortest_path_bidirectional),
+    ]
+
+    print(f"Ciudades: {num_ciudades}  Rutas: {csr.num_edges}  Consultas: {num_consultas}")
+    print(f"Memoria Node/Edge: {memoria_objetos / 2**20:.1f} MB  CSR: {memoria_csr / 2**20:.1f} MB")
+    imprimir_comparativa(modos, consultas)
+
+    # Red geográfica: Dijkstra frente a A* con heurística ortodrómica
+    geografico = generar_grafo_geografico(num_ciudades)
+    consultas = [(geografico.nodes[rng.randrange(num_ciudades)], geografico.nodes[rng.randrange(num_ciudades)])
+                 for _ in range(num_consultas)]
+    dijkstra = DijkstraSolver(geografico)
+    astar = AStarSolver(geografico)
+    alt = ALTSolver(geografico)
+    inicio = time.perf_counter()
+    geografico.preparar_landmarks()
+    preproceso = time.perf_counter() - inicio
+    print(f"\nRed geográfica: {num_ciudades} ciudades, {len(geografico.edges)} rutas")
+    print(f"Preproceso ALT ({len(geografico.landmarks.landmark_ids)} landmarks): {preproceso:.2f} s")
+    imprimir_comparativa([
+        ('Dijkstra', dijkstra, dijkstra.find_shortest_path),
+        ('Dijkstra bidir', dijkstra, dijkstra.find_shortest_path_bidirectional),
+        ('A*', astar, astar.find_shortest_path),
+        ('ALT', alt, alt.find_shortest_path),
+    ], consultas)
+
+
+def imprimir_comparativa(modos, consultas):
+    """
+    Mide cada modo sobre las mismas consultas y compara sus rutas con el primero.
+
+    Args:
+        modos (list): Tuplas (nombre, solver, método de búsqueda).
+        consultas (list): Pares (Node origen, Node destino).
+    """
+    num_consultas = len(consultas)
+    print(f"{'Modo':<18} {'Consultas/s':>12} {'Expandidos/consulta':>20} {'Latencia (ms)':>14} {'Rutas iguales':>14}")
+    referencia = None
+    for nombre, solver, buscar in modos:
+        segundos, expandidos, rutas = medir_consultas(buscar, solver, consultas)
+        if referencia is None:
+            referencia = rutas
+        iguales = sum(1 for a, b in zip(referencia, rutas) if a == b)
+        print(f"{nombre:<18} {num_consultas / segundos:>12.1f} {expandidos / num_consultas:>20.0f} "
+              f"{1000 * segundos / num_consultas:>14.2f} {iguales:>10}/{num_consultas}")
+
+if __name__ == "__main__":
+    main()
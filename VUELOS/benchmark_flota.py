@@ -0,0 +1,73 @@
+"""
+Benchmark de FleetSimulator: miles de aviones simultáneos sobre una red geográfica,
+sin cambios de condiciones y con las rutas perturbadas por GeneradorCondiciones.
+Mide pasos y tramos volados por segundo, frecuencia de cambios de ruta y latencia
+de cada revisión de rutas.
+
+Uso:
+    python benchmark_flota.py [num_aviones] [num_ciudades] [tasa ...]
+"""
+
+import random
+import sys
+import time
+
+from FleetSimulator import FleetSimulator
+from GeneradorCondiciones import GeneradorCondiciones
+from benchmark_dijkstra import generar_grafo_geografico
+
+
+TASAS_POR_DEFECTO = [0.0, 0.0005, 0.002]
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) de una lista de valores, por el método del más cercano."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def medir(num_aviones, num_ciudades, tasa, seed=7):
+    """
+    Simula num_aviones vuelos hasta que todos lleguen, perturbando en cada paso una
+    fracción tasa de las rutas.
+
+    Returns:
+        tuple: (segundos creando los vuelos, FleetSimulator ya ejecutado).
+    """
+    grafo = generar_grafo_geografico(num_ciudades)
+    rng = random.Random(seed)
+    nombres = [node.name for node in grafo.nodes]
+    simulador = FleetSimulator(grafo)
+
+    inicio = time.perf_counter()
+    for _ in range(num_aviones):
+        simulador.add_flight(rng.choice(nombres), rng.choice(nombres))
+    alta = time.perf_counter() - inicio
+
+    generador = GeneradorCondiciones(grafo, tasa=tasa, seed=seed) if tasa > 0 else None
+    simulador.run(on_step=generador)
+    return alta, simulador
+
+
+def main():
+    num_aviones = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    num_ciudades = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    tasas = [float(arg) for arg in sys.argv[3:]] or TASAS_POR_DEFECTO
+
+    print(f"Aviones: {num_aviones}  Ciudades: {num_ciudades}")
+    print(f"{'Tasa':>7} {'Alta (s)':>9} {'Pasos':>6} {'Pasos/s':>9} {'Tramos/s':>11} {'Revisiones':>11} "
+          f"{'Cambios/1k tramos':>18} {'Replan p50 (ms)':>16} {'Replan p99 (ms)':>16}")
+    for tasa in tasas:
+        alta, simulador = medir(num_aviones, num_ciudades, tasa)
+        r = simulador.estadisticas()
+        frecuencia = 1000 * r['route_changes'] / r['hops'] if r['hops'] else 0.0
+        latencias = simulador.replan_latencies
+        print(f"{tasa:>7.4f} {alta:>9.2f} {r['steps']:>6} {r['steps_per_second']:>9.1f} "
+              f"{r['hops_per_second']:>11,.0f} {r['replans']:>11} {frecuencia:>18.2f} "
+              f"{1000 * percentil(latencias, 50):>16.2f} {1000 * percentil(latencias, 99):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
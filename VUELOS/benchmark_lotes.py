@@ -0,0 +1,50 @@
+"""
+Benchmark de DijkstraSolver.find_shortest_paths: lotes de consultas origen/destino
+resueltos agrupando por origen, frente a un bucle de find_shortest_path.
+Simula las ráfagas del buscador de reservas, donde muchos pares comparten origen.
+
+Uso:
+    python benchmark_lotes.py [num_ciudades] [num_consultas] [num_origenes]
+"""
+
+import random
+import sys
+import time
+
+from DijkstraSolver import DijkstraSolver
+from benchmark_dijkstra import generar_grafo_geografico
+
+
+def main():
+    num_ciudades = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    num_consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    num_origenes = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    grafo = generar_grafo_geografico(num_ciudades)
+    rng = random.Random(7)
+    origenes = [grafo.nodes[rng.randrange(num_ciudades)] for _ in range(num_origenes)]
+    consultas = [(rng.choice(origenes), grafo.nodes[rng.randrange(num_ciudades)])
+                 for _ in range(num_consultas)]
+
+    solver = DijkstraSolver(grafo)
+    inicio = time.perf_counter()
+    rutas_bucle = [solver.find_shortest_path(origen, destino) for origen, destino in consultas]
+    t_bucle = time.perf_counter() - inicio
+
+    rutas_lote = solver.find_shortest_paths(consultas)
+    lote = solver.last_batch
+
+    # Con empates de peso las rutas pueden diferir, así que se comparan costes
+    def coste(ruta):
+        return sum(a.find_edge(b).peso for a, b in zip(ruta, ruta[1:]))
+    iguales = sum(1 for a, b in zip(rutas_bucle, rutas_lote) if a == b or abs(coste(a) - coste(b)) < 1e-9)
+
+    print(f"Ciudades: {num_ciudades}  Consultas: {num_consultas}  Orígenes distintos: {lote['origins']}")
+    print(f"{'Modo':<26} {'Consultas/s':>12} {'Segundos':>9}")
+    print(f"{'Bucle find_shortest_path':<26} {num_consultas / t_bucle:>12.1f} {t_bucle:>9.2f}")
+    print(f"{'Lote por origen':<26} {lote['queries_per_second']:>12.1f} {lote['seconds']:>9.2f}")
+    print(f"Nodos expandidos en el lote: {lote['expanded']}  Rutas equivalentes: {iguales}/{num_consultas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Batería de benchmarks con control de regresiones.
+
+Genera con crear_bd.generar_red_sintetica redes de varios tamaños en ficheros
+temporales y, sobre cada una, mide:
+  - carga_bd: cargar_grafo_desde_bd desde SQLite;
+  - construccion: construir el Graph con add_or_get_node/add_edge_between a partir
+    de las filas ya leídas;
+  - dijkstra: DijkstraSolver.find_shortest_path sobre consultas aleatorias;
+  - plan_inicial: el plan que calcula el constructor de FlightSimulator;
+  - replanificacion: FlightSimulator.replan tras cada lote de GeneradorCondiciones
+    (la mayoría de las revisiones no tocan la ruta del avión: mide el caso habitual);
+  - replanificacion_afectada: FlightSimulator.replan después de empeorar una ruta
+    del plan de cada avión, de modo que todas las revisiones tienen trabajo.
+
+Cada medición guarda mediana, p95 y media en milisegundos, nodos expandidos (en
+las búsquedas) y pico de memoria (tracemalloc, en una pasada aparte para no
+distorsionar los tiempos). El resultado se escribe en JSON; con --baseline se
+compara con una ejecución guardada y el proceso termina con código 1 si alguna
+mediana o p95 empeora más de la tolerancia (y de UMBRAL_MS). El p95 solo se
+compara con al menos MIN_MUESTRAS_P95 muestras en ambas ejecuciones.
+
+Uso:
+    python benchmark_regresion.py [--tamanos 1000 10000] [--salida actual.json]
+                                  [--baseline base.json] [--tolerancia 0.2]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from DijkstraSolver import DijkstraSolver
+from FlightSimulator import FlightSimulator
+from GeneradorCondiciones import GeneradorCondiciones
+from Graph import Graph
+from benchmark_flota import percentil
+from cargar_grafo_desde_bd import cargar_grafo_desde_bd
+from crear_bd import generar_red_sintetica
+
+
+TAMANOS_POR_DEFECTO = [1_000, 10_000, 50_000]
+RUTAS_POR_CIUDAD = 6
+CONSULTAS = 200
+REPETICIONES_CARGA = 40
+VUELOS = 40
+PASOS_REPLANIFICACION = 10
+TASA_CAMBIOS = 0.0005
+TOLERANCIA = 0.20  # Empeoramiento relativo admitido frente a la referencia
+UMBRAL_MS = 0.05  # Diferencias menores se consideran ruido de medida
+METRICAS_COMPARADAS = ('mediana_ms', 'p95_ms')
+# percentil toma el índice int(0,95·n): con 20 muestras o menos es el máximo y no se compara
+MIN_MUESTRAS_P95 = 21
+
+
+def _resumen(tiempos, expandidos=None):
+    """
+    Estadísticas de una serie de tiempos en segundos.
+
+    Returns:
+        dict: Muestras, mediana, p95 y media en ms, y los nodos expandidos si se dan.
+    """
+    resumen = {
+        'muestras': len(tiempos),
+        'mediana_ms': percentil(tiempos, 50) * 1000,
+        'p95_ms': percentil(tiempos, 95) * 1000,
+        'media_ms': sum(tiempos) / len(tiempos) * 1000 if tiempos else 0.0,
+    }
+    if expandidos is not None:
+        resumen['expandidos_mediana'] = percentil(expandidos, 50)
+        resumen['expandidos_media'] = sum(expandidos) / len(expandidos) if expandidos else 0.0
+    return resumen
+
+
+def _pico_memoria_mb(funcion):
+    """Ejecuta funcion bajo tracemalloc y devuelve el pico de memoria en MB."""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def _leer_filas(db_path):
+    # Ciudades y rutas tal como las recibe el constructor del grafo
+    with sqlite3.connect(db_path) as conn:
+        ciudades = conn.execute("SELECT id, nombre, latitud, longitud FROM Ciudad ORDER BY id").fetchall()
+        enlaces = conn.execute(
+            "SELECT idOrigen, idDestino, saturacion, tiempo, animales FROM Enlace ORDER BY id").fetchall()
+    return ciudades, enlaces
+
+
+def _construir(ciudades, enlaces):
+    grafo = Graph()
+    por_id = {id_ciudad: grafo.add_or_get_node(nombre, lat, lon) for id_ciudad, nombre, lat, lon in ciudades}
+    for origen, destino, saturacion, tiempo, animales in enlaces:
+        grafo.add_edge_between(por_id[origen], por_id[destino], saturacion, tiempo, animales)
+    return grafo
+
+
+def medir_carga(db_path, repeticiones=REPETICIONES_CARGA):
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()  # Que la basura de la muestra anterior no se recoja dentro de esta
+        inicio = time.perf_counter()
+        cargar_grafo_desde_bd(db_path)
+        tiempos.append(time.perf_counter() - inicio)
+    resultado = _resumen(tiempos)
+    resultado['memoria_pico_mb'] = _pico_memoria_mb(lambda: cargar_grafo_desde_bd(db_path))
+    return resultado
+
+
+def medir_construccion(db_path, repeticiones=REPETICIONES_CARGA):
+    ciudades, enlaces = _leer_filas(db_path)
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()  # Que la basura de la muestra anterior no se recoja dentro de esta
+        inicio = time.perf_counter()
+        _construir(ciudades, enlaces)
+        tiempos.append(time.perf_counter() - inicio)
+    resultado = _resumen(tiempos)
+    resultado['memoria_pico_mb'] = _pico_memoria_mb(lambda: _construir(ciudades, enlaces))
+    return resultado
+
+
+def medir_dijkstra(grafo, consultas):
+    """
+    Args:
+        grafo (Graph): Grafo ya cargado.
+        consultas (list): Pares (Node origen, Node destino).
+    """
+    solver = DijkstraSolver(grafo)
+    solver.find_shortest_path(*consultas[0])  # Reserva el almacenamiento del solver
+    tiempos, expandidos = [], []
+    for origen, destino in consultas:
+        inicio = time.perf_counter()
+        solver.find_shortest_path(origen, destino)
+        tiempos.append(time.perf_counter() - inicio)
+        expandidos.append(solver.last_expanded)
+    resultado = _resumen(tiempos, expandidos)
+
+    def pasada():
+        otro = DijkstraSolver(grafo)
+        for origen, destino in consultas:
+            otro.find_shortest_path(origen, destino)
+    resultado['memoria_pico_mb'] = _pico_memoria_mb(pasada)
+    return resultado
+
+
+def medir_replanificacion(grafo, consultas, pasos=PASOS_REPLANIFICACION, seed=42):
+    """
+    Crea un FlightSimulator por consulta y, tras cada lote de cambios de condiciones,
+    mide la revisión de la ruta de todos ellos desde su origen.
+    """
+    def replanificar(simuladores, generador, pasos, tiempos=None, expandidos=None):
+        for _ in range(pasos):
+            generador.aplicar()
+            for simulador in simuladores:
+                inicio = time.perf_counter()
+                simulador.replan(simulador.origin)
+                if tiempos is not None:
+                    tiempos.append(time.perf_counter() - inicio)
+                    if simulador.planner is not None:
+                        expandidos.append(simulador.planner.last_expanded)
+
+    def crear_simuladores():
+        return [FlightSimulator(grafo, origen.name, destino.name) for origen, destino in consultas]
+
+    tiempos, expandidos = [], []
+    replanificar(crear_simuladores(), GeneradorCondiciones(grafo, tasa=TASA_CAMBIOS, seed=seed),
+                 pasos, tiempos, expandidos)
+    resultado = _resumen(tiempos, expandidos)
+    # Pico de una pasada corta, planificadores incluidos
+    resultado['memoria_pico_mb'] = _pico_memoria_mb(lambda: replanificar(
+        crear_simuladores(), GeneradorCondiciones(grafo, tasa=TASA_CAMBIOS, seed=seed + 1), 1))
+    return resultado
+
+
+def medir_plan_inicial(grafo, consultas):
+    """
+    Mide la creación de un FlightSimulator por consulta, que incluye su plan inicial.
+
+    Returns:
+        tuple: (resultado, simuladores creados).
+    """
+    tiempos, expandidos, simuladores = [], [], []
+    for origen, destino in consultas:
+        inicio = time.perf_counter()
+        simulador = FlightSimulator(grafo, origen.name, destino.name)
+        tiempos.append(time.perf_counter() - inicio)
+        simuladores.append(simulador)
+        if simulador.last_stats is not None:
+            expandidos.append(simulador.last_stats.nodes_settled)
+    resultado = _resumen(tiempos, expandidos)
+    resultado['memoria_pico_mb'] = _pico_memoria_mb(
+        lambda: [FlightSimulator(grafo, origen.name, destino.name) for origen, destino in consultas])
+    return resultado, simuladores
+
+
+def _empeorar_ruta(simulador, rng):
+    # Empeora una ruta al azar del plan del avión; False si el plan no tiene rutas
+    route = simulador.route
+    if len(route) < 2:
+        return False
+    i = rng.randrange(len(route) - 1)
+    edge = route[i].find_edge(route[i + 1])
+    tiempo_max = GeneradorCondiciones.RANGOS['tiempo'][1]
+    sat_max = GeneradorCondiciones.RANGOS['saturacion'][1]
+    if edge.tiempo < tiempo_max:
+        return edge.update(edge.saturacion, min(tiempo_max, edge.tiempo + 1.0), edge.animales)
+    return edge.update(min(sat_max, edge.saturacion + 0.3), edge.tiempo, edge.animales)
+
+
+def medir_replanificacion_afectada(simuladores, pasos=PASOS_REPLANIFICACION, seed=42):
+    """
+    En cada paso empeora una ruta del plan de cada avión y mide la revisión de todos
+    ellos desde su origen. Los planes afectados tienen que repararse de verdad. Un
+    primer paso sin medir absorbe los cambios que los simuladores aún no han visto
+    (p. ej. los de medir_replanificacion).
+    """
+    rng = random.Random(seed)
+
+    def replanificar(pasos, tiempos=None, expandidos=None):
+        for _ in range(pasos):
+            for simulador in simuladores:
+                _empeorar_ruta(simulador, rng)
+            for simulador in simuladores:
+                inicio = time.perf_counter()
+                ruta = simulador.replan(simulador.origin)
+                if tiempos is not None:
+                    tiempos.append(time.perf_counter() - inicio)
+                    if simulador.last_stats is not None:
+                        expandidos.append(simulador.last_stats.nodes_settled)
+                if ruta is not None:
+                    simulador.route = ruta
+
+    replanificar(1)
+    tiempos, expandidos = [], []
+    replanificar(pasos, tiempos, expandidos)
+    resultado = _resumen(tiempos, expandidos)
+    resultado['memoria_pico_mb'] = _pico_memoria_mb(lambda: replanificar(1))
+    return resultado
+
+
+def medir_tamano(num_ciudades, modelo, num_consultas, seed, directorio):
+    """
+    Genera una red de num_ciudades ciudades y ejecuta todos los benchmarks sobre ella.
+
+    Returns:
+        dict: Nombre del benchmark -> resultado, más el resumen de la red.
+    """
+    db_path = os.path.join(directorio, f"red_{num_ciudades}.db")
+    red = generar_red_sintetica(db_path, num_ciudades, RUTAS_POR_CIUDAD, modelo, seed)
+    resultados = {'red': {'ciudades': red['ciudades'], 'rutas': red['rutas']}}
+    resultados['carga_bd'] = medir_carga(db_path)
+    resultados['construccion'] = medir_construccion(db_path)
+
+    grafo = cargar_grafo_desde_bd(db_path)
+    rng = random.Random(seed)
+    nodos = grafo.nodes
+    consultas = [(rng.choice(nodos), rng.choice(nodos)) for _ in range(num_consultas)]
+    resultados['dijkstra'] = medir_dijkstra(grafo, consultas)
+    resultados['plan_inicial'], simuladores = medir_plan_inicial(grafo, consultas[:VUELOS])
+    resultados['replanificacion'] = medir_replanificacion(grafo, consultas[:VUELOS], seed=seed)
+    # Modifica el grafo, así que va la última
+    resultados['replanificacion_afectada'] = medir_replanificacion_afectada(simuladores, seed=seed)
+    return resultados
+
+
+def comparar(actual, referencia, tolerancia=TOLERANCIA):
+    """
+    Compara dos ejecuciones tamaño a tamaño y benchmark a benchmark.
+
+    Returns:
+        List[dict]: Métricas que empeoran más de la tolerancia.
+    """
+    regresiones = []
+    for tamano, benchmarks in actual['resultados'].items():
+        base = referencia['resultados'].get(tamano, {})
+        for nombre, resultado in benchmarks.items():
+            for metrica in METRICAS_COMPARADAS:
+                if metrica == 'p95_ms' and min(resultado.get('muestras', 0),
+                                               base.get(nombre, {}).get('muestras', 0)) < MIN_MUESTRAS_P95:
+                    continue
+                antes = base.get(nombre, {}).get(metrica)
+                ahora = resultado.get(metrica)
+                if (antes and ahora is not None and ahora > antes * (1 + tolerancia)
+                        and ahora - antes > UMBRAL_MS):
+                    regresiones.append({'tamano': tamano, 'benchmark': nombre, 'metrica': metrica,
+                                        'referencia': antes, 'actual': ahora,
+                                        'cambio': ahora / antes - 1})
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, construcción, búsqueda y replanificación.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS_POR_DEFECTO)
+    parser.add_argument("--modelo", choices=["hubs", "libre_escala"], default="hubs")
+    parser.add_argument("--consultas", type=int, default=CONSULTAS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark_resultados.json")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    args = parser.parse_args()
+
+    resultado = {
+        'meta': {'fecha': time.strftime("%Y-%m-%dT%H:%M:%S"), 'python': platform.python_version(),
+                 'plataforma': platform.platform(), 'modelo': args.modelo, 'seed': args.seed,
+                 'consultas': args.consultas},
+        'resultados': {},
+    }
+    print(f"{'Ciudades':>9} {'Benchmark':>24} {'Mediana ms':>11} {'p95 ms':>9} {'Expandidos':>11} {'Pico MB':>8}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for tamano in args.tamanos:
+            benchmarks = medir_tamano(tamano, args.modelo, args.consultas, args.seed, directorio)
+            resultado['resultados'][str(tamano)] = benchmarks
+            for nombre, medida in benchmarks.items():
+                if nombre == 'red':
+                    continue
+                expandidos = medida.get('expandidos_mediana')
+                print(f"{tamano:>9} {nombre:>24} {medida['mediana_ms']:>11.3f} {medida['p95_ms']:>9.3f} "
+                      f"{'-' if expandidos is None else expandidos:>11} {medida['memoria_pico_mb']:>8.1f}")
+
+    with open(args.salida, "w", encoding="utf-8") as fichero:
+        json.dump(resultado, fichero, indent=2)
+    print(f"\nResultados guardados en {args.salida}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fichero:
+            referencia = json.load(fichero)
+        regresiones = comparar(resultado, referencia, args.tolerancia)
+        if not regresiones:
+            print(f"Sin regresiones frente a {args.baseline} (tolerancia {args.tolerancia:.0%})")
+            return 0
+        print(f"Regresiones frente a {args.baseline} (tolerancia {args.tolerancia:.0%}):")
+        for r in regresiones:
+            print(f"  {r['tamano']:>9} {r['benchmark']:>24} {r['metrica']:>11}: "
+                  f"{r['referencia']:.3f} -> {r['actual']:.3f} ms (+{r['cambio']:.0%})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,205 @@
 import sqlite3
+import time
+from array import array
 from Graph import Graph
-from Node import Node
-from Edge import Edge
+from GrafoCSR import GrafoCSR, NodoCSR
+from ModeloPeso import MODELO_ESTANDAR
+from esquema_bd import (cambios_desde, cambios_podados_hasta, coordenadas_ciudad, podar_registro,
+                        rutas_actuales, ultimo_cambio)
 
-def cargar_grafo_desde_bd(db_path="rutas.db"):
+TAMANO_LOTE = 50_000  # Filas leídas por cada fetchmany
+
+
+def _leer_por_lotes(cursor, tamano_lote):
+    """Recorre las filas del cursor leyendo de tamano_lote en tamano_lote."""
+    while True:
+        filas = cursor.fetchmany(tamano_lote)
+        if not filas:
+            return
+        yield from filas
+
+
+def _consulta_ciudades(cursor):
+    # Las bases de datos antiguas no tienen coordenadas
+    cursor.execute("PRAGMA table_info(Ciudad)")
+    columnas = {row[1] for row in cursor.fetchall()}
+    if {'latitud', 'longitud'} <= columnas:
+        return "SELECT rowid, nombre, latitud, longitud FROM Ciudad ORDER BY rowid"
+    return "SELECT rowid, nombre, NULL, NULL FROM Ciudad ORDER BY rowid"
+
+
+def _estadisticas(ciudades, rutas, inicio):
+    segundos = time.perf_counter() - inicio
+    return {
+        'ciudades': ciudades,
+        'rutas': rutas,
+        'segundos': segundos,
+        'filas_por_segundo': (ciudades + rutas) / segundos if segundos > 0 else float('inf'),
+    }
+
+
+def cargar_grafo_desde_bd(db_path="rutas.db", tamano_lote=TAMANO_LOTE):
     """
     Carga los datos de ciudades y enlaces desde la base de datos y construye el grafo.
+    Las filas se leen por lotes con fetchmany y los enlaces se enlazan por id de
+    ciudad, sin pasar por los nombres. Las estadísticas quedan en grafo.load_stats.
     
     Args:
         db_path (str): Ruta al archivo de base de datos SQLite.
+        tamano_lote (int): Filas leídas en cada lote.
     
     Returns:
         Graph: Grafo construido con nodos y aristas.
     """
+    inicio = time.perf_counter()
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     grafo = Graph()
+    grafo.db_path = db_path
+    # Los cambios posteriores a este punto los aplicará sincronizar_grafo (aunque la
+    # carga ya los vea, volver a aplicarlos no cambia nada)
+    grafo.db_change_seq = ultimo_cambio(conn)
 
     # Cargar ciudades
-    cursor.execute("SELECT rowid, nombre FROM Ciudad")
-    ciudad_id_map = {}  # Mapear ID a nombre
-    for row in cursor.fetchall():
-        ciudad_id, nombre = row
-        ciudad_id_map[ciudad_id] = nombre
-        grafo.add_or_get_node(nombre)
+    cursor.execute(_consulta_ciudades(cursor))
+    ciudad_nodo = {}  # Mapear ID de la base de datos a Node
+    for ciudad_id, nombre, latitud, longitud in _leer_por_lotes(cursor, tamano_lote):
+        ciudad_nodo[ciudad_id] = grafo.add_or_get_node(nombre, latitud, longitud)
 
     # Cargar enlaces
     cursor.execute("SELECT idOrigen, idDestino, saturacion, tiempo, animales FROM Enlace")
-    for row in cursor.fetchall():
-        id_origen, id_destino, saturacion, tiempo, animales = row
-        nombre_origen = ciudad_id_map.get(id_origen)
-        nombre_destino = ciudad_id_map.get(id_destino)
-        if nombre_origen and nombre_destino:
-            grafo.add_edge(nombre_origen, nombre_destino, saturacion, tiempo, animales)
+    add_edge_between = grafo.add_edge_between
+    rutas = 0
+    for id_origen, id_destino, saturacion, tiempo, animales in _leer_por_lotes(cursor, tamano_lote):
+        origen = ciudad_nodo.get(id_origen)
+        destino = ciudad_nodo.get(id_destino)
+        if origen and destino:
+            add_edge_between(origen, destino, saturacion, tiempo, animales)
+            rutas += 1
+            if rutas % tamano_lote == 0:
+                # Nadie puede haber planificado sobre un grafo a medio cargar
+                grafo.compact_change_log()
 
+    podar_registro(conn)  # Mantenimiento del registro de cambios (ver esquema_bd)
     conn.close()
+    grafo.compact_change_log()
+    grafo.load_stats = _estadisticas(len(ciudad_nodo), rutas, inicio)
     return grafo
+
+
+def sincronizar_grafo(grafo, db_path=None):
+    """
+    Aplica a un grafo ya cargado solo las rutas insertadas o modificadas en la base de
+    datos desde la última carga o sincronización, a través de add_edge (que actualiza
+    las rutas existentes con Edge.update y, con ello, incrementa la versión del grafo).
+    El coste depende del número de cambios, no del tamaño de la red. Las ciudades que
+    el grafo aún no tiene se crean con sus coordenadas antes de añadir sus rutas.
+
+    Si el registro ya no conserva todos los cambios pendientes (ver
+    esquema_bd.podar_registro), se aplican todas las rutas: add_edge solo modifica
+    las que hayan cambiado.
+    
+    Args:
+        grafo (Graph): Grafo cargado con cargar_grafo_desde_bd.
+        db_path (str): Ruta al archivo de base de datos (grafo.db_path si es None).
+    
+    Returns:
+        int: Número de rutas aplicadas.
+    """
+    conn = sqlite3.connect(db_path or grafo.db_path)
+    try:
+        conn.execute("BEGIN")  # Secuencia, rutas y ciudades de una misma instantánea
+        try:
+            if grafo.db_change_seq < cambios_podados_hasta(conn):
+                filas = rutas_actuales(conn)
+            else:
+                filas = [fila[1:] for fila in cambios_desde(conn, grafo.db_change_seq)]
+        except sqlite3.OperationalError as error:
+            raise ValueError("La base de datos no tiene registro de cambios; "
+                             "migrala con esquema_bd.py") from error
+        ultimo = ultimo_cambio(conn)
+        nuevas = {nombre for origen, destino, *_ in filas for nombre in (origen, destino)
+                  if grafo.find_node(nombre) is None}
+        coordenadas = {nombre: coordenadas_ciudad(conn, nombre) for nombre in nuevas}
+        conn.rollback()
+        podar_registro(conn)
+    finally:
+        conn.close()
+
+    for nombre, (latitud, longitud) in coordenadas.items():
+        grafo.add_or_get_node(nombre, latitud, longitud)
+    for origen, destino, saturacion, tiempo, animales in filas:
+        grafo.add_edge(origen, destino, saturacion, tiempo, animales)
+    grafo.db_change_seq = max(grafo.db_change_seq, ultimo)
+    return len(filas)
+
+
+def cargar_csr_desde_bd(db_path="rutas.db", modelo=None, tamano_lote=TAMANO_LOTE):
+    """
+    Carga la red directamente en una instantánea GrafoCSR, sin crear objetos Node ni
+    Edge. Los enlaces se leen ordenados por origen (SQLite ordena en disco si no hay
+    índice) y se vuelcan a arrays compactos, así que la memoria crece con el tamaño
+    de los arrays y no con el número de filas en tuplas de Python.
+
+    Cada ciudad se representa con un NodoCSR (id, nombre y coordenadas, sin rutas):
+    los solvers aceptan y devuelven estos nodos, pero lo que necesite recorrer
+    node.edges o find_edge (Graph, CacheRutas, D* Lite...) requiere cargar_grafo_desde_bd.
+    
+    Args:
+        db_path (str): Ruta al archivo de base de datos SQLite.
+        modelo (ModeloPeso): Modelo con el que calcular los pesos (estándar si es None).
+        tamano_lote (int): Filas leídas en cada lote.
+    
+    Returns:
+        tuple: (GrafoCSR, estadísticas de la carga).
+    """
+    inicio = time.perf_counter()
+    modelo = modelo or MODELO_ESTANDAR
+    coef_sat, coef_tiempo, coef_anim = modelo.clave()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute(_consulta_ciudades(cursor))
+    indice = {}  # ID de la base de datos -> id denso de nodo
+    nombres = []
+    nodos = []
+    for ciudad_id, nombre, latitud, longitud in _leer_por_lotes(cursor, tamano_lote):
+        indice[ciudad_id] = len(nombres)
+        nodos.append(NodoCSR(len(nombres), nombre, latitud, longitud))
+        nombres.append(nombre)
+
+    num_nodes = len(nombres)
+    offsets = array('q', [0]) * (num_nodes + 1)
+    targets = array('q')
+    weights = array('d')
+    # En orden de inserción dentro de cada origen: si una base de datos antigua repite un
+    # par, vale la última fila, como en cargar_grafo_desde_bd y migrar_bd
+    cursor.execute("SELECT idOrigen, idDestino, saturacion, tiempo, animales FROM Enlace "
+                   "ORDER BY idOrigen, rowid")
+    origen_actual, posiciones = None, {}  # Destinos ya vistos del origen actual -> posición
+    for id_origen, id_destino, saturacion, tiempo, animales in _leer_por_lotes(cursor, tamano_lote):
+        origen = indice.get(id_origen)
+        destino = indice.get(id_destino)
+        if origen is None or destino is None:
+            continue
+        peso = saturacion * coef_sat + tiempo * coef_tiempo + animales * coef_anim
+        if origen != origen_actual:
+            origen_actual, posiciones = origen, {}
+        posicion = posiciones.get(destino)
+        if posicion is not None:
+            weights[posicion] = peso
+            continue
+        posiciones[destino] = len(targets)
+        targets.append(destino)
+        weights.append(peso)
+        offsets[origen + 1] += 1
+    conn.close()
+
+    # Los enlaces llegan agrupados por origen: basta acumular los grados
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+    # Versión 0: la instantánea no cambia, y los solvers que cachean por versión
+    # (A*, árboles de rutas) no deben confundirla con "sin preparar" (None)
+    csr = GrafoCSR(offsets, targets, weights, tuple(nombres), tuple(nodos), 0,
+                   modelo=None if modelo == MODELO_ESTANDAR else modelo)
+    return csr, _estadisticas(num_nodes, len(targets), inicio)
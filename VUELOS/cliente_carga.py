@@ -0,0 +1,94 @@
+"""
+Cliente de carga para servidor_rutas.py: lanza consultas /ruta concurrentes con
+pares de ciudades al azar e informa de peticiones por segundo y latencias p50/p99.
+
+Uso:
+    python cliente_carga.py [num_peticiones] [concurrencia] [host:puerto] [perfil]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from urllib.parse import urlencode
+
+from benchmark_flota import percentil
+
+
+async def peticion(reader, writer, host, ruta):
+    """
+    Envía un GET por una conexión keep-alive y devuelve (código, cuerpo JSON).
+    """
+    writer.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    estado = await reader.readline()
+    codigo = int(estado.split()[1])
+    longitud = 0
+    while True:
+        cabecera = await reader.readline()
+        if cabecera in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = cabecera.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            longitud = int(valor)
+    return codigo, json.loads(await reader.readexactly(longitud))
+
+
+async def cliente(host, puerto, consultas, latencias, errores):
+    # Una conexión por cliente, reutilizada para todas sus consultas
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        while consultas:
+            ruta = consultas.pop()
+            inicio = time.perf_counter()
+            codigo, _ = await peticion(reader, writer, host, ruta)
+            latencias.append(time.perf_counter() - inicio)
+            if codigo != 200:
+                errores.append(codigo)
+    finally:
+        writer.close()
+
+
+async def lanzar(num_peticiones, concurrencia, host, puerto, perfil, seed=7):
+    """
+    Ejecuta la prueba de carga.
+
+    Returns:
+        dict: Peticiones, errores, segundos, peticiones/s y latencias p50/p99 en ms.
+    """
+    reader, writer = await asyncio.open_connection(host, puerto)
+    _, ciudades = await peticion(reader, writer, host, "/ciudades")
+    writer.close()
+
+    rng = random.Random(seed)
+    consultas = [f"/ruta?{urlencode({'origen': o, 'destino': d, 'perfil': perfil})}"
+                 for o, d in (rng.sample(ciudades, 2) for _ in range(num_peticiones))]
+    latencias, errores = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, puerto, consultas, latencias, errores)
+                           for _ in range(concurrencia)))
+    segundos = time.perf_counter() - inicio
+    return {
+        'peticiones': len(latencias),
+        'errores': len(errores),
+        'segundos': segundos,
+        'rps': len(latencias) / segundos,
+        'p50_ms': 1000 * percentil(latencias, 50),
+        'p99_ms': 1000 * percentil(latencias, 99),
+    }
+
+
+def main():
+    num_peticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    concurrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    host, _, puerto = (sys.argv[3] if len(sys.argv) > 3 else "127.0.0.1:8080").partition(":")
+    perfil = sys.argv[4] if len(sys.argv) > 4 else "estandar"
+
+    r = asyncio.run(lanzar(num_peticiones, concurrencia, host, int(puerto or 8080), perfil))
+    print(f"Peticiones: {r['peticiones']}  Errores: {r['errores']}  Concurrencia: {concurrencia}")
+    print(f"Peticiones/s: {r['rps']:.1f}  p50: {r['p50_ms']:.2f} ms  p99: {r['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
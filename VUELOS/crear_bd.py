@@ -1,56 +1,55 @@
-import sqlite3
+import argparse
+import json
+import math
+import os
 import random
+import time
+from array import array
+from itertools import islice
+
+from esquema_bd import conectar, crear_esquema
+
+# Red sintética: región (Europa), velocidad de crucero para el tiempo de vuelo y
+# tamaño de cada executemany
+LAT_MIN, LAT_MAX, LON_MIN, LON_MAX = 36.0, 60.0, -10.0, 30.0
+VELOCIDAD_CRUCERO_KM = 800
+FRACCION_HUBS = 0.01
+TAMANO_LOTE = 100_000
+
 
 def crear_y_poblar_bd():
-    conn = sqlite3.connect("rutas.db")
+    conn = conectar("rutas.db")
     cursor = conn.cursor()
     
     # Semilla para reproducibilidad (opcional)
     random.seed(42)
 
-    # Eliminar tablas si ya existen
-    cursor.execute("DROP TABLE IF EXISTS Ciudad")
+    # Eliminar tablas si ya existen (Enlace primero, por la clave foránea)
     cursor.execute("DROP TABLE IF EXISTS Enlace")
+    cursor.execute("DROP TABLE IF EXISTS Ciudad")
 
-    # Crear tabla Ciudad
-    cursor.execute("""
-        CREATE TABLE Ciudad (
-            nombre TEXT,
-            poblacion INTEGER,
-            km2 REAL
-        )
-    """)
-
-    # Crear tabla Enlace
-    cursor.execute("""
-        CREATE TABLE Enlace (
-            idOrigen INTEGER,
-            idDestino INTEGER,
-            saturacion REAL,
-            tiempo REAL,
-            animales REAL
-        )
-    """)
-
-    # Insertar ciudades (expandido a 15 ciudades)
+    # Crear tablas Ciudad y Enlace con sus claves e índices (ver esquema_bd.py)
+    crear_esquema(conn)
+
+    # Insertar ciudades (expandido a 15 ciudades) con sus coordenadas en grados
     ciudades = [
-        ('Madrid', 3266000, 604.3),
-        ('Barcelona', 1620000, 101.9),
-        ('Valencia', 794000, 134.6),
-        ('Sevilla', 688000, 140.8),
-        ('Bilbao', 345000, 41.5),
-        ('Zaragoza', 675000, 973.8),
-        ('Málaga', 578000, 398.0),
-        ('Granada', 232000, 88.0),
-        ('Alicante', 337000, 201.3),
-        ('San Sebastián', 188000, 60.9),
-        ('Murcia', 453000, 881.9),
-        ('Palma', 416000, 208.6),
-        ('Valladolid', 298000, 197.9),
-        ('Córdoba', 325000, 1255.2),
-        ('Vigo', 295000, 109.1)
+        ('Madrid', 3266000, 604.3, 40.4168, -3.7038),
+        ('Barcelona', 1620000, 101.9, 41.3874, 2.1686),
+        ('Valencia', 794000, 134.6, 39.4699, -0.3763),
+        ('Sevilla', 688000, 140.8, 37.3891, -5.9845),
+        ('Bilbao', 345000, 41.5, 43.263, -2.935),
+        ('Zaragoza', 675000, 973.8, 41.6488, -0.8891),
+        ('Málaga', 578000, 398.0, 36.7213, -4.4214),
+        ('Granada', 232000, 88.0, 37.1773, -3.5986),
+        ('Alicante', 337000, 201.3, 38.3452, -0.481),
+        ('San Sebastián', 188000, 60.9, 43.3183, -1.9812),
+        ('Murcia', 453000, 881.9, 37.9922, -1.1307),
+        ('Palma', 416000, 208.6, 39.5696, 2.6502),
+        ('Valladolid', 298000, 197.9, 41.6523, -4.7245),
+        ('Córdoba', 325000, 1255.2, 37.8882, -4.7794),
+        ('Vigo', 295000, 109.1, 42.2406, -8.7207)
     ]
-    cursor.executemany("INSERT INTO Ciudad (nombre, poblacion, km2) VALUES (?, ?, ?)", ciudades)
+    cursor.executemany("INSERT INTO Ciudad (nombre, poblacion, km2, latitud, longitud) VALUES (?, ?, ?, ?, ?)", ciudades)
 
     # Insertar enlaces (rutas entre ciudades) - RED MUCHO MAS DENSA
     # Ahora cada ciudad tiene multiples conexiones, creando muchas rutas alternativas
@@ -181,9 +180,186 @@ def crear_y_poblar_bd():
     
     cursor.executemany("INSERT INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales) VALUES (?, ?, ?, ?, ?)", enlaces)
 
+    # La carga inicial no cuenta como cambios para sincronizar_grafo
+    cursor.execute("DELETE FROM CambioEnlace")
+
     conn.commit()
     conn.close()
     print("✅ Base de datos creada y poblada con éxito.")
 
+def _distancia_km(lat1, lon1, lat2, lon2):
+    # Haversine, como AStarSolver.distancia_km (sin importar los solvers)
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0088 * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _pares_hubs(rng, num_ciudades, rutas_por_ciudad, latitudes, longitudes):
+    """
+    Red de hubs y radios: un FRACCION_HUBS de las ciudades son hubs, conectados entre
+    sí; cada ciudad radio está cerca de su hub, vuela a él y desde él, y tiene además
+    algunas rutas locales hacia otras ciudades del mismo hub.
+    """
+    num_hubs = max(1, round(num_ciudades * FRACCION_HUBS))
+    for hub in range(num_hubs):
+        latitudes[hub] = rng.uniform(LAT_MIN, LAT_MAX)
+        longitudes[hub] = rng.uniform(LON_MIN, LON_MAX)
+    radios = [[] for _ in range(num_hubs)]
+    for ciudad in range(num_hubs, num_ciudades):
+        hub = rng.randrange(num_hubs)
+        latitudes[ciudad] = min(LAT_MAX, max(LAT_MIN, latitudes[hub] + rng.gauss(0.0, 1.0)))
+        longitudes[ciudad] = min(LON_MAX, max(LON_MIN, longitudes[hub] + rng.gauss(0.0, 1.5)))
+        radios[hub].append(ciudad)
+
+    for hub in range(num_hubs):
+        for otro in rng.sample(range(num_hubs), min(num_hubs, 2 * rutas_por_ciudad)):
+            if otro != hub:
+                yield hub, otro
+        vecinos = radios[hub]
+        for i, ciudad in enumerate(vecinos):
+            yield ciudad, hub
+            yield hub, ciudad
+            for _ in range(min(i, rutas_por_ciudad - 1)):
+                yield ciudad, vecinos[rng.randrange(i)]
+
+
+def _pares_libre_escala(rng, num_ciudades, rutas_por_ciudad, latitudes, longitudes):
+    """
+    Red libre de escala (Barabási-Albert): cada ciudad nueva se une en ambos sentidos a
+    m ciudades existentes elegidas con probabilidad proporcional a su grado.
+    """
+    m = max(1, rutas_por_ciudad // 2)
+    for ciudad in range(num_ciudades):
+        latitudes[ciudad] = rng.uniform(LAT_MIN, LAT_MAX)
+        longitudes[ciudad] = rng.uniform(LON_MIN, LON_MAX)
+    extremos = array('q')  # Cada ciudad aparece tantas veces como rutas tiene
+    for ciudad in range(min(m + 1, num_ciudades)):
+        for otra in range(ciudad):
+            yield ciudad, otra
+            yield otra, ciudad
+            extremos.extend((ciudad, otra))
+    for ciudad in range(m + 1, num_ciudades):
+        destinos = set()
+        while len(destinos) < m:
+            destinos.add(extremos[rng.randrange(len(extremos))])
+        for destino in destinos:
+            yield ciudad, destino
+            yield destino, ciudad
+            extremos.extend((ciudad, destino))
+
+
+MODELOS_RED = {'hubs': _pares_hubs, 'libre_escala': _pares_libre_escala}
+
+
+def generar_red_sintetica(db_path="rutas.db", num_ciudades=100_000, rutas_por_ciudad=6,
+                          modelo="hubs", seed=42, tamano_lote=TAMANO_LOTE):
+    """
+    Sustituye el contenido de la base de datos por una red sintética reproducible.
+    Las filas se insertan con executemany por lotes dentro de una sola transacción, y
+    al terminar se escribe un resumen en <db_path sin extensión>.resumen.json.
+
+    Args:
+        db_path (str): Ruta del fichero SQLite.
+        num_ciudades (int): Número de ciudades.
+        rutas_por_ciudad (int): Grado medio de salida aproximado.
+        modelo (str): 'hubs' (hubs y radios) o 'libre_escala' (Barabási-Albert).
+        seed (int): Semilla del generador.
+        tamano_lote (int): Filas por executemany.
+
+    Returns:
+        dict: Resumen de la red generada.
+    """
+    if modelo not in MODELOS_RED:
+        raise ValueError(f"Modelo de red desconocido: {modelo}")
+    inicio = time.perf_counter()
+    # Un generador para las ciudades y otro para las rutas: así el resultado no depende
+    # de cómo se intercalan los lotes de uno y otro
+    rng_ciudades = random.Random(f"{seed}-ciudades")
+    rng = random.Random(f"{seed}-rutas")
+    latitudes = array('d', [0.0]) * num_ciudades
+    longitudes = array('d', [0.0]) * num_ciudades
+    grados = array('q', [0]) * num_ciudades
+
+    conn = conectar(db_path)
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS Enlace")
+    cursor.execute("DROP TABLE IF EXISTS Ciudad")
+    cursor.execute("DROP TABLE IF EXISTS CambioEnlace")
+    crear_esquema(conn)
+    # Sin disparador durante la carga masiva: no son cambios para sincronizar_grafo
+    cursor.execute("DROP TRIGGER IF EXISTS trg_enlace_insert")
+
+    pares = MODELOS_RED[modelo](rng, num_ciudades, rutas_por_ciudad, latitudes, longitudes)
+
+    def enlaces():
+        for origen, destino in pares:
+            if origen == destino:
+                continue
+            km = _distancia_km(latitudes[origen], longitudes[origen],
+                               latitudes[destino], longitudes[destino])
+            tiempo = min(3.0, max(0.1, km / VELOCIDAD_CRUCERO_KM + rng.uniform(0.05, 0.3)))
+            yield (origen + 1, destino + 1, rng.uniform(0.01, 0.99), tiempo, rng.uniform(0.01, 0.99))
+
+    # Las coordenadas se generan dentro de pares, así que las ciudades van después de la primera ruta
+    filas = enlaces()
+    primer_lote = list(islice(filas, tamano_lote))
+    ciudades = ((i + 1, f"Ciudad_{i}", rng_ciudades.randint(1_000, 5_000_000), rng_ciudades.uniform(10, 1500),
+                 latitudes[i], longitudes[i]) for i in range(num_ciudades))
+    while True:
+        lote = list(islice(ciudades, tamano_lote))
+        if not lote:
+            break
+        cursor.executemany("INSERT INTO Ciudad (id, nombre, poblacion, km2, latitud, longitud) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", lote)
+    lote = primer_lote
+    while lote:
+        # Los pares repetidos los descarta el índice único (idOrigen, idDestino)
+        cursor.executemany("INSERT OR IGNORE INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales) "
+                           "VALUES (?, ?, ?, ?, ?)", lote)
+        lote = list(islice(filas, tamano_lote))
+    crear_esquema(conn)  # Restaura el disparador
+    conn.commit()
+    for id_origen, grado in cursor.execute("SELECT idOrigen, COUNT(*) FROM Enlace GROUP BY idOrigen"):
+        grados[id_origen - 1] = grado
+    conn.close()
+
+    num_rutas = sum(grados)
+    resumen = {
+        'db_path': db_path,
+        'modelo': modelo,
+        'seed': seed,
+        'ciudades': num_ciudades,
+        'rutas': num_rutas,
+        'grado_medio': num_rutas / num_ciudades if num_ciudades else 0.0,
+        'grado_maximo': max(grados, default=0),
+        'ciudades_sin_rutas': sum(1 for grado in grados if grado == 0),
+        'segundos': time.perf_counter() - inicio,
+    }
+    with open(os.path.splitext(db_path)[0] + ".resumen.json", "w", encoding="utf-8") as fichero:
+        json.dump(resumen, fichero, indent=2)
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea rutas.db con la red de ejemplo o con una red sintética.")
+    parser.add_argument("--sintetica", type=int, metavar="CIUDADES",
+                        help="Genera una red sintética con este número de ciudades")
+    parser.add_argument("--modelo", choices=sorted(MODELOS_RED), default="hubs")
+    parser.add_argument("--rutas-por-ciudad", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="rutas.db")
+    args = parser.parse_args()
+
+    if args.sintetica is None:
+        crear_y_poblar_bd()
+        return
+    resumen = generar_red_sintetica(args.db, args.sintetica, args.rutas_por_ciudad, args.modelo, args.seed)
+    print(f"✅ Red '{resumen['modelo']}' (seed {resumen['seed']}) en {resumen['db_path']}: "
+          f"{resumen['ciudades']} ciudades, {resumen['rutas']} rutas, grado medio "
+          f"{resumen['grado_medio']:.1f}, máximo {resumen['grado_maximo']} "
+          f"({resumen['segundos']:.1f} s)")
+
+
 if __name__ == "__main__":
-    crear_y_poblar_bd()
+    main()
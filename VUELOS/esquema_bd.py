@@ -0,0 +1,342 @@
+"""
+Esquema de rutas.db: claves primarias enteras, claves foráneas, índices,
+registro WAL (write-ahead logging) y registro de cambios de rutas, más la
+migración desde el esquema antiguo sin claves ni índices.
+
+Con WAL los lectores (p. ej. el simulador cargando el grafo) no se bloquean
+mientras otra conexión actualiza rutas, y gracias al índice único sobre
+(idOrigen, idDestino) actualizar una ruta o listar los vecinos de una ciudad
+son búsquedas en el índice en lugar de recorridos de la tabla.
+
+Los disparadores de Enlace anotan en CambioEnlace, con un número de secuencia
+creciente, cada ruta insertada o cuyos factores cambian; sincronizar_grafo (en
+cargar_grafo_desde_bd.py) aplica a un grafo ya cargado solo esas filas. El registro
+conserva los últimos RETENCION_CAMBIOS cambios (ver podar_registro): un lector más
+atrasado vuelve a leer todas las rutas.
+
+Uso:
+    python esquema_bd.py [db_path]    # Migra el fichero si tiene el esquema antiguo
+"""
+
+import sqlite3
+import sys
+
+VERSION_ESQUEMA = 2  # Se guarda en PRAGMA user_version
+RETENCION_CAMBIOS = 100_000  # Cambios que conserva CambioEnlace para los lectores atrasados
+
+ESQUEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS Ciudad (
+        id INTEGER PRIMARY KEY,
+        nombre TEXT NOT NULL,
+        poblacion INTEGER,
+        km2 REAL,
+        latitud REAL,
+        longitud REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Enlace (
+        id INTEGER PRIMARY KEY,
+        idOrigen INTEGER NOT NULL REFERENCES Ciudad(id),
+        idDestino INTEGER NOT NULL REFERENCES Ciudad(id),
+        saturacion REAL,
+        tiempo REAL,
+        animales REAL
+    )
+    """,
+    # Una sola ruta por par de ciudades; el índice sirve también para los vecinos salientes
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_enlace_origen_destino ON Enlace (idOrigen, idDestino)",
+    "CREATE INDEX IF NOT EXISTS idx_enlace_destino ON Enlace (idDestino)",
+    "CREATE INDEX IF NOT EXISTS idx_ciudad_nombre ON Ciudad (nombre)",
+    # Registro de cambios (versión 2): una fila por ruta insertada o modificada
+    """
+    CREATE TABLE IF NOT EXISTS CambioEnlace (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        idEnlace INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_enlace_insert AFTER INSERT ON Enlace
+    BEGIN
+        INSERT INTO CambioEnlace (idEnlace) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_enlace_update AFTER UPDATE OF saturacion, tiempo, animales ON Enlace
+    WHEN OLD.saturacion IS NOT NEW.saturacion OR OLD.tiempo IS NOT NEW.tiempo
+        OR OLD.animales IS NOT NEW.animales
+    BEGIN
+        INSERT INTO CambioEnlace (idEnlace) VALUES (NEW.id);
+    END
+    """,
+]
+
+
+def conectar(db_path="rutas.db"):
+    """
+    Abre una conexión con WAL, claves foráneas activas y espera ante bloqueos.
+
+    Args:
+        db_path (str): Ruta al archivo de base de datos SQLite.
+
+    Returns:
+        sqlite3.Connection: Conexión abierta.
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def crear_esquema(conn):
+    """
+    Crea tablas e índices que falten y marca la versión del esquema.
+
+    Args:
+        conn (sqlite3.Connection): Conexión abierta.
+    """
+    for sentencia in ESQUEMA:
+        conn.execute(sentencia)
+    conn.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+
+
+def version_esquema(conn):
+    """Devuelve la versión del esquema de la base de datos (0 si es el antiguo)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrar_bd(db_path="rutas.db"):
+    """
+    Convierte una base de datos con el esquema antiguo al actual, en una transacción.
+    Los ids de ciudad se conservan (eran los rowid implícitos); si había varias filas
+    para el mismo par de ciudades se queda la última, igual que al cargar el grafo.
+
+    Args:
+        db_path (str): Ruta al archivo de base de datos SQLite.
+
+    Returns:
+        bool: True si se ha migrado, False si ya tenía el esquema actual.
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.isolation_level = None  # Transacción explícita, que incluya también el DDL
+    try:
+        version = version_esquema(conn)
+        if version >= VERSION_ESQUEMA:
+            return False
+        if version >= 1:
+            # Desde la versión 1 solo faltan el registro de cambios y sus disparadores
+            conn.execute("BEGIN IMMEDIATE")
+            crear_esquema(conn)
+            conn.execute("COMMIT")
+            return True
+        tablas = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        columnas = {row[1] for row in conn.execute("PRAGMA table_info(Ciudad)")}
+        coordenadas = "latitud, longitud" if {'latitud', 'longitud'} <= columnas else "NULL, NULL"
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if 'Ciudad' in tablas:
+                conn.execute("ALTER TABLE Ciudad RENAME TO Ciudad_antigua")
+            if 'Enlace' in tablas:
+                conn.execute("ALTER TABLE Enlace RENAME TO Enlace_antigua")
+            crear_esquema(conn)
+            if 'Ciudad' in tablas:
+                conn.execute(f"""
+                    INSERT INTO Ciudad (id, nombre, poblacion, km2, latitud, longitud)
+                    SELECT rowid, nombre, poblacion, km2, {coordenadas}
+                    FROM Ciudad_antigua WHERE nombre IS NOT NULL ORDER BY rowid
+                """)
+                conn.execute("DROP TABLE Ciudad_antigua")
+            if 'Enlace' in tablas:
+                conn.execute("""
+                    INSERT OR REPLACE INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales)
+                    SELECT idOrigen, idDestino, saturacion, tiempo, animales FROM Enlace_antigua
+                    WHERE idOrigen IN (SELECT id FROM Ciudad) AND idDestino IN (SELECT id FROM Ciudad)
+                    ORDER BY rowid
+                """)
+                conn.execute("DROP TABLE Enlace_antigua")
+            # Las rutas copiadas no son cambios: quien cargue el grafo las lee todas
+            conn.execute("DELETE FROM CambioEnlace")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'CambioEnlace'")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA journal_mode = WAL")
+        return True
+    finally:
+        conn.close()
+
+
+def ultimo_cambio(conn):
+    """
+    Devuelve el número de secuencia del último cambio registrado en Enlace, aunque
+    ya se haya podado del registro.
+
+    Returns:
+        int: Secuencia (0 si no hay cambios o la base de datos no tiene registro).
+    """
+    try:
+        fila = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'CambioEnlace'").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return fila[0] if fila else 0
+
+
+def cambios_podados_hasta(conn):
+    """
+    Devuelve la secuencia hasta la que se han borrado cambios del registro: quien haya
+    sincronizado antes de ella no puede ponerse al día solo con cambios_desde.
+
+    Returns:
+        int: Secuencia (0 si no se ha podado nada).
+    """
+    primero = conn.execute("SELECT MIN(seq) FROM CambioEnlace").fetchone()[0]
+    return ultimo_cambio(conn) if primero is None else primero - 1
+
+
+def cambios_desde(conn, seq):
+    """
+    Rutas insertadas o modificadas después de un número de secuencia, una vez cada una
+    y con sus valores actuales.
+
+    Returns:
+        list: Tuplas (seq, nombre origen, nombre destino, saturacion, tiempo, animales),
+        en orden de secuencia.
+    """
+    return conn.execute("""
+        SELECT MAX(cambio.seq), o.nombre, d.nombre, e.saturacion, e.tiempo, e.animales
+        FROM CambioEnlace cambio
+        JOIN Enlace e ON e.id = cambio.idEnlace
+        JOIN Ciudad o ON o.id = e.idOrigen
+        JOIN Ciudad d ON d.id = e.idDestino
+        WHERE cambio.seq > ?
+        GROUP BY cambio.idEnlace
+        ORDER BY MAX(cambio.seq)
+    """, (seq,)).fetchall()
+
+
+def podar_cambios(conn, hasta_seq):
+    """
+    Borra del registro los cambios ya aplicados por todos los lectores.
+
+    Args:
+        conn (sqlite3.Connection): Conexión abierta (el llamante confirma la transacción).
+        hasta_seq (int): Se borran los cambios con secuencia menor o igual.
+
+    Returns:
+        int: Cambios borrados.
+    """
+    return conn.execute("DELETE FROM CambioEnlace WHERE seq <= ?", (hasta_seq,)).rowcount
+
+
+def podar_registro(conn, retencion=RETENCION_CAMBIOS):
+    """
+    Aplica la política de retención del registro: borra lo anterior a los últimos
+    retencion cambios y confirma. Es una tarea de mantenimiento, así que si la base
+    de datos es de solo lectura, otra conexión está escribiendo o no hay registro, no
+    espera ni hace nada.
+
+    Args:
+        conn (sqlite3.Connection): Conexión abierta sin transacción pendiente.
+        retencion (int): Cambios que se conservan.
+
+    Returns:
+        int: Cambios borrados.
+    """
+    espera = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    try:
+        hasta = ultimo_cambio(conn) - retencion
+        primero = conn.execute("SELECT MIN(seq) FROM CambioEnlace").fetchone()[0]
+        if primero is None or primero > hasta:
+            return 0
+        conn.execute("PRAGMA busy_timeout = 0")
+        borrados = podar_cambios(conn, hasta)
+        conn.commit()
+        return borrados
+    except sqlite3.OperationalError:
+        conn.rollback()
+        return 0
+    finally:
+        conn.execute(f"PRAGMA busy_timeout = {espera}")
+
+
+def rutas_actuales(conn):
+    """
+    Todas las rutas con sus valores actuales, como las devuelve cambios_desde pero sin
+    secuencia (para ponerse al día cuando el registro ya no basta).
+
+    Returns:
+        list: Tuplas (nombre origen, nombre destino, saturacion, tiempo, animales).
+    """
+    return conn.execute("""
+        SELECT o.nombre, d.nombre, e.saturacion, e.tiempo, e.animales
+        FROM Enlace e
+        JOIN Ciudad o ON o.id = e.idOrigen
+        JOIN Ciudad d ON d.id = e.idDestino
+        ORDER BY e.id
+    """).fetchall()
+
+
+def id_ciudad(conn, nombre):
+    """
+    Devuelve el id de una ciudad por su nombre (usa idx_ciudad_nombre).
+
+    Returns:
+        int: Id de la ciudad, o None si no existe.
+    """
+    fila = conn.execute("SELECT id FROM Ciudad WHERE nombre = ?", (nombre,)).fetchone()
+    return fila[0] if fila else None
+
+
+def coordenadas_ciudad(conn, nombre):
+    """
+    Devuelve las coordenadas de una ciudad por su nombre (usa idx_ciudad_nombre).
+
+    Returns:
+        tuple: (latitud, longitud), con None si se desconocen.
+    """
+    fila = conn.execute("SELECT latitud, longitud FROM Ciudad WHERE nombre = ?", (nombre,)).fetchone()
+    return fila if fila else (None, None)
+
+
+def actualizar_enlace(conn, id_origen, id_destino, saturacion, tiempo, animales):
+    """
+    Actualiza los factores de una ruta localizándola por el índice (idOrigen, idDestino).
+
+    Args:
+        conn (sqlite3.Connection): Conexión abierta (el llamante confirma la transacción).
+        id_origen (int): Id de la ciudad origen.
+        id_destino (int): Id de la ciudad destino.
+
+    Returns:
+        bool: True si la ruta existía.
+    """
+    cursor = conn.execute(
+        "UPDATE Enlace SET saturacion = ?, tiempo = ?, animales = ? WHERE idOrigen = ? AND idDestino = ?",
+        (saturacion, tiempo, animales, id_origen, id_destino))
+    return cursor.rowcount > 0
+
+
+def vecinos(conn, id_ciudad_origen):
+    """
+    Rutas salientes de una ciudad, resueltas en SQL con el índice (idOrigen, idDestino).
+
+    Returns:
+        list: Tuplas (id destino, nombre destino, saturacion, tiempo, animales).
+    """
+    return conn.execute("""
+        SELECT e.idDestino, c.nombre, e.saturacion, e.tiempo, e.animales
+        FROM Enlace e JOIN Ciudad c ON c.id = e.idDestino
+        WHERE e.idOrigen = ?
+        ORDER BY e.idDestino
+    """, (id_ciudad_origen,)).fetchall()
+
+
+if __name__ == "__main__":
+    ruta = sys.argv[1] if len(sys.argv) > 1 else "rutas.db"
+    if migrar_bd(ruta):
+        print(f"✅ {ruta} migrada al esquema {VERSION_ESQUEMA}.")
+    else:
+        print(f"{ruta} ya tiene el esquema {VERSION_ESQUEMA}.")
@@ -0,0 +1,348 @@
+"""
+Servicio HTTP de consulta de rutas sobre el grafo de rutas.db, solo con la
+biblioteca estándar (asyncio).
+
+Endpoints:
+    GET  /ruta?origen=Madrid&destino=Vigo[&perfil=seguridad]
+    GET  /ciudades
+    GET  /estado
+    POST /recargar
+
+Las búsquedas se ejecutan en un pool de procesos; cada proceso carga su propia copia
+del grafo y mantiene una CacheRutas por perfil; el proceso principal solo lee los
+nombres de las ciudades y el número de rutas, que le bastan para validar consultas y
+responder /ciudades y /estado. Las consultas idénticas que llegan mientras otra
+igual está en curso esperan a esa misma búsqueda. Si rutas.db cambia
+(también las escrituras que aún están solo en el fichero -wal), el grafo se recarga
+en segundo plano y se sustituye el pool de golpe: las consultas en curso terminan
+con el grafo anterior y las nuevas usan ya el nuevo.
+
+Uso:
+    python servidor_rutas.py [db_path] [puerto] [procesos]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from CacheRutas import CacheRutas
+from DijkstraSolver import DijkstraSolver
+from ModeloPeso import PERFILES
+from cargar_grafo_desde_bd import cargar_grafo_desde_bd
+from esquema_bd import ultimo_cambio
+
+
+INTERVALO_RECARGA = 2.0  # Segundos entre comprobaciones de cambios en la base de datos
+ESTADOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                500: "Internal Server Error"}
+
+# Grafo y cachés de cada proceso trabajador (ver _iniciar_trabajador)
+_grafo_trabajador = None
+_caches_trabajador = {}
+_barrera_trabajador = None
+
+
+def _iniciar_trabajador(db_path, barrera=None):
+    global _grafo_trabajador, _barrera_trabajador
+    _grafo_trabajador = cargar_grafo_desde_bd(db_path)
+    _caches_trabajador.clear()
+    _barrera_trabajador = barrera
+
+
+def _resolver(origen, destino, perfil):
+    """
+    Busca una ruta en el proceso trabajador.
+
+    Returns:
+        tuple: (nombres de la ruta, coste) o (None, None) si no es alcanzable.
+    """
+    cache = _caches_trabajador.get(perfil)
+    if cache is None:
+        cache = CacheRutas(DijkstraSolver(_grafo_trabajador, PERFILES[perfil]))
+        _caches_trabajador[perfil] = cache
+    origin = _grafo_trabajador.find_node(origen)
+    destination = _grafo_trabajador.find_node(destino)
+    if origin is None or destination is None:
+        return None, None  # La ciudad desapareció en una recarga
+    path = cache.find_shortest_path(origin, destination)
+    if path[0] is not origin:
+        return None, None
+    modelo = PERFILES[perfil]
+    coste = sum(modelo.peso_arista(a.find_edge(b)) for a, b in zip(path, path[1:]))
+    return [node.name for node in path], coste
+
+
+def _listo():
+    # Tarea de calentamiento: la barrera impide que un mismo trabajador atienda dos, así
+    # que cuando terminan todas, cada proceso del pool ya ha cargado el grafo
+    if _barrera_trabajador is not None:
+        _barrera_trabajador.wait()
+    return os.getpid()
+
+
+def _leer_red(path):
+    """
+    Nombres de las ciudades (sin repetir, en el orden del grafo) y número de rutas.
+
+    Returns:
+        tuple: (List[str] nombres, int rutas).
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+    try:
+        nombres = [nombre for nombre, in conn.execute("SELECT nombre FROM Ciudad ORDER BY id")]
+        rutas, = conn.execute("SELECT COUNT(*) FROM Enlace").fetchone()
+    finally:
+        conn.close()
+    return list(dict.fromkeys(nombres)), rutas
+
+
+def _firma_fichero(path):
+    """
+    Firma que cambia con cada escritura confirmada en la base de datos. Con WAL las
+    escrituras van a <path>-wal y el fichero principal no cambia hasta el siguiente
+    checkpoint, así que se incluyen ambos ficheros y el último cambio registrado en
+    CambioEnlace.
+    """
+    firma = []
+    for fichero in (path, path + "-wal"):
+        try:
+            estado = os.stat(fichero)
+            firma.append((estado.st_mtime_ns, estado.st_size))
+        except FileNotFoundError:
+            if fichero == path:
+                raise
+            firma.append(None)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+    try:
+        firma.append(ultimo_cambio(conn))
+    finally:
+        conn.close()
+    return tuple(firma)
+
+
+class ServicioRutas:
+    """
+    Estado del servicio: ciudades del grafo vigente, pool de búsqueda y consultas en curso.
+    """
+
+    def __init__(self, db_path="rutas.db", procesos=None):
+        """
+        Args:
+            db_path (str): Ruta al fichero SQLite.
+            procesos (int): Procesos del pool (os.cpu_count() si es None).
+        """
+        self.db_path = db_path
+        self.procesos = procesos or os.cpu_count() or 1
+        self.ciudades = []  # Nombres de las ciudades del grafo vigente
+        self._indice_ciudades = frozenset()
+        self.rutas = 0  # Rutas del grafo vigente
+        self.pool = None
+        self.generacion = 0  # Aumenta con cada recarga del grafo
+        self.firma = None
+        self.en_curso = {}  # (generación, origen, destino, perfil) -> Future
+        self.consultas = 0
+        self.agrupadas = 0  # Consultas resueltas esperando a otra idéntica
+        self.recargas = 0
+        self._recargando = False
+
+    async def cargar(self):
+        """
+        Lee las ciudades fuera del bucle de eventos, espera a que todos los trabajadores
+        del nuevo pool tengan cargado el grafo y sustituye ciudades y pool a la vez.
+        """
+        loop = asyncio.get_running_loop()
+        firma = await loop.run_in_executor(None, _firma_fichero, self.db_path)
+        ciudades, rutas = await loop.run_in_executor(None, _leer_red, self.db_path)
+        contexto = multiprocessing.get_context()
+        pool = ProcessPoolExecutor(self.procesos, mp_context=contexto, initializer=_iniciar_trabajador,
+                                   initargs=(self.db_path, contexto.Barrier(self.procesos)))
+        # Los procesos del pool arrancan al recibir trabajo: se calientan todos antes del
+        # cambio para que ninguna consulta espere a que un trabajador cargue el grafo
+        await asyncio.gather(*(loop.run_in_executor(pool, _listo) for _ in range(self.procesos)))
+        anterior = self.pool
+        self.ciudades, self._indice_ciudades, self.rutas = ciudades, frozenset(ciudades), rutas
+        self.pool, self.firma = pool, firma
+        self.generacion += 1
+        if anterior is not None:
+            self.recargas += 1
+            # Las búsquedas ya enviadas al pool anterior terminan antes de cerrarlo
+            await loop.run_in_executor(None, anterior.shutdown)
+
+    async def vigilar(self, intervalo=INTERVALO_RECARGA):
+        """Recarga el grafo cada vez que cambia el fichero de la base de datos."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(intervalo)
+            try:
+                # stat y consulta fuera del bucle: no deben frenar las peticiones en curso
+                cambiado = await loop.run_in_executor(None, _firma_fichero, self.db_path) != self.firma
+            except (OSError, sqlite3.Error):
+                continue
+            if cambiado:
+                await self.recargar()
+
+    async def recargar(self):
+        if self._recargando:
+            return
+        self._recargando = True
+        try:
+            await self.cargar()
+        finally:
+            self._recargando = False
+
+    async def ruta(self, origen, destino, perfil):
+        """
+        Resuelve una consulta, agrupándola con otra idéntica si ya está en curso.
+
+        Returns:
+            dict: Respuesta JSON de /ruta.
+        """
+        self.consultas += 1
+        clave = (self.generacion, origen, destino, perfil)
+        futuro = self.en_curso.get(clave)
+        if futuro is not None:
+            self.agrupadas += 1
+            ruta, coste = await asyncio.shield(futuro)
+        else:
+            loop = asyncio.get_running_loop()
+            futuro = loop.run_in_executor(self.pool, _resolver, origen, destino, perfil)
+            self.en_curso[clave] = futuro
+            futuro.add_done_callback(lambda _: self._terminada(clave, futuro))
+            # Si este cliente se va, la búsqueda sigue para los que esperan la misma
+            ruta, coste = await asyncio.shield(futuro)
+        return {'origen': origen, 'destino': destino, 'perfil': perfil,
+                'ruta': ruta, 'coste': coste, 'alcanzable': ruta is not None,
+                'generacion': clave[0]}
+
+    def _terminada(self, clave, futuro):
+        # Retira la búsqueda de en_curso al terminar, aunque su cliente ya no espere
+        if self.en_curso.get(clave) is futuro:
+            del self.en_curso[clave]
+
+    def estado(self):
+        return {'db_path': self.db_path, 'ciudades': len(self.ciudades),
+                'rutas': self.rutas, 'generacion': self.generacion,
+                'procesos': self.procesos, 'consultas': self.consultas,
+                'agrupadas': self.agrupadas, 'en_curso': len(self.en_curso),
+                'recargas': self.recargas}
+
+    async def atender(self, metodo, url):
+        """
+        Encamina una petición HTTP.
+
+        Returns:
+            tuple: (código de estado, cuerpo JSON).
+        """
+        partes = urlsplit(url)
+        if partes.path == "/ruta":
+            if metodo != "GET":
+                return 405, {'error': "Use GET"}
+            parametros = {k: v[0] for k, v in parse_qs(partes.query).items()}
+            origen, destino = parametros.get('origen'), parametros.get('destino')
+            perfil = parametros.get('perfil', 'estandar')
+            if perfil not in PERFILES:
+                return 400, {'error': f"Perfil desconocido: {perfil}"}
+            for ciudad in (origen, destino):
+                if ciudad is None or ciudad not in self._indice_ciudades:
+                    return 404, {'error': f"Ciudad desconocida: {ciudad}"}
+            return 200, await self.ruta(origen, destino, perfil)
+        if partes.path == "/ciudades":
+            return 200, self.ciudades
+        if partes.path == "/estado":
+            return 200, self.estado()
+        if partes.path == "/recargar":
+            if metodo != "POST":
+                return 405, {'error': "Use POST"}
+            await self.recargar()
+            return 200, self.estado()
+        return 404, {'error': f"Ruta HTTP desconocida: {partes.path}"}
+
+    async def conexion(self, reader, writer):
+        """
+        Atiende las peticiones de una conexión HTTP/1.1 (con keep-alive). Una petición
+        mal formada recibe un 400 y un fallo del pool o de la búsqueda un 500, en lugar
+        de cortar la conexión sin respuesta.
+        """
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                cerrar = False
+                try:
+                    metodo, url, version = linea.decode("latin-1").split()
+                    cabeceras = {}
+                    while True:
+                        cabecera = await reader.readline()
+                        if cabecera in (b"\r\n", b"\n", b""):
+                            break
+                        nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                        cabeceras[nombre.strip().lower()] = valor.strip()
+                    longitud = int(cabeceras.get('content-length', 0) or 0)
+                    if longitud < 0:
+                        raise ValueError("Content-Length negativo")
+                    if longitud:
+                        await reader.readexactly(longitud)
+                    cerrar = (cabeceras.get('connection', '').lower() == "close"
+                              or version == "HTTP/1.0")
+                except ValueError as error:
+                    # Sin cabeceras fiables no se puede seguir leyendo la conexión
+                    codigo, cuerpo, cerrar = 400, {'error': f"Petición mal formada: {error}"}, True
+                else:
+                    try:
+                        codigo, cuerpo = await self.atender(metodo, url)
+                    except Exception as error:  # BrokenProcessPool o fallo de la búsqueda
+                        codigo, cuerpo = 500, {'error': f"{type(error).__name__}: {error}"}
+
+                datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {codigo} {ESTADOS_HTTP[codigo]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(datos)}\r\n"
+                    f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n".encode("latin-1") + datos)
+                await writer.drain()
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def servir(db_path="rutas.db", host="127.0.0.1", puerto=8080, procesos=None):
+    """
+    Arranca el servicio y atiende peticiones hasta que se interrumpa.
+    """
+    servicio = ServicioRutas(db_path, procesos)
+    await servicio.cargar()
+    servidor = await asyncio.start_server(servicio.conexion, host, puerto)
+    vigilante = asyncio.create_task(servicio.vigilar())
+    print(f"Sirviendo {len(servicio.ciudades)} ciudades en http://{host}:{puerto} "
+          f"con {servicio.procesos} procesos")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        vigilante.cancel()
+        servicio.pool.shutdown()
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "rutas.db"
+    puerto = int(sys.argv[2]) if len(sys.argv) > 2 else 8080
+    procesos = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    inicio = time.perf_counter()
+    try:
+        asyncio.run(servir(db_path, puerto=puerto, procesos=procesos))
+    except KeyboardInterrupt:
+        print(f"\nServicio detenido tras {time.perf_counter() - inicio:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Los módulos de VUELOS se importan por su nombre, como al ejecutar los scripts desde la carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_dijkstra import generar_grafo_geografico  # noqa: E402
+from crear_bd import generar_red_sintetica  # noqa: E402
+
+
+@pytest.fixture
+def grafo():
+    """Red geográfica pequeña con coordenadas (válida también para A* y ALT)."""
+    return generar_grafo_geografico(300, seed=7)
+
+
+@pytest.fixture
+def consultas(grafo):
+    rng = random.Random(3)
+    return [(rng.choice(grafo.nodes), rng.choice(grafo.nodes)) for _ in range(60)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Base de datos sintética con el esquema actual en un directorio temporal."""
+    path = str(tmp_path / "rutas.db")
+    generar_red_sintetica(path, 400, 5, "hubs", seed=11)
+    return path
@@ -0,0 +1,179 @@
+import sqlite3
+
+import pytest
+
+from cargar_grafo_desde_bd import cargar_csr_desde_bd, cargar_grafo_desde_bd, sincronizar_grafo
+from crear_bd import generar_red_sintetica
+from esquema_bd import (VERSION_ESQUEMA, actualizar_enlace, cambios_desde, cambios_podados_hasta, conectar,
+                        migrar_bd, podar_registro, ultimo_cambio, version_esquema)
+
+
+def rutas(grafo):
+    return {(edge.origin.name, edge.destination.name): (edge.saturacion, edge.tiempo, edge.animales)
+            for edge in grafo.edges}
+
+
+def test_sincronizar_igual_que_recargar(db_path):
+    grafo = cargar_grafo_desde_bd(db_path)
+    version = grafo.version
+    conn = conectar(db_path)
+    for id_origen, id_destino in conn.execute("SELECT idOrigen, idDestino FROM Enlace LIMIT 25").fetchall():
+        actualizar_enlace(conn, id_origen, id_destino, 0.5, 2.5, 0.5)
+    conn.execute("INSERT OR IGNORE INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales) "
+                 "VALUES (1, 400, 0.1, 0.2, 0.3)")
+    conn.commit()
+    assert ultimo_cambio(conn) > grafo.db_change_seq
+    conn.close()
+
+    aplicadas = sincronizar_grafo(grafo)
+    assert aplicadas > 0
+    assert grafo.version > version
+    assert rutas(grafo) == rutas(cargar_grafo_desde_bd(db_path))
+    assert sincronizar_grafo(grafo) == 0
+
+
+def crear_bd_antigua(path):
+    """Base de datos con el esquema original: sin claves, índices ni coordenadas."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE Ciudad (nombre TEXT, poblacion INTEGER, km2 REAL)")
+    conn.execute("CREATE TABLE Enlace (idOrigen INTEGER, idDestino INTEGER, saturacion REAL, "
+                 "tiempo REAL, animales REAL)")
+    conn.executemany("INSERT INTO Ciudad VALUES (?, ?, ?)",
+                     [("Madrid", 3_300_000, 604.3), ("Vigo", 295_000, 109.1), ("León", 122_000, 39.2)])
+    conn.executemany("INSERT INTO Enlace VALUES (?, ?, ?, ?, ?)",
+                     [(1, 2, 0.5, 1.0, 0.2), (2, 3, 0.3, 0.8, 0.1),
+                      (1, 2, 0.4, 0.9, 0.3)])  # Par repetido: vale la última fila
+    conn.commit()
+    conn.close()
+
+
+def test_migracion_desde_esquema_antiguo(tmp_path):
+    path = str(tmp_path / "antigua.db")
+    crear_bd_antigua(path)
+    antes = cargar_grafo_desde_bd(path)
+
+    assert migrar_bd(path)
+    assert not migrar_bd(path)
+    conn = sqlite3.connect(path)
+    assert version_esquema(conn) == VERSION_ESQUEMA
+    assert ultimo_cambio(conn) == 0
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO Enlace (idOrigen, idDestino) VALUES (1, 2)")
+    conn.close()
+    assert rutas(cargar_grafo_desde_bd(path)) == rutas(antes)
+
+
+def test_cargadores_coinciden_con_pares_repetidos(tmp_path):
+    path = str(tmp_path / "antigua.db")
+    crear_bd_antigua(path)
+    grafo = cargar_grafo_desde_bd(path)
+    csr, stats = cargar_csr_desde_bd(path)
+    assert stats['rutas'] == len(grafo.edges) == 2
+    for node in grafo.nodes:
+        assert list(csr.neighbors(node.id)) == pytest.approx(
+            [(edge.destination.id, edge.peso) for edge in node.edges])
+
+
+def test_disparadores_anotan_inserciones_y_cambios(db_path):
+    conn = conectar(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert version_esquema(conn) == VERSION_ESQUEMA
+
+    def registro_desde(seq):
+        return [id_enlace for id_enlace, in conn.execute(
+            "SELECT idEnlace FROM CambioEnlace WHERE seq > ? ORDER BY seq", (seq,))]
+
+    seq = ultimo_cambio(conn)
+    par = conn.execute("""
+        SELECT a.id, b.id FROM Ciudad a, Ciudad b WHERE a.id != b.id
+        AND NOT EXISTS (SELECT 1 FROM Enlace WHERE idOrigen = a.id AND idDestino = b.id) LIMIT 1
+    """).fetchone()
+    nuevo = conn.execute("INSERT INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales) "
+                         "VALUES (?, ?, 0.1, 0.2, 0.3)", par).lastrowid
+    assert registro_desde(seq) == [nuevo]
+    seq = ultimo_cambio(conn)
+
+    # Repetir los mismos valores o cambiar otra columna no es un cambio de la ruta
+    id_origen, id_destino, saturacion, tiempo, animales, id_enlace = conn.execute(
+        "SELECT idOrigen, idDestino, saturacion, tiempo, animales, id FROM Enlace LIMIT 1").fetchone()
+    assert actualizar_enlace(conn, id_origen, id_destino, saturacion, tiempo, animales)
+    conn.execute("UPDATE Ciudad SET poblacion = 1 WHERE id = ?", (id_origen,))
+    assert registro_desde(seq) == []
+
+    assert actualizar_enlace(conn, id_origen, id_destino, saturacion, tiempo + 0.5, animales)
+    assert actualizar_enlace(conn, id_origen, id_destino, 0.5, tiempo + 0.5, animales)
+    assert registro_desde(seq) == [id_enlace, id_enlace]
+    conn.commit()
+    # cambios_desde devuelve cada ruta una vez, con sus valores actuales
+    assert [fila[3:] for fila in cambios_desde(conn, seq)] == [(0.5, tiempo + 0.5, animales)]
+    conn.close()
+
+
+def ciudades(grafo):
+    return {node.name: (node.latitud, node.longitud) for node in grafo.nodes}
+
+
+def test_sincronizar_crea_ciudades_con_coordenadas(db_path):
+    grafo = cargar_grafo_desde_bd(db_path)
+    conn = conectar(db_path)
+    nueva = conn.execute("INSERT INTO Ciudad (nombre, latitud, longitud) VALUES ('Nueva', 42.2, -8.7)").lastrowid
+    conn.execute("INSERT INTO Enlace (idOrigen, idDestino, saturacion, tiempo, animales) "
+                 "VALUES (1, ?, 0.1, 0.2, 0.3)", (nueva,))
+    conn.commit()
+    conn.close()
+
+    assert sincronizar_grafo(grafo) == 1
+    assert (grafo.find_node('Nueva').latitud, grafo.find_node('Nueva').longitud) == (42.2, -8.7)
+    recargado = cargar_grafo_desde_bd(db_path)
+    assert ciudades(grafo) == ciudades(recargado)
+    assert rutas(grafo) == rutas(recargado)
+
+
+def test_registro_podado_y_lector_atrasado(db_path):
+    atrasado = cargar_grafo_desde_bd(db_path)
+    al_dia = cargar_grafo_desde_bd(db_path)
+    conn = conectar(db_path)
+    enlaces = conn.execute("SELECT idOrigen, idDestino FROM Enlace LIMIT 40").fetchall()
+    for i, (id_origen, id_destino) in enumerate(enlaces):
+        actualizar_enlace(conn, id_origen, id_destino, 0.5, 1.0 + i / 100, 0.5)
+        conn.commit()
+        if i == 34:
+            sincronizar_grafo(al_dia)
+    ultimo = ultimo_cambio(conn)
+
+    assert podar_registro(conn, retencion=10) == 30
+    assert conn.execute("SELECT COUNT(*) FROM CambioEnlace").fetchone()[0] == 10
+    assert ultimo_cambio(conn) == ultimo
+    assert cambios_podados_hasta(conn) == ultimo - 10
+    assert podar_registro(conn, retencion=10) == 0
+    conn.close()
+
+    # El lector al día sigue con el registro; el atrasado vuelve a leer todas las rutas
+    recargado = cargar_grafo_desde_bd(db_path)
+    assert sincronizar_grafo(al_dia) == 5
+    assert sincronizar_grafo(atrasado) == len(recargado.edges)
+    for grafo in (al_dia, atrasado):
+        assert rutas(grafo) == rutas(recargado)
+        assert grafo.db_change_seq == ultimo
+        assert sincronizar_grafo(grafo) == 0
+
+
+def contenido_bd(path):
+    conn = conectar(path)
+    try:
+        return (conn.execute("SELECT * FROM Ciudad ORDER BY id").fetchall(),
+                conn.execute("SELECT idOrigen, idDestino, saturacion, tiempo, animales FROM Enlace "
+                             "ORDER BY idOrigen, idDestino").fetchall())
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("modelo", ["hubs", "libre_escala"])
+def test_red_sintetica_no_depende_del_tamano_de_lote(tmp_path, modelo):
+    redes = {}
+    for nombre, seed, tamano_lote in (("a", 5, 100_000), ("b", 5, 7), ("c", 6, 100_000)):
+        path = str(tmp_path / f"{nombre}.db")
+        generar_red_sintetica(path, 300, 4, modelo, seed=seed, tamano_lote=tamano_lote)
+        redes[nombre] = contenido_bd(path)
+    assert redes["a"][1] and redes["a"] == redes["b"]
+    assert redes["a"] != redes["c"]
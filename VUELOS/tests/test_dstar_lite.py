@@ -0,0 +1,78 @@
+import math
+import random
+
+import pytest
+
+from DStarLite import DStarLite
+from DijkstraSolver import DijkstraSolver
+from FlightSimulator import FlightSimulator
+from GeneradorCondiciones import GeneradorCondiciones
+
+
+def test_dstar_lite_igual_que_dijkstra_tras_cambios(grafo, consultas):
+    rng = random.Random(5)
+    destinos = {destino.id: destino for _, destino in consultas[:8]}
+    planes = {destino_id: DStarLite(grafo, destino) for destino_id, destino in destinos.items()}
+    generador = GeneradorCondiciones(grafo, tasa=0.02, paso_tiempo=0.5, seed=9)
+    referencia = DijkstraSolver(grafo)
+    for _ in range(6):
+        generador.aplicar()
+        for destino_id, plan in planes.items():
+            plan.sync()
+            for _ in range(5):
+                origen = rng.choice(grafo.nodes)
+                referencia.find_shortest_path(origen, destinos[destino_id])
+                coste = plan.cost_from(origen)
+                if referencia.last_cost == math.inf:
+                    assert coste == math.inf
+                else:
+                    assert coste == pytest.approx(referencia.last_cost)
+                    ruta = plan.path_from(origen)
+                    assert ruta[0] is origen and ruta[-1] is destinos[destino_id]
+
+
+def test_simulador_replanifica_solo_si_cambia_el_grafo(grafo, consultas):
+    origen, destino = next((o, d) for o, d in consultas if o is not d)
+    simulador = FlightSimulator(grafo, origen.name, destino.name)
+    assert simulador.replan(origen) is None
+    assert simulador.skipped_replans == 1
+
+    ruta = simulador.route
+    if len(ruta) > 1:
+        edge = ruta[0].find_edge(ruta[1])
+        edge.update(edge.saturacion, 3.0, edge.animales)
+    else:
+        grafo.edges[0].update(grafo.edges[0].saturacion, 3.0, grafo.edges[0].animales)
+    nueva = simulador.replan(origen)
+    referencia = DijkstraSolver(grafo)
+    referencia.find_shortest_path(origen, destino)
+    assert simulador.replans == 1
+    if referencia.last_cost != math.inf:
+        assert sum(a.find_edge(b).peso for a, b in zip(nueva, nueva[1:])) == pytest.approx(referencia.last_cost)
+
+
+def test_registro_de_cambios_acotado_y_sin_perder_cambios(grafo, consultas):
+    destino = next(d for o, d in consultas if o is not d)
+    al_dia = DStarLite(grafo, destino)
+    atrasado = DStarLite(grafo, destino)
+    generador = GeneradorCondiciones(grafo, tasa=0.05, seed=4)
+    cambiadas = set()
+    for _ in range(60):
+        cambiadas.update(generador.aplicar())
+        al_dia.sync()
+    # El lector atrasado sigue recibiendo al menos sus cambios, aunque el registro se recorte
+    assert len(grafo.changed_edges) <= max(1024, 2 * len(grafo.edges))
+    assert grafo.edges_changed_since(atrasado.version) >= cambiadas
+    atrasado.sync()
+    referencia = DijkstraSolver(grafo)
+    for origen, _ in consultas[:10]:
+        referencia.find_shortest_path(origen, destino)
+        assert atrasado.cost_from(origen) == pytest.approx(referencia.last_cost)
+
+    del atrasado
+    for _ in range(200):
+        generador.aplicar()
+        al_dia.sync()
+    # Sin lectores atrasados el registro solo guarda lo que aún no se ha leído
+    assert len(grafo.changed_edges) <= 1024
+    assert grafo.change_log_start <= al_dia.version
@@ -0,0 +1,123 @@
+import heapq
+
+import pytest
+
+import AStarSolver as modulo_astar
+import DStarLite as modulo_dstar
+import DijkstraSolver as modulo_dijkstra
+from AStarSolver import AStarSolver
+from DStarLite import DStarLite
+from DijkstraSolver import DijkstraSolver
+from FlightSimulator import FlightSimulator
+from GeneradorCondiciones import GeneradorCondiciones
+from GrafoCSR import GrafoCSR
+
+
+class HeapContado:
+    """Sustituto de heapq que cuenta las inserciones y extracciones."""
+
+    def __init__(self):
+        self.pushes = 0
+        self.pops = 0
+
+    def heappush(self, queue, item):
+        self.pushes += 1
+        heapq.heappush(queue, item)
+
+    def heappop(self, queue):
+        self.pops += 1
+        return heapq.heappop(queue)
+
+    def reiniciar(self):
+        self.pushes = self.pops = 0
+
+
+@pytest.fixture
+def contador(monkeypatch):
+    contador = HeapContado()
+    for modulo in (modulo_dijkstra, modulo_astar, modulo_dstar):
+        monkeypatch.setattr(modulo, 'heapq', contador)
+    return contador
+
+
+def assert_cuadra(stats, contador, iniciales=1):
+    # Las entradas iniciales (origen y, en la bidireccional, destino) se crean sin heappush
+    assert stats.heap_pushes == contador.pushes + iniciales
+    assert stats.heap_pops == contador.pops
+    assert stats.stale_skipped == stats.heap_pops - stats.nodes_settled >= 0
+    # Toda mejora sale de una ruta examinada, pero no al revés
+    assert stats.edges_scanned >= stats.edges_improved == stats.heap_pushes - iniciales
+
+
+def test_estadisticas_cuadran_con_el_heap(grafo, consultas, contador):
+    csr = GrafoCSR.from_graph(grafo)
+    busquedas = [
+        (DijkstraSolver(grafo), 'find_shortest_path', False, 1),
+        (DijkstraSolver(csr), 'find_shortest_path', True, 1),
+        (DijkstraSolver(grafo), 'find_shortest_path_bidirectional', False, 2),
+        (AStarSolver(grafo), 'find_shortest_path', False, 1),
+    ]
+    for solver, metodo, es_csr, iniciales in busquedas:
+        recibidas = []
+        solver.suscribir_estadisticas(recibidas.append)
+        for origen, destino in consultas[:20]:
+            if es_csr:
+                origen, destino = csr.nodes[origen.id], csr.nodes[destino.id]
+            contador.reiniciar()
+            getattr(solver, metodo)(origen, destino)
+            stats = recibidas[-1]
+            assert stats is solver.last_stats
+            assert_cuadra(stats, contador, iniciales)
+            assert stats.cost == solver.last_cost
+        assert len(recibidas) == 20
+
+    solver = DijkstraSolver(grafo)
+    solver.activar_estadisticas()
+    contador.reiniciar()
+    arbol = solver.shortest_path_tree(grafo.nodes[0])
+    assert_cuadra(solver.last_stats, contador)
+    # El árbol expande todo lo alcanzable y examina todas sus rutas salientes
+    alcanzables = [node for node in grafo.nodes if arbol.distances[node.id] != float('inf')]
+    assert solver.last_stats.edges_scanned == sum(len(node.edges) for node in alcanzables)
+    assert solver.last_stats.edges_scanned > solver.last_stats.edges_improved
+
+
+def test_estadisticas_de_dstar_lite(grafo, consultas, contador):
+    origen, destino = consultas[0]
+    plan = DStarLite(grafo, destino)
+    plan.activar_estadisticas()
+    generador = GeneradorCondiciones(grafo, tasa=0.02, seed=2)
+    for _ in range(4):
+        # Lo encolado por sync no cuenta como inserción de la búsqueda, pero sí puede
+        # extraerse en ella: las extracciones se comparan con el heap real
+        contador.reiniciar()
+        plan.path_from(origen)
+        assert_cuadra(plan.last_stats, contador, iniciales=0)
+        generador.aplicar()
+        plan.sync()
+
+
+def test_sin_estadisticas_no_se_recoge_nada(grafo, consultas):
+    solver = DijkstraSolver(grafo)
+    solver.find_shortest_path(*consultas[0])
+    assert not solver.recoger_estadisticas
+    assert solver.last_stats is None
+
+    recibidas = []
+    solver.suscribir_estadisticas(recibidas.append)
+    solver.find_shortest_path(*consultas[1])
+    solver.cancelar_estadisticas(recibidas.append)
+    solver.find_shortest_path(*consultas[2])
+    assert len(recibidas) == 1 and not solver.recoger_estadisticas
+
+
+def test_simulador_muestra_estadisticas_sin_activar_el_solver_ajeno(grafo, consultas):
+    origen, destino = consultas[0]
+    solver = DijkstraSolver(grafo)
+    simulador = FlightSimulator(grafo, origen.name, destino.name, solver=solver)
+    info = simulador.get_route_info()
+    assert info['last_query_stats']['algoritmo'] == 'dijkstra'
+    assert not solver.recoger_estadisticas
+
+    propio = FlightSimulator(grafo, origen.name, destino.name)
+    assert propio.get_route_info()['last_query_stats']['algoritmo'] == 'd_star_lite'
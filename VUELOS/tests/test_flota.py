@@ -0,0 +1,66 @@
+import math
+import random
+
+import pytest
+
+from DijkstraSolver import DijkstraSolver
+from FleetSimulator import FleetSimulator
+from GeneradorCondiciones import GeneradorCondiciones
+
+
+def coste_ruta(path):
+    return sum(a.find_edge(b).peso for a, b in zip(path, path[1:]))
+
+
+def crear_flota(grafo, vuelos=40, seed=1):
+    rng = random.Random(seed)
+    flota = FleetSimulator(grafo)
+    for _ in range(vuelos):
+        origen, destino = rng.sample(grafo.nodes, 2)
+        flota.add_flight(origen.name, destino.name)
+    return flota
+
+
+def test_flota_sin_cambios_igual_que_dijkstra(grafo):
+    flota = crear_flota(grafo)
+    referencia = DijkstraSolver(grafo)
+    tramos = 0
+    for vuelo in flota.flights:
+        referencia.find_shortest_path(vuelo.origin, vuelo.destination)
+        assert vuelo.reachable == (referencia.last_cost != math.inf)
+        if vuelo.reachable:
+            assert coste_ruta(vuelo.route) == pytest.approx(referencia.last_cost)
+            tramos += len(vuelo.route) - 1
+
+    stats = flota.run()
+    assert stats['active'] == 0
+    assert stats['hops'] == tramos
+    assert stats['steps'] == max(len(vuelo.route) - 1 for vuelo in flota.flights if vuelo.reachable)
+    assert stats['unreachable'] == sum(not vuelo.reachable for vuelo in flota.flights)
+    assert stats['replans'] == 0 and stats['route_changes'] == 0
+    assert stats['planners'] == len({vuelo.destination.id for vuelo in flota.flights})
+
+
+def test_flota_replanifica_como_dijkstra_con_cambios(grafo):
+    flota = crear_flota(grafo, seed=2)
+    generador = GeneradorCondiciones(grafo, tasa=0.05, paso_tiempo=0.5, seed=6)
+    referencia = DijkstraSolver(grafo)
+    while flota.active:
+        generador.aplicar()
+        flota.step()
+        for vuelo in flota.active:
+            actual = vuelo.route[vuelo.position]
+            referencia.find_shortest_path(actual, vuelo.destination)
+            if referencia.last_cost != math.inf:
+                # Lo que queda de cada ruta es óptimo con las condiciones actuales
+                assert coste_ruta(vuelo.route[vuelo.position:]) == pytest.approx(referencia.last_cost)
+    stats = flota.estadisticas()
+    assert stats['replans'] == stats['steps'] and stats['route_changes'] > 0
+    assert stats['route_changes'] == sum(vuelo.route_changes for vuelo in flota.flights)
+    assert len(flota.replan_latencies) == stats['replans']
+
+
+def test_vuelo_a_ciudad_desconocida(grafo):
+    flota = FleetSimulator(grafo)
+    with pytest.raises(ValueError):
+        flota.add_flight(grafo.nodes[0].name, "Atlántida")
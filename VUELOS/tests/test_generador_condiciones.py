@@ -0,0 +1,54 @@
+from benchmark_dijkstra import generar_grafo_geografico
+from FleetSimulator import FleetSimulator
+from GeneradorCondiciones import GeneradorCondiciones
+
+
+def factores(grafo):
+    return [(edge.saturacion, edge.tiempo, edge.animales) for edge in grafo.edges]
+
+
+def test_misma_semilla_mismos_cambios():
+    grafos = [generar_grafo_geografico(200, seed=3) for _ in range(3)]
+    generadores = [GeneradorCondiciones(grafos[0], tasa=0.02, seed=8),
+                   GeneradorCondiciones(grafos[1], tasa=0.02, seed=8),
+                   GeneradorCondiciones(grafos[2], tasa=0.02, seed=9)]
+    for _ in range(10):
+        lotes = [[edge.id for edge in generador.aplicar()] for generador in generadores]
+        assert lotes[0] == lotes[1]
+    assert factores(grafos[0]) == factores(grafos[1])
+    assert factores(grafos[0]) != factores(grafos[2])
+
+
+def test_cambios_dentro_de_rango_y_avisos(grafo):
+    generador = GeneradorCondiciones(grafo, tasa=0.01, paso_saturacion=0.5, paso_tiempo=2.0,
+                                     paso_animales=0.5, seed=1)
+    recibidos = []
+    generador.suscribir(recibidos.append)
+    version = grafo.version
+    cambiadas = set()
+    for _ in range(20):
+        lote = generador.aplicar()
+        assert lote and recibidos[-1] is lote
+        assert len(lote) <= max(1, round(0.01 * len(grafo.edges)))
+        assert grafo.edges_changed_since(version) == set(lote)
+        version = grafo.version
+        cambiadas.update(lote)
+    for edge in cambiadas:
+        for factor, (minimo, maximo) in zip((edge.saturacion, edge.tiempo, edge.animales),
+                                            GeneradorCondiciones.RANGOS.values()):
+            assert minimo <= factor <= maximo
+
+    generador.cancelar(recibidos.append)
+    ultimo = generador.aplicar()
+    assert len(recibidos) == 20
+    stats = generador.estadisticas()
+    assert stats['lotes'] == 21
+    assert stats['cambios'] == sum(len(lote) for lote in recibidos) + len(ultimo)
+
+
+def test_generador_como_paso_de_la_flota(grafo):
+    flota = FleetSimulator(grafo)
+    flota.add_flight(grafo.nodes[0].name, grafo.nodes[-1].name)
+    generador = GeneradorCondiciones(grafo, seed=2)
+    flota.run(max_steps=3, on_step=generador)
+    assert generador.lotes == flota.steps
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import math
+
+import pytest
+
+from DijkstraSolver import DijkstraSolver
+from cargar_grafo_desde_bd import cargar_grafo_desde_bd
+from esquema_bd import actualizar_enlace, conectar
+from servidor_rutas import ServicioRutas
+
+
+async def peticion(puerto, crudo):
+    """Envía una petición HTTP tal cual y devuelve (código, cuerpo JSON)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+    try:
+        writer.write(crudo)
+        await writer.drain()
+        estado = await reader.readline()
+        cabeceras = {}
+        while True:
+            linea = await reader.readline()
+            if linea in (b"\r\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        cuerpo = await reader.readexactly(int(cabeceras['content-length']))
+        return int(estado.split()[1]), json.loads(cuerpo)
+    finally:
+        writer.close()
+
+
+def get(ruta):
+    return f"GET {ruta} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n".encode("latin-1")
+
+
+def coste_dijkstra(db_path, origen, destino):
+    grafo = cargar_grafo_desde_bd(db_path)
+    solver = DijkstraSolver(grafo)
+    solver.find_shortest_path(grafo.find_node(origen), grafo.find_node(destino))
+    return solver.last_cost
+
+
+def par_alcanzable(db_path):
+    grafo = cargar_grafo_desde_bd(db_path)
+    solver = DijkstraSolver(grafo)
+    for destino in reversed(grafo.nodes):
+        ruta = solver.find_shortest_path(grafo.nodes[0], destino)
+        if len(ruta) > 2:
+            return [node.name for node in ruta]
+    raise AssertionError("la red de prueba no tiene rutas de varios tramos")
+
+
+async def arrancar(db_path):
+    servicio = ServicioRutas(db_path, procesos=2)
+    await servicio.cargar()
+    servidor = await asyncio.start_server(servicio.conexion, "127.0.0.1", 0)
+    return servicio, servidor, servidor.sockets[0].getsockname()[1]
+
+
+def test_rutas_y_errores_http(db_path):
+    ruta = par_alcanzable(db_path)
+    origen, destino = ruta[0], ruta[-1]
+
+    async def escenario():
+        servicio, servidor, puerto = await arrancar(db_path)
+        try:
+            codigo, cuerpo = await peticion(puerto, get(f"/ruta?origen={origen}&destino={destino}"))
+            assert codigo == 200 and cuerpo['alcanzable']
+            assert cuerpo['coste'] == pytest.approx(coste_dijkstra(db_path, origen, destino))
+            assert cuerpo['ruta'][0] == origen and cuerpo['ruta'][-1] == destino
+
+            codigo, ciudades = await peticion(puerto, get("/ciudades"))
+            assert codigo == 200
+            assert ciudades == [node.name for node in cargar_grafo_desde_bd(db_path).nodes]
+            codigo, estado = await peticion(puerto, get("/estado"))
+            assert codigo == 200 and estado['ciudades'] == len(ciudades) and estado['consultas'] == 1
+
+            assert (await peticion(puerto, get(f"/ruta?origen=Atlántida&destino={destino}")))[0] == 404
+            assert (await peticion(puerto, get(f"/ruta?origen={origen}&destino={destino}&perfil=x")))[0] == 400
+            assert (await peticion(puerto, get("/recargar")))[0] == 405
+            assert (await peticion(puerto, b"HOLA\r\n\r\n"))[0] == 400
+            assert (await peticion(puerto, b"GET /estado HTTP/1.1\r\nContent-Length: x\r\n\r\n"))[0] == 400
+
+            # Un pool cerrado no corta la conexión: responde 500
+            servicio.pool.shutdown()
+            codigo, cuerpo = await peticion(puerto, get(f"/ruta?origen={destino}&destino={origen}"))
+            assert codigo == 500 and 'error' in cuerpo
+        finally:
+            servidor.close()
+            servicio.pool.shutdown()
+
+    asyncio.run(escenario())
+
+
+def test_consultas_identicas_agrupadas_aunque_se_cancele_la_primera(db_path):
+    ruta = par_alcanzable(db_path)
+
+    async def escenario():
+        servicio = ServicioRutas(db_path, procesos=2)
+        await servicio.cargar()
+        try:
+            primera = asyncio.create_task(servicio.ruta(ruta[0], ruta[-1], 'estandar'))
+            await asyncio.sleep(0)
+            resto = [asyncio.create_task(servicio.ruta(ruta[0], ruta[-1], 'estandar')) for _ in range(4)]
+            await asyncio.sleep(0)
+            primera.cancel()
+            respuestas = await asyncio.gather(*resto)
+            assert servicio.agrupadas == 4
+            assert all(respuesta['ruta'] == respuestas[0]['ruta'] for respuesta in respuestas)
+            assert respuestas[0]['coste'] == pytest.approx(coste_dijkstra(db_path, ruta[0], ruta[-1]))
+            await asyncio.sleep(0)
+            assert servicio.en_curso == {}
+        finally:
+            servicio.pool.shutdown()
+
+    asyncio.run(escenario())
+
+
+def test_recarga_al_cambiar_la_bd(db_path):
+    ruta = par_alcanzable(db_path)
+    origen, destino = ruta[0], ruta[-1]
+
+    async def escenario():
+        servicio = ServicioRutas(db_path, procesos=2)
+        await servicio.cargar()
+        vigilante = asyncio.create_task(servicio.vigilar(intervalo=0.05))
+        try:
+            antes = await servicio.ruta(origen, destino, 'estandar')
+            # Encarecer un tramo de la ruta con una escritura que queda en el fichero -wal
+            conn = conectar(db_path)
+            ids = dict(conn.execute("SELECT nombre, id FROM Ciudad").fetchall())
+            actualizar_enlace(conn, ids[ruta[0]], ids[ruta[1]], 0.99, 3.0, 0.99)
+            conn.commit()
+            conn.close()
+            for _ in range(200):
+                if servicio.generacion > 1:
+                    break
+                await asyncio.sleep(0.05)
+            assert servicio.generacion == 2 and servicio.recargas == 1
+            despues = await servicio.ruta(origen, destino, 'estandar')
+            assert despues['generacion'] == 2
+            esperado = coste_dijkstra(db_path, origen, destino)
+            assert despues['coste'] == pytest.approx(esperado)
+            assert esperado != math.inf and esperado > antes['coste']
+        finally:
+            vigilante.cancel()
+            servicio.pool.shutdown()
+
+    asyncio.run(escenario())
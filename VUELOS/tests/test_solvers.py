@@ -0,0 +1,157 @@
+import math
+import os
+
+import pytest
+
+from ALTSolver import ALTSolver
+from AStarSolver import AStarSolver
+from CacheRutas import CacheRutas
+from ContractionHierarchy import ContractionHierarchy
+from DijkstraSolver import DijkstraSolver
+from GeneradorCondiciones import GeneradorCondiciones
+from GrafoCSR import GrafoCSR
+from Graph import Graph
+from Landmarks import Landmarks
+from cargar_grafo_desde_bd import cargar_csr_desde_bd, cargar_grafo_desde_bd
+
+
+def coste_ruta(path):
+    return sum(a.find_edge(b).peso for a, b in zip(path, path[1:]))
+
+
+def assert_misma_solucion(referencia, coste, path, origen, destino):
+    if referencia == math.inf:
+        assert coste == math.inf
+        assert [node.id for node in path] == [destino.id]
+        return
+    assert coste == pytest.approx(referencia)
+    assert path[0].id == origen.id and path[-1].id == destino.id
+
+
+def test_motores_equivalentes_a_dijkstra(grafo, consultas):
+    referencia = DijkstraSolver(grafo)
+    csr = GrafoCSR.from_graph(grafo)
+    landmarks = Landmarks.calcular(grafo, 4)
+    motores = {
+        'csr': DijkstraSolver(csr),
+        'astar': AStarSolver(grafo),
+        'alt': ALTSolver(grafo, landmarks=landmarks),
+        'ch': ContractionHierarchy(grafo),
+    }
+    bidireccional = DijkstraSolver(grafo)
+    for origen, destino in consultas:
+        path = referencia.find_shortest_path(origen, destino)
+        esperado = referencia.last_cost
+        if esperado != math.inf:
+            assert coste_ruta(path) == pytest.approx(esperado)
+        for nombre, motor in motores.items():
+            nodos = motor.graph.nodes
+            ruta = motor.find_shortest_path(nodos[origen.id], nodos[destino.id])
+            assert_misma_solucion(esperado, motor.last_cost, ruta, origen, destino)
+        ruta = bidireccional.find_shortest_path_bidirectional(origen, destino)
+        assert_misma_solucion(esperado, bidireccional.last_cost, ruta, origen, destino)
+
+
+def test_astar_actualiza_la_heuristica_con_las_rutas_cambiadas(grafo, consultas, monkeypatch):
+    astar = AStarSolver(grafo)
+    referencia = DijkstraSolver(grafo)
+    astar.find_shortest_path(*consultas[0])
+    generador = GeneradorCondiciones(grafo, tasa=0.01, paso_tiempo=0.5, seed=2)
+    recorridos = []
+    original = AStarSolver._coste_km_arista
+    monkeypatch.setattr(AStarSolver, '_coste_km_arista',
+                        lambda self, edge, pesos: recorridos.append(edge) or original(self, edge, pesos))
+    for _ in range(10):
+        recorridos.clear()
+        cambiadas = generador.aplicar()
+        minima = grafo.edges[astar._arista_minima]
+        for origen, destino in consultas[:10]:
+            ruta = astar.find_shortest_path(origen, destino)
+            referencia.find_shortest_path(origen, destino)
+            assert_misma_solucion(referencia.last_cost, astar.last_cost, ruta, origen, destino)
+        if minima not in cambiadas:
+            assert len(recorridos) == len(cambiadas)  # Sin recorrer todas las rutas
+        nuevo = AStarSolver(grafo)
+        nuevo._prepare_heuristic()
+        assert astar._factor == pytest.approx(nuevo._factor)
+
+    # Encarecer la ruta del mínimo obliga a recorrerlas todas
+    minima = grafo.edges[astar._arista_minima]
+    minima.update(minima.saturacion, 3.0, minima.animales)
+    recorridos.clear()
+    astar.find_shortest_path(*consultas[0])
+    assert len(recorridos) > len(grafo.edges)
+    nuevo = AStarSolver(grafo)
+    nuevo._prepare_heuristic()
+    assert astar._factor == pytest.approx(nuevo._factor)
+
+
+def test_landmarks_guardados_se_reutilizan_en_red_no_conexa(tmp_path, monkeypatch):
+    grafo = Graph()
+    for origen, destino in [("A", "B"), ("B", "C"), ("C", "A"), ("X", "Y"), ("Y", "X")]:
+        grafo.add_edge(origen, destino, 0.5, 1.0, 0.2)
+    path = str(tmp_path / "red.landmarks")
+    calculadas = grafo.preparar_landmarks(k=8, path=path)
+    assert len(calculadas.landmark_ids) < 8
+
+    def sin_recalcular(*args, **kwargs):
+        raise AssertionError("las tablas guardadas deberían reutilizarse")
+    monkeypatch.setattr(Landmarks, 'calcular', sin_recalcular)
+    cargadas = grafo.preparar_landmarks(k=8, path=path)
+    assert cargadas.landmark_ids == calculadas.landmark_ids
+    assert [list(t) for t in cargadas.forward] == [list(t) for t in calculadas.forward]
+    assert [list(t) for t in cargadas.backward] == [list(t) for t in calculadas.backward]
+    assert cargadas.vigente(grafo)
+
+    # Un fichero con otro formato o truncado no se carga
+    with open(path, "r+b") as fichero:
+        fichero.truncate(os.path.getsize(path) - 8)
+    assert Landmarks.cargar(path, grafo) is None
+    with open(path, "wb") as fichero:
+        fichero.write(b"\x80\x05no es una tabla")
+    assert Landmarks.cargar(path, grafo) is None
+
+
+def test_csr_cargado_desde_bd_admite_nodos(db_path):
+    grafo = cargar_grafo_desde_bd(db_path)
+    csr, _ = cargar_csr_desde_bd(db_path)
+    referencia = DijkstraSolver(grafo)
+    motores = [DijkstraSolver(csr), AStarSolver(csr), ContractionHierarchy(csr)]
+    for origen_id, destino_id in [(0, 399), (5, 200), (17, 17), (250, 3)]:
+        referencia.find_shortest_path(grafo.nodes[origen_id], grafo.nodes[destino_id])
+        for motor in motores:
+            ruta = motor.find_shortest_path(csr.nodes[origen_id], csr.nodes[destino_id])
+            assert motor.last_cost == pytest.approx(referencia.last_cost)
+            assert [node.name for node in ruta][-1] == grafo.nodes[destino_id].name
+        arbol = motores[0].shortest_path_tree(csr.nodes[origen_id])
+        assert arbol.ruta(csr.nodes[destino_id])[-1].id == destino_id
+
+
+def test_lotes_y_arbol_coinciden_con_consultas_sueltas(grafo, consultas):
+    solver = DijkstraSolver(grafo)
+    referencia = DijkstraSolver(grafo)
+    rutas = solver.find_shortest_paths(consultas)
+    for (origen, destino), ruta in zip(consultas, rutas):
+        referencia.find_shortest_path(origen, destino)
+        arbol = solver.shortest_path_tree(origen)
+        assert arbol.distancia(destino) == pytest.approx(referencia.last_cost)
+        if referencia.last_cost != math.inf:
+            assert coste_ruta(ruta) == pytest.approx(referencia.last_cost)
+            assert coste_ruta(arbol.ruta(destino)) == pytest.approx(referencia.last_cost)
+
+
+def test_cache_no_devuelve_rutas_obsoletas(grafo, consultas):
+    cache = CacheRutas(DijkstraSolver(grafo), capacidad=128)
+    referencia = DijkstraSolver(grafo)
+    edges = grafo.edges
+    for paso in range(5):
+        for origen, destino in consultas + consultas[:20]:
+            ruta = cache.find_shortest_path(origen, destino)
+            referencia.find_shortest_path(origen, destino)
+            if referencia.last_cost != math.inf:
+                assert coste_ruta(ruta) == pytest.approx(referencia.last_cost)
+        # Subidas y bajadas de peso entre rondas
+        for i, edge in enumerate(edges[paso::37]):
+            factor = 0.5 if i % 2 else 1.5
+            edge.update(edge.saturacion, min(3.0, max(0.1, edge.tiempo * factor)), edge.animales)
+    assert cache.hits > 0
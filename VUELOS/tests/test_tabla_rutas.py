@@ -0,0 +1,57 @@
+import math
+
+import pytest
+
+from DijkstraSolver import DijkstraSolver
+from TablaRutas import TablaRutas
+
+
+def test_tabla_con_varios_procesos_igual_que_dijkstra(grafo, consultas, tmp_path):
+    path = str(tmp_path / "rutas.tabla")
+    tabla = TablaRutas.calcular(grafo, path, procesos=2)
+    try:
+        referencia = DijkstraSolver(grafo)
+        for origen, destino in consultas:
+            ruta = referencia.find_shortest_path(origen, destino)
+            assert tabla.distancia(origen, destino) == pytest.approx(referencia.last_cost)
+            if referencia.last_cost != math.inf:
+                assert tabla.find_shortest_path(origen, destino)[-1] is ruta[-1]
+        reabierta = TablaRutas.cargar(path, grafo)
+        assert reabierta is not None
+        reabierta.cerrar()
+    finally:
+        tabla.cerrar()
+
+
+def test_tabla_obsoleta_recurre_a_busqueda(grafo, consultas, tmp_path):
+    tabla = TablaRutas.calcular(grafo, str(tmp_path / "rutas.tabla"), procesos=1)
+    try:
+        referencia = DijkstraSolver(grafo)
+        origen, destino = next((o, d) for o, d in consultas
+                               if o is not d and tabla.distancia(o, d) != math.inf)
+        ruta = tabla.find_shortest_path(origen, destino)
+        for a, b in zip(ruta, ruta[1:]):
+            edge = a.find_edge(b)
+            edge.update(0.99, 3.0, 0.99)
+        assert not tabla.vigente()
+        referencia.find_shortest_path(origen, destino)
+        assert tabla.distancia(origen, destino) == pytest.approx(referencia.last_cost)
+    finally:
+        tabla.cerrar()
+
+
+def test_ids_de_tabla_obsoleta_y_sin_grafo_retenido(grafo, consultas, tmp_path):
+    import TablaRutas as modulo
+    tabla = TablaRutas.calcular(grafo, str(tmp_path / "rutas.tabla"), procesos=1)
+    try:
+        assert modulo._grafo_trabajador is None
+        origen, destino = next((o, d) for o, d in consultas
+                               if o is not d and tabla.distancia(o, d) != math.inf)
+        ruta = tabla.find_shortest_path_ids(origen.id, destino.id)
+        for a, b in zip(ruta, ruta[1:]):
+            grafo.nodes[a].find_edge(grafo.nodes[b]).update(0.99, 3.0, 0.99)
+        referencia = DijkstraSolver(grafo)
+        esperada = referencia.find_shortest_path(origen, destino)
+        assert tabla.find_shortest_path_ids(origen.id, destino.id) == [node.id for node in esperada]
+    finally:
+        tabla.cerrar()
@@ -0,0 +1,71 @@
+import itertools
+import random
+import threading
+
+import pytest
+
+from FlightSimulator import FlightSimulator
+from Graph import Graph
+from YenSolver import YenSolver
+
+
+def rutas_sin_ciclos(grafo, origen, destino):
+    """Todas las rutas simples de origen a destino con su coste (fuerza bruta)."""
+    rutas = []
+
+    def explorar(nodo, camino, coste):
+        if nodo is destino:
+            rutas.append((coste, [n.id for n in camino]))
+            return
+        for edge in nodo.edges:
+            if edge.destination not in camino:
+                explorar(edge.destination, camino + [edge.destination], coste + edge.peso)
+
+    explorar(origen, [origen], 0.0)
+    return sorted(rutas)
+
+
+@pytest.fixture
+def grafo_pequeno():
+    rng = random.Random(4)
+    grafo = Graph()
+    nombres = [f"C{i}" for i in range(9)]
+    for origen, destino in itertools.permutations(nombres, 2):
+        if rng.random() < 0.35:
+            grafo.add_edge(origen, destino, rng.uniform(0.01, 0.99), rng.uniform(0.1, 3.0),
+                           rng.uniform(0.01, 0.99))
+    return grafo
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_yen_igual_que_fuerza_bruta(grafo_pequeno, workers):
+    yen = YenSolver(grafo_pequeno, workers=workers)
+    try:
+        nodos = grafo_pequeno.nodes
+        for origen, destino in itertools.permutations(nodos[:5], 2):
+            esperadas = rutas_sin_ciclos(grafo_pequeno, origen, destino)[:4]
+            obtenidas = yen.k_shortest_paths_ids(origen.id, destino.id, 4)
+            assert [coste for coste, _ in obtenidas] == pytest.approx([coste for coste, _ in esperadas])
+            assert len({tuple(ruta) for _, ruta in obtenidas}) == len(obtenidas)
+    finally:
+        yen.close()
+
+
+def test_yen_libera_su_pool(grafo_pequeno):
+    origen, destino = grafo_pequeno.nodes[0], grafo_pequeno.nodes[4]
+    with YenSolver(grafo_pequeno, workers=3) as yen:
+        con_pool = yen.k_shortest_paths_ids(origen.id, destino.id, 4)
+        assert yen._pool is not None
+    assert yen._pool is None
+    with YenSolver(grafo_pequeno) as secuencial:
+        assert secuencial._pool is None
+        assert secuencial.k_shortest_paths_ids(origen.id, destino.id, 4) == con_pool
+
+
+def test_alternativas_del_simulador_sin_hilos(grafo, consultas):
+    origen, destino = next((o, d) for o, d in consultas if o is not d)
+    hilos = threading.active_count()
+    for _ in range(5):
+        simulador = FlightSimulator(grafo, origen.name, destino.name)
+        simulador.get_alternatives()
+    assert threading.active_count() == hilos
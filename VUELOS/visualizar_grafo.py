@@ -6,14 +6,16 @@ Muestra las ciudades (nodos) y las conexiones con sus pesos.
 import matplotlib.pyplot as plt
 import networkx as nx
 from cargar_grafo_desde_bd import cargar_grafo_desde_bd
+from ModeloPeso import MODELO_ESTANDAR
 
 
-def visualizar_grafo(graph):
+def visualizar_grafo(graph, modelo=MODELO_ESTANDAR):
     """
     Crea una visualización del grafo mostrando nodos, aristas y pesos.
     
     Args:
         graph (Graph): Grafo a visualizar.
+        modelo (ModeloPeso): Modelo de coste con el que calcular los pesos.
     """
     # Crear un grafo dirigido de NetworkX
     G = nx.DiGraph()
@@ -22,11 +24,12 @@ def visualizar_grafo(graph):
     for node in graph.nodes:
         G.add_node(node.name)
     
-    # Añadir aristas con sus pesos
+    # Añadir aristas con sus pesos (calculados en bloque por el modelo)
+    pesos = modelo.pesos_grafo(graph)
     edge_labels = {}
     for node in graph.nodes:
         for edge in node.edges:
-            peso = edge.calcular_peso()
+            peso = pesos[edge.id]
             G.add_edge(node.name, edge.destination.name, weight=peso)
             # Guardar la etiqueta solo con el peso
             edge_key = (node.name, edge.destination.name)
@@ -73,7 +76,7 @@ def visualizar_grafo(graph):
                                           edgecolor='black',
                                           alpha=0.9))
     
-    plt.title("Grafo de Rutas Aéreas\n(Peso total = Saturación×2 + Tiempo + Animales×3)", 
+    plt.title(f"Grafo de Rutas Aéreas\n(Peso total = {modelo.formula()})", 
              fontsize=14, fontweight='bold')
     plt.axis('off')
     plt.tight_layout()
@@ -86,12 +89,13 @@ def visualizar_grafo(graph):
     plt.show()
 
 
-def mostrar_informacion_grafo(graph):
+def mostrar_informacion_grafo(graph, modelo=MODELO_ESTANDAR):
     """
     Muestra información detallada del grafo en formato texto.
     
     Args:
         graph (Graph): Grafo a analizar.
+        modelo (ModeloPeso): Modelo de coste con el que calcular los pesos.
     """
     print("\n" + "="*80)
     print("INFORMACIÓN DEL GRAFO DE RUTAS AÉREAS")
@@ -106,16 +110,17 @@ def mostrar_informacion_grafo(graph):
     print("RUTAS Y PESOS DETALLADOS:")
     print("-"*80)
     
+    pesos = modelo.pesos_grafo(graph)
     total_rutas = 0
     for node in graph.nodes:
         if node.has_edges():
             print(f"\nDesde {node.name}:")
             for edge in node.edges:
-                peso = edge.calcular_peso()
+                peso = pesos[edge.id]
                 total_rutas += 1
                 print(f"  → {edge.destination.name}")
                 print(f"     Saturación: {edge.saturacion} | Tiempo: {edge.tiempo} | Animales: {edge.animales}")
-                print(f"     Peso total: {peso:.2f} (S×2 + T + A×3 = {edge.saturacion}×2 + {edge.tiempo} + {edge.animales}×3)")
+                print(f"     Peso total: {peso:.2f} ({modelo.formula()})")
     
     print(f"\n{'-'*80}")
     print(f"Total de rutas: {total_rutas}")